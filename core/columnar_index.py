@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       columnar_index.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# An in-memory copy of the searchable columns of the journals, as NumPy arrays, for the search view to filter without
+# querying SQLite. Strings are dictionary-encoded, and category and area memberships are stored as CSR arrays (the
+# journals of every label, one label after the other). Filters are evaluated as vectorized boolean masks.
+#
+# NumPy is optional: without it, or with settings.columnar_index disabled, searches go through SQLite.
+#
+
+import threading
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core import fulltext, schema
+from core.query_builder import to_number, to_quartile_rank
+
+# Quartile rank of the categories without quartile: never accepted by a quartile filter.
+NO_QUARTILE = 127
+
+# Number of keyword searches kept by an index.
+KEYWORD_CACHE_SIZE = 8
+
+# COLLATE NOCASE only folds the ASCII letters, the other characters being compared as they are.
+ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+_index = None
+_lock = threading.Lock()
+
+
+def available():
+    """
+    Whether NumPy is installed.
+    """
+    return np is not None
+
+
+def get_index(connection):
+    """
+    Get the index shared by every thread, loading it from the database on first use and again when the data version
+    changed, e.g. after an enrichment run from the command line.
+
+    Args:
+        connection (sqlite3.Connection): The connection to load the index from, when it is not loaded yet.
+
+    Returns:
+        ColumnarIndex: The index.
+    """
+    global _index
+    version = schema.get_data_version(connection)
+    with _lock:
+        if _index is None or _index.version != version:
+            _index = ColumnarIndex(connection)
+        return _index
+
+
+def invalidate():
+    """
+    Forget the shared index, after the journals changed. The next search loads it again.
+    """
+    global _index
+    with _lock:
+        _index = None
+
+
+def to_floats(values):
+    """
+    Convert a numeric column to floats, NULL and the values that are not numbers, e.g. text left by an old import,
+    becoming NaN.
+
+    Args:
+        values (list): The values of the column.
+
+    Returns:
+        numpy.ndarray: The floats.
+    """
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([value if isinstance(value, (int, float)) else np.nan for value in values], dtype=np.float64)
+
+
+def encode(values):
+    """
+    Dictionary-encode a column of strings.
+
+    Args:
+        values (list): The strings, None included.
+
+    Returns:
+        tuple: The code of every value as an array, and the code of every distinct value as a dict.
+    """
+    codes = {}
+    array = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int32, count=len(values))
+    return array, codes
+
+
+def keyword_matches(connection, keyword, ranked=False):
+    """
+    Find the journals matching a keyword, through the full-text index when the database has one.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        keyword (str): The keyword, see query_builder.build_search.
+        ranked (bool, optional): Whether to compute the BM25 rank of the journals. Defaults to False.
+
+    Returns:
+        tuple: The IDs of the journals found and their BM25 rank (lower is better), None when not ranked or without
+            full-text index.
+    """
+    match = fulltext.match_expression(keyword)
+    if match and fulltext.has_index(connection):
+        if not ranked:
+            rows = connection.execute("SELECT rowid FROM journal_fts WHERE journal_fts MATCH ?", (match,)).fetchall()
+            return np.array([row[0] for row in rows], dtype=np.int64), None
+
+        weights = ", ".join(str(weight) for weight in fulltext.WEIGHTS)
+        rows = connection.execute("SELECT rowid, rank FROM journal_fts WHERE journal_fts MATCH ? AND rank MATCH ?",
+                                  (match, f"bm25({weights})")).fetchall()
+        return (np.array([row[0] for row in rows], dtype=np.int64),
+                np.array([row[1] for row in rows], dtype=np.float64))
+
+    rows = connection.execute("SELECT id FROM journaux WHERE title LIKE ?",
+                              ("%{}%".format(keyword.replace(' ', '%')),)).fetchall()
+    return np.array([row[0] for row in rows], dtype=np.int64), None
+
+
+class Memberships:
+    """
+    The Memberships class stores the journals of every label of a link table in CSR form: `positions` lists the
+    journals of label 0, then those of label 1, and so on, `offsets[code]` giving where the journals of a label start.
+
+    Example usage:
+    areas = Memberships(journal_positions, area_codes, len(labels))
+    mask = areas.any_of([codes["Medicine"], codes["Nursing"]], journal_count)
+    """
+
+    def __init__(self, positions, codes, label_count, ranks=None):
+        """
+        Initialize the Memberships.
+
+        Args:
+            positions (numpy.ndarray): The journal position of every link.
+            codes (numpy.ndarray): The label code of every link.
+            label_count (int): The number of distinct labels.
+            ranks (numpy.ndarray, optional): The quartile rank of every link. Defaults to None.
+        """
+        order = np.argsort(codes, kind="stable")
+        self.positions = positions[order]
+        self.codes = codes[order]
+        self.ranks = ranks[order] if ranks is not None else None
+        self.offsets = np.zeros(label_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=label_count), out=self.offsets[1:])
+
+    def members(self, code, max_rank=None):
+        """
+        Get the positions of the journals of a label, only those with a quartile rank up to `max_rank` if given.
+        """
+        start, end = self.offsets[code], self.offsets[code + 1]
+        if max_rank is None:
+            return self.positions[start:end]
+        return self.positions[start:end][self.ranks[start:end] <= max_rank]
+
+    def mask(self, code, journal_count, max_rank=None):
+        """
+        Get the mask of the journals of a label.
+        """
+        mask = np.zeros(journal_count, dtype=bool)
+        mask[self.members(code, max_rank)] = True
+        return mask
+
+    def any_of(self, codes, journal_count):
+        """
+        Get the mask of the journals of at least one of the labels.
+        """
+        mask = np.zeros(journal_count, dtype=bool)
+        for code in codes:
+            mask[self.members(code)] = True
+        return mask
+
+    def counts(self, mask, max_rank=None):
+        """
+        Count the journals of every label among those of a mask, only those with a quartile rank up to `max_rank` if
+        given.
+
+        Returns:
+            numpy.ndarray: The number of journals of every label code.
+        """
+        kept = mask[self.positions]
+        if max_rank is not None:
+            kept &= self.ranks <= max_rank
+        return np.bincount(self.codes[kept], minlength=len(self.offsets) - 1)
+
+
+class ColumnarIndex:
+    """
+    The ColumnarIndex class holds the searchable columns of every journal as NumPy arrays, journals being ordered by
+    ID. Its arrays are read-only once built, and its cache of keyword searches is locked, so it can be shared between
+    threads.
+
+    Example usage:
+    index = ColumnarIndex(connection)
+    ids = index.search(connection, {"quartile": "Q1", "country": "France"}, "SJR")
+    """
+
+    def __init__(self, connection):
+        """
+        Load the index.
+
+        Args:
+            connection (sqlite3.Connection): The database connection.
+        """
+        self.version = schema.get_data_version(connection)
+        rows = connection.execute("""
+            SELECT id, sjr, impact_factor, h_index, type, country, region, title FROM journaux ORDER BY id
+        """).fetchall()
+        columns = list(zip(*rows)) or [()] * 8
+        self.count = len(rows)
+        self.ids = np.array(columns[0], dtype=np.int64)
+        self.sjr = to_floats(columns[1])
+        self.impact_factor = to_floats(columns[2])
+        self.h_index = to_floats(columns[3])
+        self.types, self.type_codes = encode(columns[4])
+        self.countries, self.country_codes = encode(columns[5])
+        self.regions, self.region_codes = encode(columns[6])
+
+        # Title order as SQLite sorts it: NULL first, then with COLLATE NOCASE
+        titles = columns[7]
+        order = sorted(range(self.count),
+                       key=lambda i: (titles[i] is not None, (titles[i] or "").translate(ASCII_LOWER)))
+        self.title_order = np.empty(self.count, dtype=np.int64)
+        self.title_order[order] = np.arange(self.count)
+
+        # Labels are encoded with the rowid of their table, links read as integers only
+        self.category_codes = dict(connection.execute("SELECT label, rowid FROM categories"))
+        positions, labels, ranks = self.load_links(connection.execute(f"""
+            SELECT id_journal, categories.rowid, COALESCE(quartile_rank, {NO_QUARTILE})
+            FROM journaux_categories JOIN categories ON categories.label = journaux_categories.label_category
+        """))
+        ranks = ranks.astype(np.int8)
+        self.category_members = Memberships(positions, labels, max(self.category_codes.values(), default=0) + 1, ranks)
+        # Best quartile of every journal, for a quartile filter without categories
+        self.best_rank = np.full(self.count, NO_QUARTILE, dtype=np.int8)
+        np.minimum.at(self.best_rank, positions, ranks)
+
+        self.area_codes = dict(connection.execute("SELECT label, rowid FROM areas"))
+        positions, labels, _ = self.load_links(connection.execute("""
+            SELECT id_journal, areas.rowid, 0
+            FROM journaux_areas JOIN areas ON areas.label = journaux_areas.label_area
+        """))
+        self.area_members = Memberships(positions, labels, max(self.area_codes.values(), default=0) + 1)
+
+        # The last keywords searched: a search, its next pages and its count search the same keyword
+        self.keyword_cache = {}
+        self.keyword_lock = threading.Lock()
+
+    def load_links(self, links):
+        """
+        Load a link table, skipping the links to unknown journals.
+
+        Args:
+            links (sqlite3.Cursor): The (journal ID, label code, extra value) rows of the table, all integers.
+
+        Returns:
+            tuple: The journal position, the label code and the extra value of every link, as arrays.
+        """
+        links = np.fromiter(chain.from_iterable(links), dtype=np.int64).reshape(-1, 3)
+        links = links[np.isin(links[:, 0], self.ids)]
+        return np.searchsorted(self.ids, links[:, 0]), links[:, 1], links[:, 2]
+
+    def nbytes(self):
+        """
+        Get the memory used by the arrays, in bytes.
+        """
+        arrays = [value for value in vars(self).values() if isinstance(value, np.ndarray)]
+        for members in (self.category_members, self.area_members):
+            arrays.extend(value for value in vars(members).values() if isinstance(value, np.ndarray))
+        return sum(array.nbytes for array in arrays)
+
+    def mask(self, criteria):
+        """
+        Evaluate every criterion but the keyword.
+
+        Args:
+            criteria (dict): The search criteria, see query_builder.build_search.
+
+        Returns:
+            numpy.ndarray: The mask of the journals matching.
+        """
+        mask = np.ones(self.count, dtype=bool)
+
+        for values, criterion in ((self.sjr, "sjr"), (self.impact_factor, "impact_factor")):
+            value = to_number(criteria.get(criterion, ""))
+            if value is not None:
+                # NaN, a missing value, is never greater
+                mask &= values >= value
+
+        for codes, lookup, criterion in ((self.types, self.type_codes, "type_"),
+                                         (self.countries, self.country_codes, "country"),
+                                         (self.regions, self.region_codes, "region")):
+            value = criteria.get(criterion, "-")
+            if value != "-":
+                mask &= codes == lookup.get(value, -1)
+
+        rank = to_quartile_rank(criteria.get("quartile", "-"))
+        categories = criteria.get("categories", ())
+        for category in categories:
+            code = self.category_codes.get(category)
+            if code is None:
+                return np.zeros(self.count, dtype=bool)
+            mask &= self.category_members.mask(code, self.count, rank)
+        if not categories and rank is not None:
+            mask &= self.best_rank <= rank
+
+        areas = criteria.get("areas", ())
+        if areas:
+            codes = [self.area_codes[area] for area in areas if area in self.area_codes]
+            mask &= self.area_members.any_of(codes, self.count)
+
+        return mask
+
+    def keyword_mask(self, connection, keyword, ranked):
+        """
+        Find the journals matching a keyword, see keyword_matches.
+
+        Returns:
+            tuple: The mask of the journals found, and the BM25 rank of every journal or None.
+        """
+        key = (keyword, ranked)
+        with self.keyword_lock:
+            cached = self.keyword_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Searched without the lock: two threads may search the same keyword, the last one being kept
+        journal_ids, ranks = keyword_matches(connection, keyword, ranked)
+        # Journals imported after the index was loaded are not searched
+        known = np.isin(journal_ids, self.ids)
+        positions = np.searchsorted(self.ids, journal_ids[known])
+        mask = np.zeros(self.count, dtype=bool)
+        mask[positions] = True
+        relevance = None
+        if ranks is not None:
+            relevance = np.full(self.count, np.inf)
+            relevance[positions] = ranks[known]
+
+        with self.keyword_lock:
+            if key not in self.keyword_cache and len(self.keyword_cache) >= KEYWORD_CACHE_SIZE:
+                self.keyword_cache.pop(next(iter(self.keyword_cache)))
+            self.keyword_cache[key] = (mask, relevance)
+        return mask, relevance
+
+    def matching_mask(self, connection, criteria, ranked=False):
+        """
+        Find the journals matching every criterion.
+
+        Args:
+            connection (sqlite3.Connection): The database connection, for the keyword.
+            criteria (dict): The search criteria, see query_builder.build_search.
+            ranked (bool, optional): Whether to rank the journals by relevance to the keyword. Defaults to False.
+
+        Returns:
+            tuple: The mask of the journals found, and the BM25 rank of every journal when the keyword was searched
+                through the full-text index, None otherwise.
+        """
+        mask = self.mask(criteria)
+        relevance = None
+        keyword = criteria.get("keyword", "")
+        if keyword:
+            keyword_mask, relevance = self.keyword_mask(connection, keyword, ranked)
+            mask &= keyword_mask
+        return mask, relevance
+
+    def matching(self, connection, criteria, ranked=False):
+        """
+        Find the journals matching every criterion, see matching_mask.
+
+        Returns:
+            tuple: The positions of the journals found, and their BM25 rank or None.
+        """
+        mask, relevance = self.matching_mask(connection, criteria, ranked)
+        return np.flatnonzero(mask), relevance
+
+    def facet_counts(self, connection, criteria):
+        """
+        Count the journals of every category and area under the search criteria.
+
+        A category counts the journals found that belong to it (with the quartile asked for), which is what checking
+        it would leave, categories being all required. Areas being alternatives, an area counts the journals found when
+        ignoring the areas checked.
+
+        Args:
+            connection (sqlite3.Connection): The database connection, for the keyword.
+            criteria (dict): The search criteria, see query_builder.build_search.
+
+        Returns:
+            tuple: The number of journals of every category label, and of every area label, as dicts.
+        """
+        mask, _ = self.matching_mask(connection, criteria)
+        counts = self.category_members.counts(mask, to_quartile_rank(criteria.get("quartile", "-")))
+        categories = {label: int(counts[code]) for label, code in self.category_codes.items()}
+
+        if criteria.get("areas"):
+            mask, _ = self.matching_mask(connection, dict(criteria, areas=()))
+        counts = self.area_members.counts(mask)
+        areas = {label: int(counts[code]) for label, code in self.area_codes.items()}
+        return categories, areas
+
+    def count_matching(self, connection, criteria):
+        """
+        Count the journals matching every criterion.
+        """
+        return len(self.matching(connection, criteria)[0])
+
+    def search(self, connection, criteria, order="Relevance"):
+        """
+        Find the journals matching every criterion, in the same order as the SQL search.
+
+        Args:
+            connection (sqlite3.Connection): The database connection, for the keyword.
+            criteria (dict): The search criteria, see query_builder.build_search.
+            order (str, optional): The order of the results, a key of SEARCH_ORDERS. Defaults to "Relevance".
+
+        Returns:
+            numpy.ndarray: The IDs of the journals found.
+        """
+        positions, relevance = self.matching(connection, criteria, order == "Relevance")
+        if order == "Relevance" and relevance is not None:
+            key = relevance[positions]
+        elif order == "Title":
+            key = self.title_order[positions]
+        else:
+            # Descending, missing values last
+            values = self.h_index if order == "H index" else self.sjr
+            key = np.nan_to_num(-values[positions], nan=np.inf)
+        return self.ids[positions[np.lexsort((self.ids[positions], key))]]
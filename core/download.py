@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       download.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+import codecs
+import csv
+import os
+import queue
+import socket
+import threading
+from contextlib import closing
+
+import requests
+
+import settings
+from core.ingestion import ImportCancelled
+
+# Size of the chunks read from the network.
+CHUNK_SIZE = 64 * 1024
+
+# Number of chunks the network thread may read ahead of the parser.
+PREFETCH_DEPTH = 16
+
+_END = object()
+
+
+def open_export(url=None, headers=None):
+    """
+    Start downloading the SCImago export. The body is not read yet.
+
+    Args:
+        url (str, optional): The export URL. Defaults to settings.data_url.
+        headers (dict, optional): Extra request headers, e.g. FetchCache.conditional_headers().
+
+    Returns:
+        requests.Response: The streamed response, to be used as a context manager.
+    """
+    response = requests.get(url or settings.data_url, headers=headers, stream=True, timeout=settings.download_timeout)
+    response.raise_for_status()
+    return response
+
+
+def abort(response):
+    """
+    Abandon a streamed download from another thread than the one reading it. Closing the response would wait for the
+    read in progress, which holds the lock of the connection, up to settings.download_timeout: shutting the socket
+    down ends that read at once.
+
+    Args:
+        response (requests.Response): The streamed response, see open_export().
+    """
+    # urllib3 response -> http.client response -> its buffered socket file -> socket.SocketIO -> socket
+    sock = response.raw
+    for attribute in ("_fp", "fp", "raw", "_sock"):
+        sock = getattr(sock, attribute, None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        # Already closed
+        pass
+
+
+class ExportReader(csv.DictReader):
+    """
+    The ExportReader class reads the rows of a streamed export, see stream_export(). close() stops the download and
+    its read-ahead thread when the rows were not all read, e.g. on cancel, and is to be called before the response is
+    closed.
+
+    Example usage:
+    with open_export() as response, contextlib.closing(stream_export(response)) as reader:
+        ingestion.import_reader(reader, settings.database)
+    """
+
+    def __init__(self, lines, chunks):
+        """
+        Initialize the ExportReader.
+
+        Args:
+            lines (generator): The lines of the export, see iter_lines().
+            chunks (generator): The chunks read ahead, see prefetch().
+        """
+        super().__init__(lines, delimiter=';')
+        self.lines = lines
+        self.chunks = chunks
+
+    def close(self):
+        """
+        Stop reading the export, waiting for the read-ahead thread to end.
+        """
+        self.lines.close()
+        self.chunks.close()
+
+
+def tee(chunks, path):
+    """
+    Copy the chunks to `path` while passing them through. The copy is written to a ".part" file first and only
+    replaces `path` once the whole stream went through, so an interrupted download never leaves a truncated file. The
+    ".part" file is removed when the stream fails or the generator is closed before its end.
+
+    Args:
+        chunks (iterable): The byte chunks.
+        path (str): The audit copy.
+
+    Yields:
+        bytes: The chunks, unchanged.
+    """
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    part_path = path + ".part"
+    f = open(part_path, "wb")
+    try:
+        with f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+    except BaseException:
+        # Including GeneratorExit, when the consumer stopped early
+        os.remove(part_path)
+        raise
+    os.replace(part_path, path)
+
+
+def count_bytes(chunks, callback):
+    """
+    Call `callback` with the number of bytes seen so far after every chunk.
+
+    Yields:
+        bytes: The chunks, unchanged.
+    """
+    received = 0
+    for chunk in chunks:
+        received += len(chunk)
+        callback(received)
+        yield chunk
+
+
+def hash_chunks(chunks, hasher):
+    """
+    Feed every chunk to `hasher` (a hashlib object) while passing them through.
+
+    Yields:
+        bytes: The chunks, unchanged.
+    """
+    for chunk in chunks:
+        hasher.update(chunk)
+        yield chunk
+
+
+def prefetch(chunks, depth=PREFETCH_DEPTH, close=None):
+    """
+    Read `chunks` on a background thread, at most `depth` items ahead of the consumer, so that network I/O overlaps
+    with parsing and writing while memory stays bounded. When the consumer stops early, `chunks` is closed by the
+    background thread once it stopped reading.
+
+    Args:
+        chunks (iterable): The byte chunks.
+        depth (int, optional): The read-ahead. Defaults to PREFETCH_DEPTH.
+        close (callable, optional): Called when the consumer stops early, before waiting for the background thread,
+            e.g. to abandon a read in progress instead of waiting for its timeout, see abort().
+
+    Yields:
+        bytes: The chunks, unchanged.
+    """
+    buffer = queue.Queue(depth)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+            put(_END)
+        except BaseException as e:
+            put(e)
+        finally:
+            # Runs the cleanup of the generators, e.g. the ".part" file of tee()
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+    producer = threading.Thread(target=produce, name="export-prefetch", daemon=True)
+    producer.start()
+    finished = False
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                finished = True
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Unblock the producer when the consumer stops early
+        stop.set()
+        if not finished and close is not None:
+            close()
+        producer.join()
+
+
+def iter_lines(chunks, encoding="utf-8-sig"):
+    """
+    Decode byte chunks incrementally and split them into lines, line endings included as csv expects.
+
+    Args:
+        chunks (iterable): The byte chunks.
+        encoding (str, optional): The text encoding. Defaults to "utf-8-sig", which drops a leading BOM.
+
+    Yields:
+        str: The lines.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        start = 0
+        end = pending.find("\n")
+        while end != -1:
+            yield pending[start:end + 1]
+            start = end + 1
+            end = pending.find("\n", start)
+        # Keep the incomplete last line for the next chunk
+        pending = pending[start:]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def save_export(response, path, on_progress=None, hasher=None, is_cancelled=None):
+    """
+    Download the export to a file, through a ".part" file as tee() does, e.g. to compare its hash with the last export
+    imported before importing it.
+
+    Args:
+        response (requests.Response): The streamed response, see open_export().
+        path (str): The file.
+        on_progress (callable, optional): Called with the number of bytes received so far.
+        hasher (hashlib object, optional): Updated with the raw content.
+        is_cancelled (callable, optional): Polled after every chunk, the download is abandoned and ImportCancelled
+            raised when it returns True.
+    """
+    chunks = response.iter_content(CHUNK_SIZE)
+    if on_progress is not None:
+        chunks = count_bytes(chunks, on_progress)
+    if hasher is not None:
+        chunks = hash_chunks(chunks, hasher)
+    with closing(tee(chunks, path)) as chunks:
+        for _ in chunks:
+            if is_cancelled is not None and is_cancelled():
+                raise ImportCancelled()
+
+
+def stream_export(response, tee_path=None, on_progress=None):
+    """
+    Build the streaming parsing pipeline over a downloaded export:
+    network chunks -> optional audit copy -> read-ahead thread -> incremental decoder -> csv.DictReader.
+
+    Args:
+        response (requests.Response): The streamed response, see open_export().
+        tee_path (str, optional): Where to keep a copy of the raw export. Defaults to no copy.
+        on_progress (callable, optional): Called with the number of bytes received so far.
+
+    Returns:
+        ExportReader: The rows, read lazily while the download goes on.
+
+    Example:
+        >>> with open_export() as response, contextlib.closing(stream_export(response)) as reader:
+        ...     ingestion.import_reader(reader, settings.database)
+    """
+    chunks = response.iter_content(CHUNK_SIZE)
+    if on_progress is not None:
+        chunks = count_bytes(chunks, on_progress)
+    if tee_path is not None:
+        chunks = tee(chunks, tee_path)
+    chunks = prefetch(chunks, close=lambda: abort(response))
+    return ExportReader(iter_lines(chunks), chunks)
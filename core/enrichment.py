@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       enrichment.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Enriches the journals with metrics found elsewhere: an impact factor dataset, a website. Every source implements
+# EnrichmentSource, and run_source() looks up the journals the source has not fetched within its TTL, with the
+# parallelism asked, while a single writer thread stores the results in the "journal_metrics" table in batches.
+#
+# The table keeps when every journal was fetched: a run interrupted, or run again later, only looks up the journals
+# missing or stale, and a journal looked up but not found is not looked up again before the TTL either.
+#
+
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from core import repository, schema
+from core.repository import Repository
+
+DAY = 24 * 60 * 60
+
+# Number of results committed at once. Results are also committed when none came for FLUSH_INTERVAL seconds.
+COMMIT_EVERY = 200
+FLUSH_INTERVAL = 2.0
+
+# Number of lookups running at once.
+WORKERS = 8
+
+Journal = namedtuple("Journal", ["id", "title", "issn"])
+
+# The outcome of a lookup: the value of every metric of the source, None when not found, or the error message when
+# the lookup failed.
+SourceResult = namedtuple("SourceResult", ["journal_id", "metrics", "error"])
+
+# What a run did: the journals up to date, those fetched, those with a metric found, and the lookups that failed.
+EnrichmentStats = namedtuple("EnrichmentStats", ["skipped", "fetched", "found", "failed", "elapsed"])
+
+
+class EnrichmentSource:
+    """
+    The EnrichmentSource class is the interface of the enrichment sources. A source fetches what it knows about a
+    journal with fetch(), and turns it into metrics with parse(); resolve() runs them for many journals in a pool of
+    threads, and is overridden by the sources with a faster way, a single pass over a dataset or asynchronous requests.
+
+    Example usage:
+    source = ImpactFactorSource()
+    source.open()
+    for result in source.resolve([Journal(12, "Nature", "00280836")], workers=4):
+        print(result.metrics)
+    source.close()
+    """
+
+    # Name of the source, stored with its metrics, and its description for tools.enrich.
+    name = None
+    description = None
+
+    # Names of the metrics of the source.
+    metrics = ()
+
+    # Seconds before a fetch is stale.
+    ttl = 30 * DAY
+
+    # The metric also stored as the impact factor of the journals, shown by the application, if any.
+    impact_factor_metric = None
+
+    @classmethod
+    def add_arguments(cls, parser):
+        """
+        Add the options of the source to its command of tools.enrich.
+
+        Args:
+            parser (argparse.ArgumentParser): The parser of the command.
+        """
+
+    @classmethod
+    def from_arguments(cls, args):
+        """
+        Create the source from the options of its command, see add_arguments.
+
+        Args:
+            args (argparse.Namespace): The options parsed.
+
+        Returns:
+            EnrichmentSource: The source.
+        """
+        return cls()
+
+    def open(self):
+        """
+        Prepare the source before the lookups, e.g. load a dataset.
+        """
+
+    def close(self):
+        """
+        Release what the source holds after the lookups.
+        """
+
+    def fetch(self, journal):
+        """
+        Fetch what the source knows about a journal.
+
+        Args:
+            journal (Journal): The journal.
+
+        Returns:
+            object: The raw answer of the source, for parse().
+
+        Raises:
+            Exception: When the lookup failed, the journal being looked up again by the next run.
+        """
+        raise NotImplementedError
+
+    def parse(self, journal, raw):
+        """
+        Extract the metrics of a journal from the answer of the source.
+
+        Args:
+            journal (Journal): The journal.
+            raw (object): The answer of fetch().
+
+        Returns:
+            dict: The value of every metric of the source, None when not found.
+        """
+        raise NotImplementedError
+
+    def lookup(self, journal):
+        """
+        Fetch and parse a journal, errors being returned rather than raised.
+
+        Returns:
+            SourceResult: The outcome of the lookup.
+        """
+        try:
+            return SourceResult(journal.id, self.parse(journal, self.fetch(journal)), None)
+        except Exception as e:
+            return SourceResult(journal.id, None, str(e) or type(e).__name__)
+
+    def resolve(self, journals, workers=WORKERS):
+        """
+        Look up journals in a pool of threads, only a few lookups being queued ahead of the pool.
+
+        Args:
+            journals (list): The Journal to look up.
+            workers (int, optional): The number of lookups running at once. Defaults to WORKERS.
+
+        Yields:
+            SourceResult: The outcome of every lookup, in completion order.
+        """
+        if workers <= 1:
+            for journal in journals:
+                yield self.lookup(journal)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            try:
+                for journal in journals:
+                    if len(pending) >= workers * 2:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            yield future.result()
+                    pending.add(executor.submit(self.lookup, journal))
+
+                for future in wait(pending).done:
+                    yield future.result()
+            finally:
+                # The lookups not started yet when the consumer stops early are not run
+                for future in pending:
+                    future.cancel()
+
+
+class MetricsWriter(threading.Thread):
+    """
+    The MetricsWriter class is the only thread writing to the database: it receives the results of a source through a
+    bounded queue and commits them in batches. Failed lookups are not stored, the next run tries them again.
+
+    Example usage:
+    writer = MetricsWriter(settings.database, source)
+    writer.start()
+    writer.put(source.lookup(journal))
+    writer.close()
+    """
+
+    def __init__(self, database, source, commit_every=COMMIT_EVERY, progress=None):
+        """
+        Initialize the MetricsWriter.
+
+        Args:
+            database (str): The SQLite database path.
+            source (EnrichmentSource): The source of the results.
+            commit_every (int, optional): The number of results committed at once. Defaults to COMMIT_EVERY.
+            progress (callable, optional): Called with the writer after every commit.
+        """
+        super().__init__(name=f"{source.name}-writer", daemon=True)
+        self.database = database
+        self.source = source
+        self.commit_every = commit_every
+        self.progress = progress
+        self.results = queue.Queue(maxsize=commit_every * 4)
+        self.fetched = 0
+        self.found = 0
+        self.failed = 0
+        self.error = None
+        # Set when the writer failed, the results being no longer read
+        self.stopped = threading.Event()
+
+    def put(self, result):
+        """
+        Queue a SourceResult, waiting while the queue is full.
+
+        Returns:
+            bool: False when the writer failed and the result was dropped, the lookups having to stop.
+        """
+        while not self.stopped.is_set():
+            try:
+                self.results.put(result, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def close(self):
+        """
+        Commit the results still queued and stop the thread.
+
+        Raises:
+            Exception: The error that stopped the writer, if any.
+        """
+        self.put(None)
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+    def run(self):
+        connection = repository.get_connection(self.database)
+        closed = False
+        try:
+            pending = []
+            while True:
+                try:
+                    result = self.results.get(timeout=FLUSH_INTERVAL)
+                except queue.Empty:
+                    self.commit(connection, pending)
+                    pending = []
+                    continue
+                if result is None:
+                    closed = True
+                    break
+                pending.append(result)
+                if len(pending) >= self.commit_every:
+                    self.commit(connection, pending)
+                    pending = []
+            self.commit(connection, pending)
+        except Exception as e:
+            self.error = e
+            # Keep the lookups from waiting on a full queue: put() gives up, and what was queued is dropped. Once the
+            # sentinel was read nothing else comes, the queue must not be waited on.
+            self.stopped.set()
+            while not closed:
+                try:
+                    closed = self.results.get_nowait() is None
+                except queue.Empty:
+                    break
+        finally:
+            repository.close_connections()
+
+    def commit(self, connection, results):
+        """
+        Store the metrics of the successful lookups in one transaction, and the impact factors found when the source
+        has an impact factor metric.
+        """
+        if not results:
+            return
+
+        fetched_at = time.time()
+        succeeded = [result for result in results if result.error is None]
+        rows = [(result.journal_id, self.source.name, metric, result.metrics.get(metric), fetched_at)
+                for result in succeeded for metric in self.source.metrics]
+        impact_factors = []
+        if self.source.impact_factor_metric is not None:
+            metric = self.source.impact_factor_metric
+            impact_factors = [(result.metrics[metric], result.journal_id)
+                              for result in succeeded if result.metrics.get(metric) is not None]
+
+        with connection:
+            reader = Repository(connection)
+            reader.set_journal_metrics(rows)
+            if impact_factors:
+                reader.set_impact_factors(impact_factors)
+                schema.bump_data_version(connection)
+
+        self.fetched += len(succeeded)
+        self.found += sum(any(value is not None for value in result.metrics.values()) for result in succeeded)
+        self.failed += len(results) - len(succeeded)
+        if self.progress is not None:
+            self.progress(self)
+
+
+def run_source(database, source, workers=WORKERS, ttl=None, limit=None, commit_every=COMMIT_EVERY, progress=None):
+    """
+    Look up the journals a source has never fetched or not fetched within its TTL, and store their metrics.
+
+    Args:
+        database (str): The SQLite database path.
+        source (EnrichmentSource): The source.
+        workers (int, optional): The number of lookups running at once. Defaults to WORKERS.
+        ttl (float, optional): Seconds before a fetch is stale, 0 to fetch every journal again. Defaults to the TTL of
+            the source.
+        limit (int, optional): The largest number of journals looked up, the oldest fetched first. Defaults to None,
+            every stale journal.
+        commit_every (int, optional): The number of results committed at once. Defaults to COMMIT_EVERY.
+        progress (callable, optional): Called with the MetricsWriter after every commit.
+
+    Returns:
+        EnrichmentStats: What the run did.
+    """
+    start = time.perf_counter()
+    connection = repository.get_connection(database)
+    ttl = source.ttl if ttl is None else ttl
+    reader = Repository(connection)
+    total = reader.journal_count()
+    journals = [Journal(*journal) for journal in reader.stale_journals(source.name, time.time() - ttl) if journal[1]]
+    skipped = total - len(journals)
+    if limit is not None:
+        journals = journals[:limit]
+
+    source.open()
+    writer = MetricsWriter(database, source, commit_every, progress)
+    writer.start()
+    results = source.resolve(journals, workers)
+    try:
+        for result in results:
+            # The lookups left are not run once the writer failed, close() raising its error
+            if writer.error is not None or not writer.put(result):
+                break
+    finally:
+        results.close()
+        source.close()
+        writer.close()
+
+    return EnrichmentStats(skipped, writer.fetched, writer.found, writer.failed,
+                           time.perf_counter() - start)
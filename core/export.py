@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       export.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Exports every result of a search, not only the rows shown. The journals are streamed from a single query, see
+# Repository.export_rows, and handed batch by batch to a writer of the format chosen: CSV, JSON Lines, Parquet, Arrow
+# or XLSX.
+#
+# Parquet and Arrow need pyarrow, XLSX needs openpyxl: both are optional, the formats are only offered when installed.
+#
+
+import csv
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+from core.query_builder import JOURNAL_FIELDS, to_quartile_rank
+from core.repository import Repository
+
+# Number of journals read and written at once.
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_HEADERS = [
+    'ID', 'SourceID', 'Title', 'Type', 'ISSN', 'SJR', 'H Index', 'Last Year Docs', 'Three Years Docs', 'Refs', 'Cites',
+    'Citable Docs', 'Cites per Docs', 'Ref per Docs', 'Country', 'Region', 'Publisher', 'IF', 'Categories (Quartile)',
+    'Areas'
+]
+
+# Type of every journal column in the columnar formats.
+FIELD_TYPES = {
+    "sjr": "float", "cites_on_docs": "float", "ref_on_docs": "float", "impact_factor": "float",
+    "id": "int", "h_index": "int", "last_year_docs": "int", "three_years_docs": "int", "refs": "int", "cites": "int",
+    "citables": "int",
+}
+
+
+class ExportCancelled(Exception):
+    """
+    Raised from within an export when the caller asked for it to stop. The partial file is removed.
+    """
+
+
+def format_categories(categories):
+    """
+    Join categories as in the SCImago export, e.g. "Oncology(Q1); Surgery(Q2)".
+
+    Args:
+        categories (list): The JournalCategory of a journal.
+
+    Returns:
+        str: The categories, with their quartile when they have one.
+    """
+    return '; '.join(category.label + (f"({category.quartile})" if category.quartile else "")
+                     for category in categories)
+
+
+def flat_row(row):
+    """
+    Flatten an ExportRow for the spreadsheet formats: categories and areas become "; "-separated text.
+    """
+    return list(row[:len(JOURNAL_FIELDS)]) + [format_categories(row.categories), '; '.join(row.areas)]
+
+
+def category_records(categories):
+    """
+    Turn categories into {"label", "quartile"} pairs for the structured formats, the quartile as its rank (1 for "Q1",
+    None without quartile).
+    """
+    return [{"label": category.label, "quartile": to_quartile_rank(category.quartile or "-")}
+            for category in categories]
+
+
+def record(row):
+    """
+    Turn an ExportRow into a dict for the structured formats, see category_records. Areas are a list of labels.
+    """
+    data = dict(zip(JOURNAL_FIELDS, row))
+    data["categories"] = category_records(row.categories)
+    data["areas"] = list(row.areas)
+    return data
+
+
+class ExportWriter:
+    """
+    The ExportWriter class is the interface of the export formats: a writer is opened on a file, receives the rows
+    batch by batch with write(), then is closed. Writers never hold more than one batch in memory.
+
+    Example usage:
+    writer = CsvWriter("journals.csv")
+    for rows in Repository().export_rows(journal_ids):
+        writer.write(rows)
+    writer.close()
+    """
+
+    # Name of the format and file extension, for the file dialog.
+    name = None
+    extension = None
+
+    @classmethod
+    def available(cls):
+        """
+        Whether the libraries the format needs are installed.
+        """
+        return True
+
+    def __init__(self, path):
+        """
+        Open the file.
+
+        Args:
+            path (str): The file to write.
+        """
+        self.path = path
+
+    def write(self, rows):
+        """
+        Write a batch of rows.
+
+        Args:
+            rows (list): The ExportRow of the batch.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Finish the file.
+        """
+        raise NotImplementedError
+
+
+class CsvWriter(ExportWriter):
+    """
+    The CsvWriter class writes CSV, with EXPORT_HEADERS and the categories and areas as "; "-separated text.
+    """
+
+    name = "CSV"
+    extension = "csv"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_HEADERS)
+
+    def write(self, rows):
+        self.writer.writerows(flat_row(row) for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesWriter(ExportWriter):
+    """
+    The JsonLinesWriter class writes one JSON object per journal and per line, see record().
+    """
+
+    name = "JSON Lines"
+    extension = "jsonl"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, rows):
+        self.file.writelines(json.dumps(record(row), ensure_ascii=False) + "\n" for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter(ExportWriter):
+    """
+    The ParquetWriter class writes a Parquet file, one row group per batch. Categories are a list of
+    {label, quartile} structs, the quartile being an int8, and areas a list of strings.
+    """
+
+    name = "Parquet"
+    extension = "parquet"
+
+    @classmethod
+    def available(cls):
+        return pa is not None
+
+    @staticmethod
+    def schema():
+        """
+        Get the Arrow schema of the exports.
+        """
+        types = {"float": pa.float64(), "int": pa.int64()}
+        fields = [pa.field(field, types.get(FIELD_TYPES.get(field), pa.string())) for field in JOURNAL_FIELDS]
+        fields.append(pa.field("categories", pa.list_(pa.struct([("label", pa.string()), ("quartile", pa.int8())]))))
+        fields.append(pa.field("areas", pa.list_(pa.string())))
+        return pa.schema(fields)
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.arrow_schema = self.schema()
+        self.writer = self.open_writer()
+
+    def open_writer(self):
+        """
+        Open the pyarrow writer of the format.
+        """
+        return pq.ParquetWriter(self.path, self.arrow_schema)
+
+    def write(self, rows):
+        columns = list(zip(*(row[:len(JOURNAL_FIELDS)] for row in rows)))
+        columns.append([category_records(row.categories) for row in rows])
+        columns.append([row.areas for row in rows])
+        arrays = [pa.array(column, type=field.type) for column, field in zip(columns, self.arrow_schema)]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.arrow_schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class ArrowWriter(ParquetWriter):
+    """
+    The ArrowWriter class writes an Arrow IPC (Feather v2) file, with the schema of ParquetWriter.
+    """
+
+    name = "Arrow"
+    extension = "arrow"
+
+    def open_writer(self):
+        return pa.ipc.new_file(self.path, self.arrow_schema)
+
+
+class XlsxWriter(ExportWriter):
+    """
+    The XlsxWriter class writes an Excel workbook in write-only mode, rows being streamed to the file instead of kept
+    in memory. Columns are those of CsvWriter.
+    """
+
+    name = "Excel"
+    extension = "xlsx"
+
+    @classmethod
+    def available(cls):
+        return openpyxl is not None
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Journals")
+        self.sheet.append(EXPORT_HEADERS)
+
+    def write(self, rows):
+        for row in rows:
+            self.sheet.append(flat_row(row))
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+WRITERS = [CsvWriter, JsonLinesWriter, ParquetWriter, ArrowWriter, XlsxWriter]
+
+
+def available_writers():
+    """
+    List the writers whose libraries are installed, CSV first.
+    """
+    return [writer for writer in WRITERS if writer.available()]
+
+
+def writer_for(path, default=CsvWriter):
+    """
+    Find the writer of a file from its extension.
+
+    Args:
+        path (str): The file to write.
+        default (type, optional): The writer of unknown extensions. Defaults to CsvWriter.
+
+    Returns:
+        type: The ExportWriter subclass.
+    """
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    for writer in available_writers():
+        if writer.extension == extension:
+            return writer
+    return default
+
+
+def write_export(path, batches, writer_class=CsvWriter, total=None, progress=None, is_cancelled=None):
+    """
+    Write rows to a file with a writer. The rows go to a ".part" file first, renamed once complete, so that a failed
+    or cancelled export never leaves a truncated file behind.
+
+    Args:
+        path (str): The file to write.
+        batches (iterable): Lists of ExportRow.
+        writer_class (type, optional): The ExportWriter subclass of the format. Defaults to CsvWriter.
+        total (int, optional): The number of rows expected, passed on to `progress`.
+        progress (callable, optional): Called with the number of rows written and `total` after every batch.
+        is_cancelled (callable, optional): Polled between batches, the export raises ExportCancelled when it returns
+            True.
+
+    Returns:
+        int: The number of rows written.
+    """
+    part_path = path + ".part"
+    written = 0
+    try:
+        writer = writer_class(part_path)
+        try:
+            for rows in batches:
+                if is_cancelled is not None and is_cancelled():
+                    raise ExportCancelled()
+                writer.write(rows)
+                written += len(rows)
+                if progress is not None:
+                    progress(written, total)
+        finally:
+            writer.close()
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return written
+
+
+def export_search(connection, criteria, order, path, writer_class=CsvWriter, progress=None, is_cancelled=None):
+    """
+    Export every journal a search finds, in the order of the results.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        criteria (dict): The search criteria, keyword arguments of Repository.search_query.
+        order (str): The order of the results, a key of SEARCH_ORDERS.
+        path (str): The file to write.
+        writer_class (type, optional): The ExportWriter subclass of the format. Defaults to CsvWriter.
+        progress (callable, optional): Called with the number of journals written and their total after every batch.
+        is_cancelled (callable, optional): Polled between batches, the export raises ExportCancelled when it returns
+            True.
+
+    Returns:
+        int: The number of journals written.
+    """
+    repository = Repository(connection)
+    journal_ids = repository.search_ids(criteria, order)
+    batches = repository.export_rows(journal_ids, EXPORT_BATCH_SIZE)
+    try:
+        return write_export(path, batches, writer_class, len(journal_ids), progress, is_cancelled)
+    finally:
+        batches.close()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       fetch_cache.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+import json
+import os
+
+
+class ExportUnchanged(Exception):
+    """
+    Raised when the SCImago export is the one already imported, either because the server answered "304 Not
+    Modified" or because the downloaded content has the same hash.
+    """
+
+
+class FetchCache:
+    """
+    The FetchCache class keeps, next to the downloaded export, what is needed to avoid downloading and importing the
+    same export twice: the ETag and Last-Modified validators sent by the server, the SHA-256 of the last download and
+    the SHA-256 of the last export successfully imported.
+
+    Example usage:
+    cache = FetchCache(settings.csv_file_path)
+    response = requests.get(settings.data_url, headers=cache.conditional_headers())
+    """
+
+    def __init__(self, data_path):
+        """
+        Initialize the FetchCache, loading the metadata stored by a previous update.
+
+        Args:
+            data_path (str): The path of the downloaded export, the metadata is stored in "<data_path>.cache.json".
+        """
+        self.path = data_path + ".cache.json"
+        self.etag = None
+        self.last_modified = None
+        self.sha256 = None
+        self.imported_sha256 = None
+        self.load()
+
+    def load(self):
+        """
+        Load the metadata, a missing or unreadable file meaning an empty cache.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self.etag = data.get("etag")
+        self.last_modified = data.get("last_modified")
+        self.sha256 = data.get("sha256")
+        self.imported_sha256 = data.get("imported_sha256")
+
+    def save(self):
+        """
+        Store the metadata, replacing the previous file atomically.
+        """
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        data = {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "sha256": self.sha256,
+            "imported_sha256": self.imported_sha256,
+        }
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(self.path + ".tmp", self.path)
+
+    def conditional_headers(self):
+        """
+        Build the headers of a conditional request. The validators are only sent when the last download was imported,
+        otherwise a "304 Not Modified" would hide an export that never made it into the database.
+
+        Returns:
+            dict: The request headers, empty when the export must be downloaded anyway.
+        """
+        headers = {}
+        if self.sha256 is None or self.sha256 != self.imported_sha256:
+            return headers
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def record_download(self, response, sha256):
+        """
+        Remember the validators and the hash of a complete download.
+
+        Args:
+            response (requests.Response): The response of the download.
+            sha256 (str): The hexadecimal SHA-256 of the downloaded content.
+        """
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.sha256 = sha256
+        self.save()
+
+    def is_imported(self, sha256):
+        """
+        Whether the content with this hash is the last one imported.
+        """
+        return sha256 == self.imported_sha256
+
+    def mark_imported(self, sha256):
+        """
+        Remember the hash of the export that was just committed to the database.
+        """
+        self.imported_sha256 = sha256
+        self.save()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       fulltext.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# "journal_fts" is an FTS5 index over the title, publisher, ISSN, categories and areas of every journal, refreshed by
+# the importer after "journal_summary". SQLite builds without FTS5 simply have no index, and searches fall back to
+# LIKE on the title.
+#
+
+import re
+import sqlite3
+
+from core.sql import chunks, placeholders
+
+# BM25 weight of each indexed column, in declaration order: a match in the title matters most.
+WEIGHTS = (10.0, 2.0, 5.0, 1.0, 1.0)
+
+INDEX_SELECT = """
+    SELECT journaux.id, journaux.title, journaux.publisher, journaux.issn, journal_summary.categories,
+        journal_summary.areas
+    FROM journaux
+    LEFT JOIN journal_summary ON journal_summary.id_journal = journaux.id
+"""
+
+TOKEN_PATTERN = re.compile(r"\w+(?:-\w+)*")
+ISSN_PATTERN = re.compile(r"^\d{4}-\d{3}[\dxX]$")
+
+
+def fts5_available(connection):
+    """
+    Whether the SQLite library supports FTS5.
+    """
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(content)")
+    except sqlite3.OperationalError:
+        return False
+    connection.execute("DROP TABLE temp.fts5_probe")
+    return True
+
+
+def has_index(connection):
+    """
+    Whether the database has the full-text index.
+    """
+    return connection.execute(
+        "SELECT EXISTS (SELECT 1 FROM sqlite_master WHERE name = 'journal_fts')"
+    ).fetchone()[0] == 1
+
+
+def create_index(connection):
+    """
+    Create and fill the full-text index, when FTS5 is available.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+
+    Returns:
+        bool: Whether the index exists.
+    """
+    if not fts5_available(connection):
+        return False
+
+    connection.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS journal_fts USING fts5(
+            title, publisher, issn, categories, areas,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    refresh_index(connection)
+    return True
+
+
+def refresh_index(connection, journal_ids=None):
+    """
+    Re-index journals, in the caller's transaction. Does nothing without the index.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        journal_ids (iterable, optional): The journals to re-index, deleted journals leaving the index. Defaults to
+            None, which rebuilds the whole index.
+    """
+    if not has_index(connection):
+        return
+
+    insert = "INSERT INTO journal_fts (rowid, title, publisher, issn, categories, areas)"
+    if journal_ids is None:
+        connection.execute("DELETE FROM journal_fts")
+        connection.execute(f"{insert} {INDEX_SELECT}")
+        return
+
+    for chunk in chunks(journal_ids):
+        connection.execute(f"DELETE FROM journal_fts WHERE rowid IN ({placeholders(chunk)})", chunk)
+        connection.execute(f"{insert} {INDEX_SELECT} WHERE journaux.id IN ({placeholders(chunk)})", chunk)
+
+
+def match_expression(keyword):
+    """
+    Turn what the user typed into an FTS5 query: every word must match, as a prefix, in any indexed column. ISSN typed
+    with a dash ("1234-5678") are matched against the export's undashed form.
+
+    Args:
+        keyword (str): The text typed in the keyword field.
+
+    Returns:
+        str: The MATCH expression, empty when the text has no word.
+    """
+    terms = []
+    for token in TOKEN_PATTERN.findall(keyword):
+        if ISSN_PATTERN.match(token):
+            token = token.replace("-", "")
+        terms.append('"{}"*'.format(token.replace('"', '""')))
+    return " ".join(terms)
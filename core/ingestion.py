@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       ingestion.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+import csv
+import hashlib
+import re
+import sqlite3
+from itertools import islice
+
+from core import fulltext, schema, summary
+from core.query_builder import to_quartile_rank
+from core.sql import chunks, placeholders
+
+# Number of CSV rows written per executemany() round.
+BATCH_SIZE = 2000
+
+# Largest share of the journals an incremental import deletes. More journals missing from an export is more likely a
+# truncated or partial download than journals dropped by SCImago: they are then kept.
+MAX_DELETED_SHARE = 0.1
+
+# Columns of the "journaux" table filled from the SCImago export, in insertion order.
+JOURNAL_COLUMNS = (
+    "sourceid", "title", "type", "issn", "sjr", "h_index", "last_year_docs", "three_years_docs", "refs", "cites",
+    "citables", "cites_on_docs", "ref_on_docs", "country", "region", "publisher"
+)
+
+# Written along with the export columns: a digest of the parsed row, used by incremental imports.
+UPSERT_COLUMNS = JOURNAL_COLUMNS + ("fingerprint",)
+
+UPSERT_JOURNAL = """
+    INSERT INTO journaux ({columns})
+    VALUES ({placeholders})
+    ON CONFLICT(issn) DO UPDATE SET {assignments}
+""".format(
+    columns=", ".join(UPSERT_COLUMNS),
+    placeholders=", ".join("?" * len(UPSERT_COLUMNS)),
+    assignments=", ".join(f"{column} = excluded.{column}" for column in UPSERT_COLUMNS if column != "issn")
+)
+
+CATEGORY_PATTERN = re.compile(r'(.*)(\(Q[1-4]\))$')
+
+
+class ImportCancelled(Exception):
+    """
+    Raised from within an import when the caller asked for it to stop. The surrounding transaction must be rolled back.
+    """
+
+
+class ImportStats:
+    """
+    Counters describing what an import did to the database.
+
+    Example usage:
+    stats = import_csv(settings.csv_file_path)
+    print(stats.rows, "rows imported")
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.deleted = 0
+        # Journals missing from the export but not deleted, see MAX_DELETED_SHARE
+        self.missing_kept = 0
+
+    def __repr__(self):
+        return (f"ImportStats(rows={self.rows}, inserted={self.inserted}, updated={self.updated}, "
+                f"unchanged={self.unchanged}, deleted={self.deleted}, missing_kept={self.missing_kept})")
+
+
+def configure_bulk_load(connection):
+    """
+    Tune the connection pragmas for a large write transaction.
+
+    Args:
+        connection (sqlite3.Connection): The connection used for the import.
+    """
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute("PRAGMA temp_store = MEMORY")
+    connection.execute("PRAGMA cache_size = -65536")
+    connection.execute("PRAGMA foreign_keys = OFF")
+
+
+def to_float(value):
+    """
+    Convert a SCImago decimal ("1,234") to a float, empty values becoming None.
+    """
+    value = value.strip().replace(",", ".")
+    return float(value) if value else None
+
+
+def to_int(value):
+    """
+    Convert a SCImago integer to an int, empty values becoming None.
+    """
+    value = value.strip()
+    return int(value) if value else None
+
+
+def find_last_year_column(fieldnames):
+    """
+    Find the "Total Docs. (YYYY)" column, whose name changes with every yearly export.
+
+    Args:
+        fieldnames (list): The CSV header.
+
+    Returns:
+        str: The column name.
+    """
+    for name in fieldnames:
+        if name.startswith("Total Docs. (") and name != "Total Docs. (3years)":
+            return name
+    raise KeyError("Total Docs. (YYYY)")
+
+
+def parse_categories(text):
+    """
+    Split the "Categories" field into (label, quartile) pairs.
+
+    Args:
+        text (str): The raw field, e.g. "Oncology (Q1); Cancer Research (Q2)".
+
+    Returns:
+        list: The (label, quartile) pairs, quartile being '-' when SCImago gives none.
+    """
+    categories = {}
+    for category in text.split(';'):
+        # We use a regular expression to separate the name of the category and the quartile
+        match = CATEGORY_PATTERN.match(category.strip())
+
+        if match is not None:
+            category, quartile = match.groups()
+            category = category.strip()
+            quartile = quartile.strip('()')
+        else:
+            category = category.strip()
+            quartile = '-'
+
+        if category:
+            categories.setdefault(category, quartile)
+    return list(categories.items())
+
+
+def parse_areas(text):
+    """
+    Split the "Areas" field into labels.
+
+    Args:
+        text (str): The raw field, e.g. "Medicine; Biochemistry, Genetics and Molecular Biology".
+
+    Returns:
+        list: The area labels.
+    """
+    areas = (area.strip() for area in text.split(';'))
+    return list(dict.fromkeys(area for area in areas if area))
+
+
+def parse_row(row, last_year_column):
+    """
+    Convert a CSV row into database values.
+
+    Args:
+        row (dict): The row as read by csv.DictReader.
+        last_year_column (str): The name of the "Total Docs. (YYYY)" column.
+
+    Returns:
+        tuple: The journal values (ordered as JOURNAL_COLUMNS), the categories and the areas.
+    """
+    journal = (
+        row['Sourceid'], row['Title'], row['Type'], row['Issn'], to_float(row['SJR']) or 0.0, to_int(row['H index']),
+        to_int(row[last_year_column]), to_int(row['Total Docs. (3years)']), to_int(row['Total Refs.']),
+        to_int(row['Total Cites (3years)']), to_int(row['Citable Docs. (3years)']),
+        to_float(row['Cites / Doc. (2years)']), to_float(row['Ref. / Doc.']), row['Country'], row['Region'],
+        row['Publisher']
+    )
+    return journal, parse_categories(row['Categories']), parse_areas(row['Areas'])
+
+
+def iter_batches(iterable, size):
+    """
+    Yield lists of at most `size` items from `iterable`.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def row_fingerprint(journal, categories, areas):
+    """
+    Digest of a parsed row, stored in "journaux.fingerprint" to detect rows that did not change since the last import.
+
+    Args:
+        journal (tuple): The journal values, ordered as JOURNAL_COLUMNS.
+        categories (list): The (label, quartile) pairs.
+        areas (list): The area labels.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    return hashlib.blake2b(repr((journal, categories, areas)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def resolve_journal_ids(cursor, issns, journals):
+    """
+    Fetch the ids of freshly inserted journals and store them in the `journals` cache.
+    """
+    for chunk in chunks(issns):
+        cursor.execute(f"SELECT issn, id FROM journaux WHERE issn IN ({placeholders(chunk)})", chunk)
+        for issn, journal_id in cursor.fetchall():
+            journals[issn] = (journal_id, journals[issn][1])
+
+
+def delete_links(cursor, journal_ids):
+    """
+    Delete the categories and areas of the given journals.
+    """
+    rows = [(journal_id,) for journal_id in journal_ids]
+    cursor.executemany("DELETE FROM journaux_categories WHERE id_journal = ?", rows)
+    cursor.executemany("DELETE FROM journaux_areas WHERE id_journal = ?", rows)
+
+
+def delete_journals(cursor, journal_ids):
+    """
+    Delete journals along with their categories, areas and enrichment metrics. Their summary rows and full-text
+    entries go with the next refresh.
+    """
+    delete_links(cursor, journal_ids)
+    rows = [(journal_id,) for journal_id in journal_ids]
+    cursor.executemany("DELETE FROM journal_metrics WHERE id_journal = ?", rows)
+    cursor.executemany("DELETE FROM journaux WHERE id = ?", rows)
+
+
+def write_batch(cursor, batch, journals, stats, incremental=False):
+    """
+    Write a batch of parsed rows with one executemany() per table.
+
+    Args:
+        cursor (sqlite3.Cursor): The cursor of the import transaction.
+        batch (list): Parsed rows as returned by parse_row().
+        journals (dict): ISSN to (journal id, fingerprint) cache, updated in place.
+        stats (ImportStats): The counters to update.
+        incremental (bool, optional): Skip the rows whose fingerprint did not change, and replace the categories and
+            areas of the others. Defaults to False, where every row is written and the link tables are expected to
+            have been emptied beforehand.
+
+    Returns:
+        set: The IDs of the journals written.
+    """
+    stats.rows += len(batch)
+
+    changed = []
+    for journal, categories, areas in batch:
+        issn = journal[3]
+        fingerprint = row_fingerprint(journal, categories, areas)
+        known = journals.get(issn)
+
+        if known is None:
+            stats.inserted += 1
+        elif incremental and known[1] == fingerprint:
+            stats.unchanged += 1
+            continue
+        else:
+            stats.updated += 1
+
+        journals[issn] = (known[0] if known else None, fingerprint)
+        changed.append((journal + (fingerprint,), categories, areas))
+
+    if not changed:
+        return set()
+
+    cursor.executemany(UPSERT_JOURNAL, [journal for journal, _, _ in changed])
+
+    issns = [journal[3] for journal, _, _ in changed]
+    resolve_journal_ids(cursor, [issn for issn in dict.fromkeys(issns) if journals[issn][0] is None], journals)
+
+    if incremental:
+        delete_links(cursor, {journals[issn][0] for issn in issns})
+
+    journal_categories = []
+    journal_areas = []
+    for issn, (_, categories, areas) in zip(issns, changed):
+        journal_id = journals[issn][0]
+        journal_categories.extend((journal_id, label, quartile, to_quartile_rank(quartile))
+                                  for label, quartile in categories)
+        journal_areas.extend((journal_id, label) for label in areas)
+
+    cursor.executemany("INSERT OR IGNORE INTO categories (label) VALUES (?)",
+                       {(label,) for _, label, _, _ in journal_categories})
+    cursor.executemany("""
+        INSERT OR REPLACE INTO journaux_categories (id_journal, label_category, quartile, quartile_rank)
+        VALUES (?, ?, ?, ?)
+    """, journal_categories)
+
+    cursor.executemany("INSERT OR IGNORE INTO areas (label) VALUES (?)", {(label,) for _, label in journal_areas})
+    cursor.executemany("""
+        INSERT OR REPLACE INTO journaux_areas (id_journal, label_area)
+        VALUES (?, ?)
+    """, journal_areas)
+
+    return {journals[issn][0] for issn in issns}
+
+
+def import_rows(connection, reader, batch_size=BATCH_SIZE, progress=None, is_cancelled=None, incremental=False):
+    """
+    Import SCImago rows in batches. The statements run in the caller's transaction: nothing is committed here, so
+    that the caller decides whether the whole import is kept or rolled back.
+
+    A full import rewrites every journal and rebuilds the categories and areas from scratch. An incremental import
+    only writes the journals whose row changed since the last import, and deletes the journals that are no longer in
+    the export, unless they are more than MAX_DELETED_SHARE of the journals: none is deleted then, as the export is
+    likely incomplete.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        reader (csv.DictReader): The parsed SCImago export.
+        batch_size (int, optional): Rows written per round. Defaults to BATCH_SIZE.
+        progress (callable, optional): Called with the ImportStats after every batch.
+        is_cancelled (callable, optional): Polled between batches, the import raises ImportCancelled when it
+            returns True.
+        incremental (bool, optional): Run an incremental import. Defaults to False.
+
+    Returns:
+        ImportStats: What the import did.
+    """
+    last_year_column = find_last_year_column(reader.fieldnames or [])
+    cursor = connection.cursor()
+
+    if not incremental:
+        # Categories and areas are rebuilt from scratch
+        cursor.execute("DELETE FROM journaux_categories")
+        cursor.execute("DELETE FROM journaux_areas")
+
+    journals = {
+        issn: (journal_id, fingerprint)
+        for journal_id, issn, fingerprint in cursor.execute("SELECT id, issn, fingerprint FROM journaux")
+    }
+    previous_issns = set(journals)
+    seen_issns = set()
+    written_ids = set()
+    stats = ImportStats()
+
+    for batch in iter_batches(reader, batch_size):
+        if is_cancelled is not None and is_cancelled():
+            raise ImportCancelled()
+
+        rows = [parse_row(row, last_year_column) for row in batch]
+        seen_issns.update(journal[3] for journal, _, _ in rows)
+        written_ids |= write_batch(cursor, rows, journals, stats, incremental)
+
+        if progress is not None:
+            progress(stats)
+
+    if incremental:
+        missing = [journals[issn][0] for issn in previous_issns - seen_issns]
+        if len(missing) > MAX_DELETED_SHARE * len(previous_issns):
+            stats.missing_kept = len(missing)
+            missing = []
+        delete_journals(cursor, missing)
+        stats.deleted = len(missing)
+
+    # Keep the lists' denormalized rows and the full-text index in line with what was written
+    refreshed_ids = written_ids | set(missing) if incremental else None
+    summary.refresh_summary(connection, refreshed_ids)
+    fulltext.refresh_index(connection, refreshed_ids)
+    schema.bump_data_version(connection)
+
+    return stats
+
+
+def import_reader(reader, database, batch_size=BATCH_SIZE, progress=None, is_cancelled=None, incremental=False):
+    """
+    Import SCImago rows into the database, in a single transaction.
+
+    Args:
+        reader (csv.DictReader): The parsed SCImago export, possibly still streaming from the network.
+        database (str): The SQLite database path.
+        batch_size (int, optional): Rows written per round. Defaults to BATCH_SIZE.
+        progress (callable, optional): Called with the ImportStats after every batch.
+        is_cancelled (callable, optional): Polled between batches, the import is rolled back and ImportCancelled
+            raised when it returns True.
+        incremental (bool, optional): Only write the rows that changed since the last import, see import_rows().
+            Defaults to False.
+
+    Returns:
+        ImportStats: What the import did.
+    """
+    connection = sqlite3.connect(database)
+    try:
+        configure_bulk_load(connection)
+        schema.migrate(connection)
+
+        with connection:
+            return import_rows(connection, reader, batch_size, progress, is_cancelled, incremental)
+    finally:
+        connection.close()
+
+
+def import_csv(path, database, batch_size=BATCH_SIZE, progress=None, is_cancelled=None, incremental=False):
+    """
+    Import a SCImago CSV export into the database, in a single transaction.
+
+    Args:
+        path (str): The CSV file.
+        database (str): The SQLite database path.
+        batch_size (int, optional): Rows written per round. Defaults to BATCH_SIZE.
+        progress (callable, optional): Called with the ImportStats after every batch.
+        is_cancelled (callable, optional): Polled between batches, the import is rolled back and ImportCancelled
+            raised when it returns True.
+        incremental (bool, optional): Only write the rows that changed since the last import, see import_rows().
+            Defaults to False.
+
+    Returns:
+        ImportStats: What the import did.
+
+    Example:
+        >>> import_csv(settings.csv_file_path, settings.database)
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+        reader = csv.DictReader(file, delimiter=';')
+        return import_reader(reader, database, batch_size, progress, is_cancelled, incremental)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       lookups.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# The vocabularies of the search form (categories, areas, countries, regions and types), loaded once and shared by
+# every dialog. They are kept until the data version of the database changes, see schema.get_data_version.
+#
+
+import threading
+from collections import namedtuple
+
+from core import repository, schema
+from core.repository import Repository
+
+Lookups = namedtuple("Lookups", ["version", "categories", "areas", "countries", "regions", "types"])
+
+_lookups = None
+_lock = threading.Lock()
+
+
+def load_lookups(connection):
+    """
+    Read the vocabularies from the database.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+
+    Returns:
+        Lookups: The vocabularies, sorted.
+    """
+    reader = Repository(connection)
+    return Lookups(
+        version=schema.get_data_version(connection),
+        categories=reader.categories(),
+        areas=reader.areas(),
+        countries=reader.distinct_values("country"),
+        regions=reader.distinct_values("region"),
+        types=reader.distinct_values("type"),
+    )
+
+
+def get_lookups(connection=None):
+    """
+    Get the vocabularies shared by every thread, reading them again only when the data version changed.
+
+    Args:
+        connection (sqlite3.Connection, optional): The database connection. Defaults to the connection of the current
+            thread.
+
+    Returns:
+        Lookups: The vocabularies.
+    """
+    global _lookups
+    connection = connection or repository.get_connection()
+    with _lock:
+        if _lookups is None or _lookups.version != schema.get_data_version(connection):
+            _lookups = load_lookups(connection)
+        return _lookups
+
+
+def preload(database=None):
+    """
+    Load the vocabularies in a background thread, so that the first dialog using them does not wait.
+
+    Args:
+        database (str, optional): The SQLite database path. Defaults to settings.database.
+    """
+
+    def run():
+        try:
+            get_lookups(repository.get_connection(database))
+        finally:
+            repository.close_connections()
+
+    threading.Thread(target=run, name="lookups-preload", daemon=True).start()
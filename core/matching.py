@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       matching.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Matches the journals of the database with those of an enrichment source (an impact factor dataset, search results).
+# A journal is matched on its ISSN first, then on its normalized title, then on the most similar title of the source.
+#
+# The similar titles are not searched pairwise: every title of the source is indexed by its character trigrams, and
+# the candidates of a journal are the titles sharing its rarest trigrams. Only the best candidates are scored, the
+# confidence being the mean of the token-set ratio and of the trigram Dice coefficient of the titles.
+#
+
+import re
+import unicodedata
+from collections import Counter, namedtuple
+from difflib import SequenceMatcher
+
+# Length of the character n-grams indexed.
+NGRAM = 3
+
+# Number of the rarest trigrams of a title looking up its candidates, and of candidates compared by trigrams, the best
+# SCORED of them being scored.
+BLOCKING_GRAMS = 4
+CANDIDATES = 20
+SCORED = 3
+
+# Confidence below which a similar title is not a match.
+MIN_CONFIDENCE = 0.9
+
+# How a journal was matched: on its ISSN, on its normalized title or on a similar title.
+MATCH_ISSN = "issn"
+MATCH_TITLE = "title"
+MATCH_FUZZY = "fuzzy"
+
+# The entry of the source matched, by position, with the confidence of the match, 1.0 for an ISSN or the same title.
+Match = namedtuple("Match", ["index", "confidence", "method"])
+
+
+def normalize_title(title):
+    """
+    Normalize a journal title for comparison: lowercase, without accents or punctuation, "&" read as "and" and a
+    leading or trailing "the" dropped, e.g. "The Journal of Physical Chemistry A" and "Journal of physical chemistry.
+    A".
+
+    Args:
+        title (str): The title.
+
+    Returns:
+        str: The normalized title, words separated by single spaces.
+    """
+    title = unicodedata.normalize("NFKD", title.replace("&", " and ")).encode("ascii", "ignore").decode().lower()
+    words = re.sub(r"[^a-z0-9]+", " ", title).split()
+    if words and words[0] == "the":
+        words = words[1:]
+    # "Lancet, The"
+    if len(words) > 1 and words[-1] == "the":
+        words = words[:-1]
+    return " ".join(words)
+
+
+def normalize_issns(text):
+    """
+    Extract the ISSNs of a field, whatever their format: "0028-0836", "00280836" or a comma-separated list of them.
+
+    Args:
+        text (str): The field, None or empty when there is no ISSN.
+
+    Returns:
+        list: The ISSNs, as 8 uppercase characters without dash.
+    """
+    issns = []
+    for part in (text or "").split(","):
+        issn = re.sub(r"[^0-9X]", "", part.upper())
+        if len(issn) == 8:
+            issns.append(issn)
+    return issns
+
+
+def ngrams(title):
+    """
+    Get the character trigrams of a normalized title, the title being padded with a space on each side.
+
+    Returns:
+        frozenset: The trigrams.
+    """
+    padded = f" {title} "
+    return frozenset(padded[position:position + NGRAM] for position in range(len(padded) - NGRAM + 1))
+
+
+def ratio(first, second):
+    """
+    Get the similarity of two strings, as difflib: twice the characters matched over the total length.
+    """
+    if not first and not second:
+        return 1.0
+    return SequenceMatcher(None, first, second, autojunk=False).ratio()
+
+
+def token_set_ratio(first, second):
+    """
+    Compare two normalized titles on their sets of words, ignoring their order and repetitions: the common words,
+    sorted, are compared with themselves followed by the other words of each title, and the best ratio is kept. A
+    title whose words are all in the other one scores 1.0.
+
+    The comparison of the two titles with their common words first only compares their other words, the common words
+    always matching.
+
+    Args:
+        first (str): The first normalized title.
+        second (str): The second normalized title.
+
+    Returns:
+        float: The similarity, between 0.0 and 1.0.
+    """
+    first_words, second_words = set(first.split()), set(second.split())
+    common = " ".join(sorted(first_words & second_words))
+    first_rest = " ".join(sorted(first_words - second_words))
+    second_rest = " ".join(sorted(second_words - first_words))
+    if not common:
+        return ratio(first_rest, second_rest)
+    if not first_rest or not second_rest:
+        return 1.0
+
+    first_length = len(common) + 1 + len(first_rest)
+    second_length = len(common) + 1 + len(second_rest)
+    matched = 2 * (len(common) + 1) + ratio(first_rest, second_rest) * (len(first_rest) + len(second_rest))
+    return max(2 * len(common) / (len(common) + first_length), 2 * len(common) / (len(common) + second_length),
+               matched / (first_length + second_length))
+
+
+def dice(first_grams, second_grams):
+    """
+    Get the Dice coefficient of two sets of trigrams: twice the trigrams in common over their total number.
+    """
+    if not first_grams and not second_grams:
+        return 1.0
+    return 2 * len(first_grams & second_grams) / (len(first_grams) + len(second_grams))
+
+
+def series_markers(title):
+    """
+    Get the words of a normalized title telling apart the journals of a series: its numbers, and its last word when a
+    single letter, e.g. the "a" of "journal of physical chemistry a".
+    """
+    words = title.split()
+    markers = {word for word in words if any(character.isdigit() for character in word)}
+    if words and len(words[-1]) == 1:
+        markers.add(words[-1])
+    return markers
+
+
+def confidence(first, second, first_grams=None, second_grams=None):
+    """
+    Score the match of two normalized titles: the mean of their token-set ratio, which ignores the order of the words,
+    and of their trigram Dice coefficient, which tolerates typos but not the missing or extra words the token-set ratio
+    ignores. Titles of different journals of a series, see series_markers, score 0.0.
+
+    Args:
+        first (str): The first normalized title.
+        second (str): The second normalized title.
+        first_grams (frozenset, optional): The trigrams of the first title, computed when not given.
+        second_grams (frozenset, optional): The trigrams of the second title, computed when not given.
+
+    Returns:
+        float: The confidence, 1.0 for the same titles.
+    """
+    if first == second:
+        return 1.0
+    if series_markers(first) != series_markers(second):
+        return 0.0
+    first_grams = first_grams if first_grams is not None else ngrams(first)
+    second_grams = second_grams if second_grams is not None else ngrams(second)
+    return (token_set_ratio(first, second) + dice(first_grams, second_grams)) / 2
+
+
+def best_title(title, candidates, min_confidence=MIN_CONFIDENCE):
+    """
+    Find, among a few titles, the one matching a title best, e.g. among the results of a search.
+
+    Args:
+        title (str): The title searched.
+        candidates (list): The titles found.
+        min_confidence (float, optional): The confidence below which a title is not a match. Defaults to
+            MIN_CONFIDENCE.
+
+    Returns:
+        Match: The position of the title in `candidates`, None when none matches.
+    """
+    normalized = normalize_title(title)
+    best = None
+    for index, candidate in enumerate(candidates):
+        score = confidence(normalized, normalize_title(candidate))
+        if score >= min_confidence and (best is None or score > best.confidence):
+            best = Match(index, score, MATCH_TITLE if score == 1.0 else MATCH_FUZZY)
+    return best
+
+
+class TitleMatcher:
+    """
+    The TitleMatcher class indexes the journals of a source, by ISSN, by normalized title and by trigram, to match
+    many journals against them without comparing every pair. When several entries share an ISSN or a normalized
+    title, the first one wins.
+
+    Example usage:
+    matcher = TitleMatcher([("Nature", "0028-0836"), ("The Lancet", "0140-6736")])
+    match = matcher.match("Lancet, The", "01406736")
+    if match is not None:
+        print(match.index, match.confidence, match.method)
+    """
+
+    def __init__(self, entries):
+        """
+        Index the journals of a source.
+
+        Args:
+            entries (iterable): The (title, ISSN field) of the journals, see normalize_issns. They are matched by
+                position.
+        """
+        self.titles = []
+        self.grams = []
+        self.by_issn = {}
+        self.by_title = {}
+        self.postings = {}
+
+        for index, (title, issn) in enumerate(entries):
+            title = normalize_title(title or "")
+            grams = ngrams(title)
+            self.titles.append(title)
+            self.grams.append(grams)
+            self.by_title.setdefault(title, index)
+            for key in normalize_issns(issn):
+                self.by_issn.setdefault(key, index)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(index)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def candidates(self, grams):
+        """
+        Find the entries sharing the rarest trigrams of a title, most shared first.
+
+        Args:
+            grams (frozenset): The trigrams of the title.
+
+        Returns:
+            list: The positions of at most CANDIDATES entries.
+        """
+        postings = sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+        shared = Counter()
+        for posting in postings[:BLOCKING_GRAMS]:
+            shared.update(posting)
+        return [index for index, _ in shared.most_common(CANDIDATES)]
+
+    def match(self, title, issn=None, min_confidence=MIN_CONFIDENCE):
+        """
+        Match a journal: on its ISSN, then on its normalized title, then on the most similar title of the source.
+
+        Args:
+            title (str): The title of the journal.
+            issn (str, optional): The ISSN field of the journal, see normalize_issns.
+            min_confidence (float, optional): The confidence below which a similar title is not a match. Defaults to
+                MIN_CONFIDENCE.
+
+        Returns:
+            Match: The entry matched, None when none is.
+        """
+        for key in normalize_issns(issn):
+            if key in self.by_issn:
+                return Match(self.by_issn[key], 1.0, MATCH_ISSN)
+
+        title = normalize_title(title or "")
+        if title in self.by_title:
+            return Match(self.by_title[title], 1.0, MATCH_TITLE)
+
+        grams = ngrams(title)
+        compared = sorted(((dice(grams, self.grams[index]), index) for index in self.candidates(grams)), reverse=True)
+        best = None
+        for shared, index in compared[:SCORED]:
+            # The token-set ratio is at most 1.0: the titles sharing too few trigrams cannot do better
+            if (1 + shared) / 2 < max(min_confidence, best.confidence if best else 0):
+                break
+            score = confidence(title, self.titles[index], grams, self.grams[index])
+            if score >= min_confidence and (best is None or score > best.confidence):
+                best = Match(index, score, MATCH_FUZZY)
+        return best
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       query_builder.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Builds the journal search query from the search form. Only the filters actually set appear in the query, the link
+# tables being reached through subqueries rather than joined, and every comparison is on a bare indexed column.
+#
+
+import logging
+
+from core import fulltext
+
+logger = logging.getLogger(__name__)
+
+# Columns of a journal, as exposed to the views.
+JOURNAL_FIELDS = (
+    "id", "sourceid", "title", "type", "issn", "sjr", "h_index", "last_year_docs", "three_years_docs", "refs",
+    "cites", "citables", "cites_on_docs", "ref_on_docs", "country", "region", "publisher", "impact_factor"
+)
+
+# Orders of the search results: the sorted expression, and whether it is sorted in descending order. "Relevance"
+# needs a keyword searched through the full-text index, and falls back to "SJR" otherwise.
+SEARCH_ORDERS = {
+    "Relevance": ("matches.rank", False),
+    "SJR": ("journaux.sjr", True),
+    "H index": ("journaux.h_index", True),
+    "Title": ("journaux.title COLLATE NOCASE", False),
+}
+
+
+def to_number(text):
+    """
+    Read a number typed in the search form, with a dot or a comma.
+
+    Args:
+        text (str): The text typed.
+
+    Returns:
+        float: The number, None when the text is not one (yet).
+    """
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def to_quartile_rank(quartile):
+    """
+    Turn a quartile label into its rank, e.g. "Q2" into 2.
+
+    Args:
+        quartile (str): The quartile label, '-' when there is none.
+
+    Returns:
+        int: The rank, None without quartile.
+    """
+    if len(quartile) == 2 and quartile[0] in "Qq" and quartile[1] in "1234":
+        return int(quartile[1])
+    return None
+
+
+def keyset_condition(expression, descending, after):
+    """
+    Build the condition selecting the rows that come after a given row, in the order of `expression` then of the
+    journal ID. SQLite puts NULL values first in ascending order and last in descending order.
+
+    Args:
+        expression (str): The sorted expression.
+        descending (bool): Whether the expression is sorted in descending order.
+        after (tuple): The value of the expression and the journal ID of the last row seen.
+
+    Returns:
+        tuple: The condition and its parameters.
+    """
+    value, journal_id = after
+    if value is None:
+        if descending:
+            return f"({expression} IS NULL AND journaux.id > ?)", [journal_id]
+        return f"({expression} IS NOT NULL OR journaux.id > ?)", [journal_id]
+
+    operator = "<" if descending else ">"
+    condition = f"{expression} {operator} ? OR ({expression} = ? AND journaux.id > ?)"
+    if descending:
+        condition += f" OR {expression} IS NULL"
+    return f"({condition})", [value, value, journal_id]
+
+
+def build_search(keyword="", quartile="-", sjr="", impact_factor="", type_="-", country="-", region="-",
+                 categories=(), areas=(), order=None, after=None, limit=None, full_text=False):
+    """
+    Build the query searching journals matching every criterion given. Empty criteria ("" or "-") are ignored, and so
+    are numbers that do not parse.
+
+    Args:
+        keyword (str, optional): Words, or beginnings of words, that must appear in the title, publisher, ISSN,
+            categories or areas. Journals are then ranked by relevance. Without the full-text index, the words must
+            appear in the title, in that order.
+        quartile (str, optional): The worst quartile accepted, e.g. "Q2", in the categories given or, without
+            categories, in any category.
+        sjr (str, optional): The minimum SJR.
+        impact_factor (str, optional): The minimum impact factor.
+        type_ (str, optional): The journal type.
+        country (str, optional): The journal country.
+        region (str, optional): The journal region.
+        categories (list, optional): Categories the journal must all belong to.
+        areas (list, optional): Areas the journal must belong to at least one of.
+        order (str, optional): The order of the results, a key of SEARCH_ORDERS. Defaults to None, unordered.
+        after (tuple, optional): The sort value and the ID of the last journal of the previous page. Defaults to None,
+            from the first result.
+        limit (int, optional): The maximum number of results. Defaults to None, no limit.
+        full_text (bool, optional): Whether the database has the full-text index. Defaults to False.
+
+    Returns:
+        tuple: The query and its parameters, selecting JOURNAL_FIELDS, the category and area labels of
+            journal_summary, and the sort value.
+    """
+    match = fulltext.match_expression(keyword) if keyword else ""
+    ranked = bool(match) and full_text
+    if order == "Relevance" and not ranked:
+        order = "SJR"
+    sort_expression, descending = SEARCH_ORDERS[order] if order else ("NULL", False)
+
+    query = f"""SELECT {', '.join('journaux.' + field for field in JOURNAL_FIELDS)},
+            journal_summary.categories, journal_summary.areas, {sort_expression}
+            """
+    params = []
+    where_clauses = []
+
+    if ranked:
+        # The full-text matches drive the query (CROSS JOIN keeps them as the outer loop): looking them up again for
+        # every journal of another index costs a full-text query per journal
+        if order == "Relevance":
+            weights = ", ".join(str(weight) for weight in fulltext.WEIGHTS)
+            query += """FROM (SELECT rowid AS id_journal, rank FROM journal_fts
+                    WHERE journal_fts MATCH ? AND rank MATCH ?) AS matches
+                    """
+            params.extend((match, f"bm25({weights})"))
+        else:
+            query += "FROM (SELECT rowid AS id_journal FROM journal_fts WHERE journal_fts MATCH ?) AS matches\n"
+            params.append(match)
+        query += "CROSS JOIN journaux ON journaux.id = matches.id_journal\n"
+    else:
+        query += "FROM journaux\n"
+
+    if keyword and not ranked:
+        where_clauses.append("journaux.title LIKE ?")
+        params.append("%{}%".format(keyword.replace(' ', '%')))
+
+    query += "LEFT JOIN journal_summary ON journal_summary.id_journal = journaux.id"
+
+    for column, value in (("sjr", to_number(sjr)), ("impact_factor", to_number(impact_factor))):
+        if value is not None:
+            where_clauses.append(f"journaux.{column} >= ?")
+            params.append(value)
+
+    for column, value in (("type", type_), ("country", country), ("region", region)):
+        if value != "-":
+            where_clauses.append(f"journaux.{column} = ?")
+            params.append(value)
+
+    rank = to_quartile_rank(quartile)
+    if categories:
+        # Every category, each one with the quartile asked for
+        subquery = "SELECT id_journal FROM journaux_categories WHERE label_category = ?"
+        if rank is not None:
+            subquery += " AND quartile_rank <= ?"
+        where_clauses.append("journaux.id IN ({})".format(" INTERSECT ".join([subquery] * len(categories))))
+        for category in categories:
+            params.append(category)
+            if rank is not None:
+                params.append(rank)
+    elif rank is not None:
+        where_clauses.append("""EXISTS (SELECT 1 FROM journaux_categories
+                WHERE journaux_categories.id_journal = journaux.id AND quartile_rank <= ?)""")
+        params.append(rank)
+
+    if areas:
+        where_clauses.append("""EXISTS (SELECT 1 FROM journaux_areas
+                WHERE journaux_areas.id_journal = journaux.id AND label_area IN ({}))""".format(
+            ", ".join("?" * len(areas))))
+        params.extend(areas)
+
+    # Resume after the last journal of the previous page
+    if order and after is not None:
+        condition, condition_params = keyset_condition(sort_expression, descending, after)
+        where_clauses.append(condition)
+        params.extend(condition_params)
+
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    if order:
+        query += f" ORDER BY {sort_expression}{' DESC' if descending else ''}, journaux.id"
+
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return query, params
+
+
+def explain(connection, query, params):
+    """
+    Get the plan SQLite chose for a query.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        query (str): The query.
+        params (list): Its parameters.
+
+    Returns:
+        list: The steps of the plan, indented by depth.
+    """
+    depths = {0: -1}
+    steps = []
+    for node_id, parent_id, _, detail in connection.execute(f"EXPLAIN QUERY PLAN {query}", params):
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        steps.append("  " * depths[node_id] + detail)
+    return steps
+
+
+def log_plan(connection, query, params):
+    """
+    Log a query along with its plan, for settings.debug_queries.
+    """
+    logger.info("%s\n%s\nparameters: %s\n%s", "-" * 40, " ".join(query.split()), params,
+                "\n".join(explain(connection, query, params)))
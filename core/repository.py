@@ -0,0 +1,471 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       repository.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+import json
+import sqlite3
+import threading
+from collections import namedtuple
+
+import settings
+from core import columnar_index, fulltext, query_builder, schema
+from core.query_builder import JOURNAL_FIELDS
+from core.sql import savepoint
+from core.summary import split_labels
+
+Journal = namedtuple("Journal", JOURNAL_FIELDS)
+JournalCategory = namedtuple("JournalCategory", ["label", "quartile"])
+JournalSummary = namedtuple("JournalSummary", ["id", "title", "categories", "areas"])
+
+# A journal along with its "; "-separated category and area labels, see core.summary.
+JournalRow = namedtuple("JournalRow", JOURNAL_FIELDS + ("categories", "areas"))
+
+# A journal along with the list of its JournalCategory and the list of its area labels, for the exports.
+ExportRow = namedtuple("ExportRow", JOURNAL_FIELDS + ("categories", "areas"))
+
+# Connection pragmas: readers never block the writer in WAL mode, and the database is mapped in memory.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -32768",
+    "PRAGMA temp_store = MEMORY",
+)
+
+_local = threading.local()
+_migrated = set()
+_migration_lock = threading.Lock()
+
+
+def configure(connection):
+    """
+    Apply the application pragmas to a new connection.
+
+    Args:
+        connection (sqlite3.Connection): The connection to configure.
+    """
+    for pragma in PRAGMAS:
+        connection.execute(pragma)
+
+
+def initialize(database=None):
+    """
+    Create or migrate the database schema, once per process and database.
+
+    Args:
+        database (str, optional): The SQLite database path. Defaults to settings.database.
+    """
+    database = database or settings.database
+    with _migration_lock:
+        if database in _migrated:
+            return
+        connection = sqlite3.connect(database)
+        try:
+            configure(connection)
+            schema.migrate(connection)
+        finally:
+            connection.close()
+        _migrated.add(database)
+
+
+def get_connection(database=None):
+    """
+    Get the connection of the current thread, opening and configuring it on first use. SQLite connections cannot be
+    shared between threads, but one connection per thread is enough for the whole application.
+
+    Args:
+        database (str, optional): The SQLite database path. Defaults to settings.database.
+
+    Returns:
+        sqlite3.Connection: The connection.
+    """
+    database = database or settings.database
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    connection = connections.get(database)
+    if connection is None:
+        initialize(database)
+        connection = sqlite3.connect(database)
+        configure(connection)
+        connections[database] = connection
+    return connection
+
+
+def close_connections():
+    """
+    Close the connections of the current thread, for threads that are about to stop.
+    """
+    for connection in getattr(_local, "connections", {}).values():
+        connection.close()
+    _local.connections = {}
+
+
+class Repository:
+    """
+    The Repository class gathers every query of the application on the journal database.
+
+    Example usage:
+    repository = Repository()
+    journal = repository.journal(1)
+    print(journal.title)
+    """
+
+    def __init__(self, connection=None):
+        """
+        Initialize the Repository.
+
+        Args:
+            connection (sqlite3.Connection, optional): The connection to use. Defaults to the connection of the
+                current thread.
+        """
+        self.connection = connection or get_connection()
+
+    def journal(self, journal_id):
+        """
+        Fetch a journal.
+
+        Args:
+            journal_id (int): The ID of the journal.
+
+        Returns:
+            Journal: The journal, None when it does not exist.
+        """
+        row = self.connection.execute(
+            f"SELECT {', '.join(JOURNAL_FIELDS)} FROM journaux WHERE id = ?", (journal_id,)
+        ).fetchone()
+        return Journal(*row) if row is not None else None
+
+    def journal_categories(self, journal_id):
+        """
+        Fetch the categories of a journal.
+
+        Args:
+            journal_id (int): The ID of the journal.
+
+        Returns:
+            list: The JournalCategory of the journal.
+        """
+        rows = self.connection.execute("""
+            SELECT label_category, quartile
+            FROM journaux_categories
+            WHERE id_journal = ?
+        """, (journal_id,))
+        return [JournalCategory(*row) for row in rows]
+
+    def journal_areas(self, journal_id):
+        """
+        Fetch the areas of a journal.
+
+        Args:
+            journal_id (int): The ID of the journal.
+
+        Returns:
+            list: The area labels.
+        """
+        rows = self.connection.execute("SELECT label_area FROM journaux_areas WHERE id_journal = ?", (journal_id,))
+        return [row[0] for row in rows]
+
+    def journal_count(self):
+        """
+        Count the journals.
+        """
+        return self.connection.execute("SELECT COUNT(*) FROM journaux").fetchone()[0]
+
+    def journal_summary_page(self, after_id=0, limit=500):
+        """
+        Fetch a page of journals with their category and area labels, for the main list. Pages are ordered by ID and
+        fetched from the last ID seen, so every page costs the same whatever its position.
+
+        Args:
+            after_id (int, optional): The last ID of the previous page. Defaults to 0, the first page.
+            limit (int, optional): The page size. Defaults to 500.
+
+        Returns:
+            list: The JournalSummary, categories and areas being "; "-separated labels.
+        """
+        rows = self.connection.execute("""
+            SELECT id_journal, title, categories, areas
+            FROM journal_summary
+            WHERE id_journal > ?
+            ORDER BY id_journal
+            LIMIT ?
+        """, (after_id, limit))
+        return [JournalSummary(*row) for row in rows]
+
+    def categories(self):
+        """
+        List the category labels.
+        """
+        return [row[0] for row in self.connection.execute("SELECT label FROM categories ORDER BY label")]
+
+    def areas(self):
+        """
+        List the area labels.
+        """
+        return [row[0] for row in self.connection.execute("SELECT label FROM areas ORDER BY label")]
+
+    def distinct_values(self, column):
+        """
+        List the distinct values of a journal column.
+
+        Args:
+            column (str): One of "type", "country" or "region".
+
+        Returns:
+            list: The sorted values.
+        """
+        if column not in ("type", "country", "region"):
+            raise ValueError(f"Unsupported column: {column}")
+        rows = self.connection.execute(f"SELECT DISTINCT {column} FROM journaux ORDER BY {column}")
+        return [row[0] for row in rows]
+
+    def search_query(self, **criteria):
+        """
+        Build the query searching journals, see query_builder.build_search for the criteria.
+
+        Returns:
+            tuple: The query and its parameters, selecting the fields of JournalRow followed by the sort value.
+        """
+        return query_builder.build_search(**criteria, full_text=fulltext.has_index(self.connection))
+
+    def execute_search(self, query, params):
+        """
+        Run a search query, logging its plan first with settings.debug_queries.
+
+        Returns:
+            sqlite3.Cursor: The cursor over the results.
+        """
+        if settings.debug_queries:
+            query_builder.log_plan(self.connection, query, params)
+        return self.connection.execute(query, params)
+
+    def search_journals(self, **criteria):
+        """
+        Search journals, see search_query for the criteria. Results are ordered by relevance unless another order is
+        given.
+
+        Returns:
+            list: The JournalRow found, with their categories and areas.
+        """
+        criteria.setdefault("order", "Relevance")
+        query, params = self.search_query(**criteria)
+        return [JournalRow(*row[:-1]) for row in self.execute_search(query, params)]
+
+    def count_journals(self, criteria):
+        """
+        Count the journals a search finds.
+
+        Args:
+            criteria (dict): The search criteria, keyword arguments of search_query.
+
+        Returns:
+            int: The number of journals found.
+        """
+        index = self.search_index()
+        if index is not None:
+            return index.count_matching(self.connection, criteria)
+
+        query, params = self.search_query(**criteria)
+        return self.execute_search(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+
+    def search_page(self, criteria, order="Relevance", after=None, limit=500):
+        """
+        Fetch a page of search results. In SQL, pages are fetched from the last journal seen rather than with an
+        offset, so every page costs the same whatever its position. With the in-memory index, the results are found
+        again and sliced.
+
+        Args:
+            criteria (dict): The search criteria, keyword arguments of search_query.
+            order (str, optional): The order of the results, a key of SEARCH_ORDERS. Defaults to "Relevance".
+            after (tuple, optional): What the previous page returned to resume from. Defaults to None, the first page.
+            limit (int, optional): The page size. Defaults to 500.
+
+        Returns:
+            tuple: The JournalRow of the page, and what to resume from for the next page, None when the results are
+                exhausted.
+        """
+        index = self.search_index()
+        if index is not None:
+            offset = after or 0
+            journal_ids = index.search(self.connection, criteria, order)[offset:offset + limit].tolist()
+            # Decided on the IDs: the journals deleted since the index was loaded are left out of the rows
+            if len(journal_ids) < limit:
+                return self.journal_rows(journal_ids), None
+            return self.journal_rows(journal_ids), offset + len(journal_ids)
+
+        query, params = self.search_query(**criteria, order=order, after=after, limit=limit)
+        rows = self.execute_search(query, params).fetchall()
+        after = (rows[-1][-1], rows[-1][0]) if len(rows) == limit else None
+        return [JournalRow(*row[:-1]) for row in rows], after
+
+    def search_index(self):
+        """
+        Get the in-memory search index, see core.columnar_index.
+
+        Returns:
+            ColumnarIndex: The index, None when settings.columnar_index is disabled or NumPy is not installed.
+        """
+        if settings.columnar_index and columnar_index.available():
+            return columnar_index.get_index(self.connection)
+        return None
+
+    def facet_counts(self, criteria):
+        """
+        Count the journals of every category and area under search criteria, see ColumnarIndex.facet_counts.
+
+        Returns:
+            tuple: The number of journals of every category label and of every area label, as dicts, or None without
+                the in-memory index.
+        """
+        index = self.search_index()
+        if index is None:
+            return None
+        return index.facet_counts(self.connection, criteria)
+
+    def journal_rows(self, journal_ids):
+        """
+        Fetch journals with their categories and areas, in the order given.
+
+        Args:
+            journal_ids (list): The IDs of the journals, at most 500.
+
+        Returns:
+            list: The JournalRow, journals that no longer exist being left out.
+        """
+        rows = self.connection.execute(f"""
+            SELECT {', '.join('journaux.' + field for field in JOURNAL_FIELDS)},
+                journal_summary.categories, journal_summary.areas
+            FROM journaux
+            LEFT JOIN journal_summary ON journal_summary.id_journal = journaux.id
+            WHERE journaux.id IN ({', '.join('?' * len(journal_ids))})
+        """, journal_ids)
+        journals = {row[0]: JournalRow(*row) for row in rows}
+        return [journals[journal_id] for journal_id in journal_ids if journal_id in journals]
+
+    def search_ids(self, criteria, order="Relevance"):
+        """
+        List the IDs of every journal a search finds.
+
+        Args:
+            criteria (dict): The search criteria, keyword arguments of search_query.
+            order (str, optional): The order of the results, a key of SEARCH_ORDERS. Defaults to "Relevance".
+
+        Returns:
+            list: The journal IDs, in the order of the results.
+        """
+        index = self.search_index()
+        if index is not None:
+            return index.search(self.connection, criteria, order).tolist()
+
+        query, params = self.search_query(**criteria, order=order)
+        return [row[0] for row in self.execute_search(query, params)]
+
+    def export_rows(self, journal_ids, batch_size=1000):
+        """
+        Stream journals with every column, their categories with quartiles and their areas, in the order given. The
+        IDs go through a temporary table joined to the journals, a single query reading them all, and the categories
+        come aggregated as JSON. The temporary table is filled and dropped in savepoints, leaving the transaction of
+        the caller, if any, open.
+
+        Args:
+            journal_ids (iterable): The IDs of the journals.
+            batch_size (int, optional): The number of rows of each batch. Defaults to 1000.
+
+        Yields:
+            list: The ExportRow of the next journals.
+        """
+        cursor = None
+        try:
+            with savepoint(self.connection, "export_ids"):
+                self.connection.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS export_ids (position INTEGER PRIMARY KEY, id_journal INTEGER)
+                """)
+                self.connection.execute("DELETE FROM temp.export_ids")
+                self.connection.executemany("INSERT INTO temp.export_ids (id_journal) VALUES (?)",
+                                            ((journal_id,) for journal_id in journal_ids))
+
+            cursor = self.connection.execute(f"""
+                SELECT {', '.join('journaux.' + field for field in JOURNAL_FIELDS)},
+                    (SELECT json_group_array(json_array(label_category, quartile)) FROM (
+                        SELECT label_category, quartile FROM journaux_categories
+                        WHERE journaux_categories.id_journal = journaux.id ORDER BY rowid)),
+                    journal_summary.areas
+                FROM temp.export_ids
+                JOIN journaux ON journaux.id = export_ids.id_journal
+                LEFT JOIN journal_summary ON journal_summary.id_journal = journaux.id
+                ORDER BY export_ids.position
+            """)
+            rows = cursor.fetchmany(batch_size)
+            while rows:
+                yield [ExportRow(*row[:-2], [JournalCategory(*category) for category in json.loads(row[-2])],
+                                 split_labels(row[-1])) for row in rows]
+                rows = cursor.fetchmany(batch_size)
+        finally:
+            # A table cannot be dropped while a statement still reads it
+            if cursor is not None:
+                cursor.close()
+            with savepoint(self.connection, "export_ids"):
+                self.connection.execute("DROP TABLE IF EXISTS temp.export_ids")
+
+    def journal_identifiers(self):
+        """
+        List the (id, title, ISSN) of every journal, for the enrichment tools.
+        """
+        return self.connection.execute("SELECT id, title, issn FROM journaux").fetchall()
+
+    def stale_journals(self, source, fetched_before):
+        """
+        List the journals an enrichment source has not fetched since a given time, those never fetched first, then
+        the oldest fetched.
+
+        Args:
+            source (str): The name of the source.
+            fetched_before (float): The time, in seconds since the epoch, before which a fetch is stale.
+
+        Returns:
+            list: The (id, title, ISSN) of the journals.
+        """
+        return self.connection.execute("""
+            SELECT journaux.id, journaux.title, journaux.issn
+            FROM journaux
+            LEFT JOIN (
+                SELECT id_journal, MIN(fetched_at) AS fetched_at
+                FROM journal_metrics
+                WHERE source = ?
+                GROUP BY id_journal
+            ) AS fetched ON fetched.id_journal = journaux.id
+            WHERE fetched.fetched_at IS NULL OR fetched.fetched_at < ?
+            ORDER BY fetched.fetched_at IS NOT NULL, fetched.fetched_at, journaux.id
+        """, (source, fetched_before)).fetchall()
+
+    def set_journal_metrics(self, metrics):
+        """
+        Store metrics fetched by an enrichment source, replacing those of the same journal, source and metric, in the
+        caller's transaction.
+
+        Args:
+            metrics (list): (journal ID, source, metric, value, fetched at) tuples.
+        """
+        self.connection.executemany("""
+            INSERT INTO journal_metrics (id_journal, source, metric, value, fetched_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(id_journal, source, metric)
+            DO UPDATE SET value = excluded.value, fetched_at = excluded.fetched_at
+        """, metrics)
+
+    def set_impact_factors(self, impact_factors):
+        """
+        Store the impact factor of several journals, in the caller's transaction.
+
+        Args:
+            impact_factors (list): (impact factor, journal ID) pairs.
+        """
+        self.connection.executemany("UPDATE journaux SET impact_factor = ? WHERE id = ?", impact_factors)
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       schema.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# The database schema is versioned with "PRAGMA user_version": migration N brings a database from version N - 1 to
+# version N. Migrations are only ever appended, never edited once released.
+#
+# The data itself is versioned by the "data_version" counter of the "metadata" table, bumped by every import and by
+# the enrichments changing impact factors, for the caches built from the journals to know when they are stale.
+#
+
+from core import fulltext, summary
+
+
+def table_columns(connection, table):
+    """
+    List the columns of a table, empty when the table does not exist.
+    """
+    return [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+
+
+# The numeric columns of the journals, with the type their values are stored as.
+NUMERIC_COLUMNS = (
+    ("sjr", "REAL"), ("h_index", "INTEGER"), ("last_year_docs", "INTEGER"), ("three_years_docs", "INTEGER"),
+    ("refs", "INTEGER"), ("cites", "INTEGER"), ("citables", "INTEGER"), ("cites_on_docs", "REAL"),
+    ("ref_on_docs", "REAL"), ("impact_factor", "REAL")
+)
+
+
+def normalize_numbers(connection):
+    """
+    Convert the numeric columns of the journals still holding text to numbers: the first importer stored the SCImago
+    fields as they are, e.g. an SJR of "18,509" or an empty H index, which SQLite sorts above every number. Decimal
+    commas become dots, and empty values NULL.
+    """
+    columns = table_columns(connection, "journaux")
+    for column, type_ in NUMERIC_COLUMNS:
+        if column not in columns:
+            continue
+        connection.execute(f"""
+            UPDATE journaux
+            SET {column} = CASE WHEN TRIM({column}) = '' THEN NULL ELSE CAST(REPLACE({column}, ',', '.') AS {type_}) END
+            WHERE typeof({column}) = 'text'
+        """)
+
+
+def migration_1_baseline(connection):
+    """
+    The tables used by the application, with the ISSN unique index the importer relies on.
+    """
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS journaux (
+            id INTEGER PRIMARY KEY,
+            sourceid TEXT,
+            title TEXT,
+            type TEXT,
+            issn TEXT,
+            sjr REAL,
+            h_index INTEGER,
+            last_year_docs INTEGER,
+            three_years_docs INTEGER,
+            refs INTEGER,
+            cites INTEGER,
+            citables INTEGER,
+            cites_on_docs REAL,
+            ref_on_docs REAL,
+            country TEXT,
+            region TEXT,
+            publisher TEXT,
+            impact_factor REAL,
+            fingerprint TEXT
+        )
+    """)
+    if "fingerprint" not in table_columns(connection, "journaux"):
+        connection.execute("ALTER TABLE journaux ADD COLUMN fingerprint TEXT")
+
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS categories (
+            label TEXT PRIMARY KEY
+        )
+    """)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS journaux_categories (
+            id_journal INTEGER,
+            label_category TEXT,
+            quartile TEXT,
+            FOREIGN KEY(id_journal) REFERENCES journaux(id),
+            FOREIGN KEY(label_category) REFERENCES categories(label)
+        )
+    """)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS areas (
+            label TEXT PRIMARY KEY
+        )
+    """)
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS journaux_areas (
+            id_journal INTEGER,
+            label_area TEXT,
+            FOREIGN KEY(id_journal) REFERENCES journaux(id),
+            FOREIGN KEY(label_area) REFERENCES areas(label)
+        )
+    """)
+
+    # Older imports stored the numbers as text, normalized before the next migrations index and summarize them
+    normalize_numbers(connection)
+
+    # Older imports could register the same ISSN twice, keep the oldest journal
+    connection.execute("DELETE FROM journaux WHERE id NOT IN (SELECT MIN(id) FROM journaux GROUP BY issn)")
+    connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS journaux_issn ON journaux(issn)")
+
+
+def migration_2_indexes(connection):
+    """
+    Secondary indexes for the lookups done by the views, and unique (journal, label) pairs in the link tables so that
+    "INSERT OR REPLACE" no longer duplicates rows.
+    """
+    for table, label in (("journaux_categories", "label_category"), ("journaux_areas", "label_area")):
+        connection.execute(f"DELETE FROM {table} WHERE id_journal NOT IN (SELECT id FROM journaux)")
+        connection.execute(f"""
+            DELETE FROM {table}
+            WHERE rowid NOT IN (SELECT MIN(rowid) FROM {table} GROUP BY id_journal, {label})
+        """)
+        # Replaced by the unique index, whose leading column is id_journal
+        connection.execute(f"DROP INDEX IF EXISTS {table}_journal")
+        connection.execute(f"CREATE UNIQUE INDEX {table}_journal_label ON {table}(id_journal, {label})")
+        connection.execute(f"CREATE INDEX {table}_label ON {table}({label}, id_journal)")
+
+    for column in ("country", "region", "type", "sjr", "impact_factor"):
+        connection.execute(f"CREATE INDEX journaux_{column} ON journaux({column})")
+
+    connection.execute("ANALYZE")
+
+
+def migration_3_drop_english_tables(connection):
+    """
+    Early versions of initialize_database() created "journals", "journals_categories" and "journals_areas" while the
+    application always used the "journaux" tables. Move their rows over when "journaux" is still empty, then drop them.
+    """
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    journaux_empty = connection.execute("SELECT NOT EXISTS (SELECT 1 FROM journaux)").fetchone()[0]
+
+    if journaux_empty and "journals" in tables:
+        columns = ", ".join(column for column in table_columns(connection, "journals")
+                            if column in table_columns(connection, "journaux"))
+        connection.execute(f"INSERT OR IGNORE INTO journaux ({columns}) SELECT {columns} FROM journals")
+        if "journals_categories" in tables:
+            connection.execute("""
+                INSERT OR IGNORE INTO journaux_categories (id_journal, label_category, quartile)
+                SELECT id_journal, label_category, quartile FROM journals_categories
+            """)
+        if "journals_areas" in tables:
+            connection.execute("""
+                INSERT OR IGNORE INTO journaux_areas (id_journal, label_area)
+                SELECT id_journal, label_area FROM journals_areas
+            """)
+
+    for table in ("journals_categories", "journals_areas", "journals"):
+        connection.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def migration_4_journal_summary(connection):
+    """
+    The denormalized "journal_summary" table read by the lists, see core.summary.
+    """
+    summary.create_table(connection)
+    summary.refresh_summary(connection)
+
+
+def migration_5_fulltext(connection):
+    """
+    The "journal_fts" full-text index of the keyword search, see core.fulltext. Skipped when SQLite lacks FTS5.
+    """
+    fulltext.create_index(connection)
+
+
+def migration_6_quartile_rank(connection):
+    """
+    The quartile of a category as an integer, "quartile_rank" (2 for "Q2", NULL without quartile), indexed with the
+    category so that the search compares it directly instead of parsing the label of every row. Also indexes the
+    search result orders.
+    """
+    if "quartile_rank" not in table_columns(connection, "journaux_categories"):
+        connection.execute("ALTER TABLE journaux_categories ADD COLUMN quartile_rank INTEGER")
+    connection.execute("""
+        UPDATE journaux_categories SET quartile_rank = CAST(SUBSTR(quartile, 2) AS INTEGER)
+        WHERE quartile GLOB 'Q[1-4]'
+    """)
+
+    # Replaced by journaux_categories_label_rank, which also starts with the label
+    connection.execute("DROP INDEX IF EXISTS journaux_categories_label")
+    connection.execute("""
+        CREATE INDEX journaux_categories_label_rank ON journaux_categories(label_category, quartile_rank, id_journal)
+    """)
+    connection.execute("CREATE INDEX journaux_categories_rank ON journaux_categories(quartile_rank, id_journal)")
+
+    # The search result orders other than SJR, already indexed
+    connection.execute("CREATE INDEX journaux_h_index ON journaux(h_index)")
+    connection.execute("CREATE INDEX journaux_title ON journaux(title COLLATE NOCASE)")
+    connection.execute("ANALYZE")
+
+
+def migration_7_metadata(connection):
+    """
+    The "metadata" key-value table, with the "data_version" counter bumped by every import.
+    """
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value
+        )
+    """)
+    connection.execute("INSERT OR IGNORE INTO metadata (key, value) VALUES ('data_version', 0)")
+
+
+def migration_8_journal_metrics(connection):
+    """
+    The "journal_metrics" table, where the enrichment sources store what they found about each journal, with when it
+    was fetched. A metric whose value is NULL was looked up but not found.
+    """
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS journal_metrics (
+            id_journal INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            value,
+            fetched_at REAL NOT NULL,
+            PRIMARY KEY (id_journal, source, metric),
+            FOREIGN KEY(id_journal) REFERENCES journaux(id)
+        )
+    """)
+    connection.execute("CREATE INDEX journal_metrics_source ON journal_metrics(source, fetched_at)")
+
+
+def migration_9_numeric_columns(connection):
+    """
+    Normalize the numbers still stored as text, see normalize_numbers, in the databases migrated before migration 1
+    did it.
+    """
+    normalize_numbers(connection)
+    bump_data_version(connection)
+
+
+MIGRATIONS = [
+    migration_1_baseline,
+    migration_2_indexes,
+    migration_3_drop_english_tables,
+    migration_4_journal_summary,
+    migration_5_fulltext,
+    migration_6_quartile_rank,
+    migration_7_metadata,
+    migration_8_journal_metrics,
+    migration_9_numeric_columns,
+]
+
+# The schema version of a database up to date.
+LATEST_VERSION = len(MIGRATIONS)
+
+
+def get_version(connection):
+    """
+    Read the schema version of the database, 0 for a database never migrated.
+    """
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def get_data_version(connection):
+    """
+    Read the data version of the database, bumped by every import.
+    """
+    row = connection.execute("SELECT value FROM metadata WHERE key = 'data_version'").fetchone()
+    return row[0] if row is not None else 0
+
+
+def bump_data_version(connection):
+    """
+    Increment the data version of the database, in the caller's transaction.
+    """
+    connection.execute("UPDATE metadata SET value = value + 1 WHERE key = 'data_version'")
+
+
+def migrate(connection, target=LATEST_VERSION):
+    """
+    Apply the migrations missing from the database, each one in its own transaction.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        target (int, optional): The version to stop at. Defaults to LATEST_VERSION.
+
+    Returns:
+        int: The schema version of the database.
+
+    Example:
+        >>> migrate(sqlite3.connect(settings.database))
+    """
+    version = get_version(connection)
+    while version < target:
+        migration = MIGRATIONS[version]
+        connection.execute("BEGIN")
+        try:
+            migration(connection)
+            version += 1
+            connection.execute(f"PRAGMA user_version = {version}")
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+    return version
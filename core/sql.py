@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       sql.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Helpers shared by the modules writing SQL statements.
+#
+
+from contextlib import contextmanager
+from itertools import islice
+
+# SQLite cannot bind an unlimited number of parameters in a single statement.
+MAX_VARIABLES = 500
+
+
+def chunks(values, size=MAX_VARIABLES):
+    """
+    Split values into lists small enough to be bound in a single statement, e.g. as an "IN (...)" list.
+
+    Args:
+        values (iterable): The values.
+        size (int, optional): The largest number of values of a list. Defaults to MAX_VARIABLES.
+
+    Yields:
+        list: The next values.
+    """
+    iterator = iter(values)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def placeholders(values):
+    """
+    Get the placeholders binding a list of values, e.g. "?, ?, ?".
+    """
+    return ", ".join("?" * len(values))
+
+
+@contextmanager
+def savepoint(connection, name):
+    """
+    Run statements in a savepoint, rolled back when they raise. Inside a transaction of the caller they become part of
+    it; outside of one they are committed on their own. The caller's transaction is never committed.
+
+    Example usage:
+    with savepoint(connection, "export_ids"):
+        connection.execute("DELETE FROM temp.export_ids")
+    """
+    connection.execute(f"SAVEPOINT {name}")
+    try:
+        yield
+    except BaseException:
+        connection.execute(f"ROLLBACK TO {name}")
+        connection.execute(f"RELEASE {name}")
+        raise
+    connection.execute(f"RELEASE {name}")
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       summary.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# "journal_summary" holds one denormalized row per journal: its title and its categories and areas already
+# aggregated, so that lists never join the link tables. It is refreshed by the importer.
+#
+
+from core.sql import chunks, placeholders
+
+# Labels are joined with "; ", which never appears in a SCImago label (the export uses ";" as separator).
+SEPARATOR = "; "
+
+SUMMARY_SELECT = """
+    SELECT journaux.id, journaux.title,
+        (SELECT GROUP_CONCAT(label_category, '; ') FROM (
+            SELECT label_category FROM journaux_categories
+            WHERE journaux_categories.id_journal = journaux.id ORDER BY rowid)),
+        (SELECT GROUP_CONCAT(label_category || '(' || quartile || ')', '; ') FROM (
+            SELECT label_category, quartile FROM journaux_categories
+            WHERE journaux_categories.id_journal = journaux.id ORDER BY rowid)),
+        (SELECT GROUP_CONCAT(label_area, '; ') FROM (
+            SELECT label_area FROM journaux_areas
+            WHERE journaux_areas.id_journal = journaux.id ORDER BY rowid))
+    FROM journaux
+"""
+
+
+def create_table(connection):
+    """
+    Create the "journal_summary" table.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+    """
+    connection.execute("""
+        CREATE TABLE IF NOT EXISTS journal_summary (
+            id_journal INTEGER PRIMARY KEY,
+            title TEXT,
+            categories TEXT,
+            categories_quartiles TEXT,
+            areas TEXT
+        )
+    """)
+
+
+def refresh_summary(connection, journal_ids=None):
+    """
+    Recompute the summary rows, in the caller's transaction.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        journal_ids (iterable, optional): The journals to refresh, deleted journals losing their row. Defaults to
+            None, which rebuilds the whole table.
+    """
+    if journal_ids is None:
+        connection.execute("DELETE FROM journal_summary")
+        connection.execute(f"INSERT INTO journal_summary {SUMMARY_SELECT}")
+        return
+
+    for chunk in chunks(journal_ids):
+        connection.execute(f"DELETE FROM journal_summary WHERE id_journal IN ({placeholders(chunk)})", chunk)
+        connection.execute(f"INSERT INTO journal_summary {SUMMARY_SELECT} WHERE journaux.id IN ({placeholders(chunk)})",
+                           chunk)
+
+
+def split_labels(labels):
+    """
+    Split an aggregated list of labels, None giving an empty list.
+    """
+    return labels.split(SEPARATOR) if labels else []
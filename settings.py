@@ -20,5 +20,32 @@ temporary_folder = "./tmp"
 # The path of the downloaded CSV file.
 csv_file_path = os.path.join(temporary_folder, "journalrank.csv")
 
+# Keep a copy of the downloaded CSV data in csv_file_path, for auditing.
+keep_download = True
+
+# Only write the journals that changed since the last update, instead of rewriting the whole list.
+incremental_import = True
+
+# Send conditional requests and skip the import when the export did not change since the last update.
+use_fetch_cache = True
+
+# Seconds to wait for the SCImago server before giving up.
+download_timeout = 60
+
 # The SQLite database name.
 database = "scimagojr.db"
+
+# Search while the form is being filled in, instead of only on the Search button.
+live_search = True
+
+# Milliseconds without input before a live search starts.
+live_search_delay = 250
+
+# Number of search results fetched at once, as the result table scrolls.
+search_chunk_size = 200
+
+# Log every search query along with the plan SQLite chose for it (EXPLAIN QUERY PLAN).
+debug_queries = False
+
+# Filter searches on an in-memory copy of the journals (core.columnar_index), when NumPy is installed.
+columnar_index = True
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_columnar.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_columnar [--csv journalrank.csv | --rows 30000] [--repeat 5]
+#
+
+import argparse
+import itertools
+import os
+import statistics
+import tempfile
+import time
+
+import settings
+from core import columnar_index, ingestion, repository
+from core.repository import Repository
+from tools import synthetic_data
+from tools.bench_filters import FILTERS
+
+
+def median_ms(function, repeat):
+    """
+    Run `function` `repeat` times and return the median duration, in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def search(searcher, criteria):
+    """
+    What the search view does for a search: the first page of results, then their count.
+    """
+    rows, _ = searcher.search_page(criteria, "SJR", None, settings.search_chunk_size)
+    return rows, searcher.count_journals(criteria)
+
+
+def run(csv_path, repeat):
+    """
+    Import `csv_path` into a fresh database and time every combination of FILTERS through SQLite and through the
+    in-memory index, checking that both find the same journals, and time the category and area counts of the index.
+
+    Args:
+        csv_path (str): The SCImago export.
+        repeat (int): The number of runs of each search.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        settings.database = os.path.join(folder, "bench.db")
+        stats = ingestion.import_csv(csv_path, settings.database)
+        searcher = Repository()
+
+        columnar_index.invalidate()
+        start = time.perf_counter()
+        index = columnar_index.get_index(searcher.connection)
+        print(f"{stats.rows} journals, index loaded in {(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"{index.nbytes() / 1024:.0f} KiB")
+
+        print(f"{'filters':<48}{'results':>8}{'SQL (ms)':>10}{'index (ms)':>12}{'speedup':>9}{'facets (ms)':>13}")
+        for size in range(1, len(FILTERS) + 1):
+            for names in itertools.combinations(FILTERS, size):
+                criteria = {}
+                for name in names:
+                    criteria.update(FILTERS[name])
+
+                settings.columnar_index = False
+                sql_rows, sql_count = search(searcher, criteria)
+                sql_ms = median_ms(lambda: search(searcher, criteria), repeat)
+
+                settings.columnar_index = True
+                index_rows, index_count = search(searcher, criteria)
+                index_ms = median_ms(lambda: search(searcher, criteria), repeat)
+                facets_ms = median_ms(lambda: searcher.facet_counts(criteria), repeat)
+
+                if sql_count != index_count or sql_rows != index_rows:
+                    raise AssertionError(f"{names}: {sql_count} journals in SQL, {index_count} in the index")
+                print(f"{' + '.join(names):<48}{index_count:>8}{sql_ms:>10.1f}{index_ms:>12.2f}"
+                      f"{sql_ms / max(index_ms, 1e-3):>8.0f}x{facets_ms:>13.2f}")
+
+        repository.close_connections()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the in-memory search index against SQLite.")
+    parser.add_argument("--csv", help="a real SCImago export, instead of synthetic data")
+    parser.add_argument("--rows", type=int, default=30000, help="number of synthetic journals")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each search")
+    args = parser.parse_args()
+
+    if not columnar_index.available():
+        parser.error("NumPy is not installed")
+
+    if args.csv:
+        run(args.csv, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "journalrank.csv")
+        synthetic_data.write_csv(csv_path, args.rows)
+        run(csv_path, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_filters.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_filters [--rows 30000] [--repeat 5] [--plans]
+#
+
+import argparse
+import itertools
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from core import fulltext, ingestion, query_builder
+from core.query_builder import JOURNAL_FIELDS
+from tools import synthetic_data
+
+# One value per filter of the search form, every combination of them being timed.
+FILTERS = {
+    "keyword": {"keyword": "annals rev"},
+    "quartile": {"quartile": "Q1"},
+    "sjr": {"sjr": "5"},
+    "country": {"country": "Japan"},
+    "type": {"type_": "journal"},
+    "categories": {"categories": synthetic_data.CATEGORIES[:2]},
+    "areas": {"areas": synthetic_data.AREAS[:2]},
+}
+
+
+def legacy_query(keyword="", quartile="-", sjr="", impact_factor="", type_="-", country="-", region="-",
+                 categories=(), areas=()):
+    """
+    The search query before the query builder: both link tables joined, CAST comparisons, and GROUP BY/HAVING for the
+    categories.
+    """
+    query = f"""SELECT {', '.join('journaux.' + field for field in JOURNAL_FIELDS)}
+            FROM journaux
+            LEFT JOIN journaux_categories ON journaux.id = journaux_categories.id_journal
+            LEFT JOIN journaux_areas ON journaux.id = journaux_areas.id_journal
+            """
+    params = []
+    where_clauses = []
+    if keyword:
+        query += """JOIN (SELECT rowid AS id_journal FROM journal_fts WHERE journal_fts MATCH ?) AS matches
+                ON matches.id_journal = journaux.id
+                """
+        params.append(fulltext.match_expression(keyword))
+    if sjr:
+        where_clauses.append("CAST(journaux.sjr AS REAL) >= ?")
+        params.append(sjr)
+    for column, value in (("type", type_), ("country", country), ("region", region)):
+        if value != "-":
+            where_clauses.append(f"journaux.{column} = ?")
+            params.append(value)
+    if categories:
+        where_clauses.append("journaux_categories.label_category IN ({})".format(', '.join('?' * len(categories))))
+        params.extend(categories)
+    if quartile != '-':
+        where_clauses.append("CAST(SUBSTR(journaux_categories.quartile, 2) AS INTEGER) <= ?")
+        params.append(int(quartile[1]))
+    if areas:
+        where_clauses.append("journaux_areas.label_area IN ({})".format(', '.join('?' * len(areas))))
+        params.extend(areas)
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    query += " GROUP BY journaux.id"
+    if categories:
+        query += " HAVING COUNT(DISTINCT journaux_categories.label_category) = ?"
+        params.append(len(categories))
+    return query, params
+
+
+def median_ms(function, repeat):
+    """
+    Run `function` `repeat` times and return the median duration, in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(connection, repeat, plans=False):
+    """
+    Time every combination of FILTERS with the legacy query and with the query builder, checking that both find the
+    same journals.
+
+    Args:
+        connection (sqlite3.Connection): The connection to the database searched.
+        repeat (int): The number of runs of each query.
+        plans (bool, optional): Whether to print the plan of the built queries. Defaults to False.
+    """
+    print(f"{'filters':<48}{'results':>8}{'legacy (ms)':>13}{'built (ms)':>12}{'speedup':>9}")
+    for size in range(1, len(FILTERS) + 1):
+        for names in itertools.combinations(FILTERS, size):
+            criteria = {}
+            for name in names:
+                criteria.update(FILTERS[name])
+
+            legacy = legacy_query(**criteria)
+            built = query_builder.build_search(**criteria, full_text=True)
+            legacy_ids = {row[0] for row in connection.execute(*legacy)}
+            built_ids = {row[0] for row in connection.execute(*built)}
+            if legacy_ids != built_ids:
+                raise AssertionError(f"{names}: {len(legacy_ids)} journals before, {len(built_ids)} now")
+
+            legacy_ms = median_ms(lambda: connection.execute(*legacy).fetchall(), repeat)
+            built_ms = median_ms(lambda: connection.execute(*built).fetchall(), repeat)
+            print(f"{' + '.join(names):<48}{len(built_ids):>8}{legacy_ms:>13.1f}{built_ms:>12.1f}"
+                  f"{legacy_ms / max(built_ms, 1e-3):>8.1f}x")
+            if plans:
+                print("\n".join(query_builder.explain(connection, *built)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search query for every combination of filters.")
+    parser.add_argument("--rows", type=int, default=30000, help="number of synthetic journals")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each query")
+    parser.add_argument("--plans", action="store_true", help="print the plan of the built queries")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "journalrank.csv")
+        database = os.path.join(folder, "bench.db")
+        synthetic_data.write_csv(csv_path, args.rows)
+        ingestion.import_csv(csv_path, database)
+
+        connection = sqlite3.connect(database)
+        run(connection, args.repeat, args.plans)
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
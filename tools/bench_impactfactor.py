@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_impactfactor.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_impactfactor [--rows 500] [--delay 0.05] [--workers 1,4,8,16]
+#
+# Compares the command backend, with a fake lookup command, for several pool sizes, to the dataset backend, with a fake
+# dataset finding the same journals. Then checks that runs only look up the journals missing or stale.
+#
+
+import argparse
+import os
+import sqlite3
+import stat
+import tempfile
+
+from core import enrichment, ingestion, repository
+from tools import impactfactor, synthetic_data
+
+# A stand-in for the "impact_factor" command, as a shell script so that its start-up costs little next to the pool: it
+# answers after a delay, and finds the journals whose title ends with an odd digit.
+FAKE_COMMAND = """#!/bin/sh
+sleep {delay}
+case "$2" in
+    *[13579]) echo "[{{'journal': '$2', 'factor': 1.5}}]" ;;
+    *) echo "[]" ;;
+esac
+"""
+
+
+def write_fake_command(folder, delay):
+    """
+    Write the fake lookup command in `folder` and return its path.
+    """
+    path = os.path.join(folder, "impact_factor")
+    with open(path, 'w') as file:
+        file.write(FAKE_COMMAND.format(delay=delay))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+def write_fake_dataset(path, journals):
+    """
+    Write a dataset with the schema of tmp/impact_factor.sqlite3 holding the journals the fake command finds: half of
+    them under their title in capitals, the other half under another title but with their ISSN.
+
+    Args:
+        path (str): The SQLite dataset.
+        journals (list): The (id, title, ISSN) of the journals.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute("""
+        CREATE TABLE factor (nlm_id VARCHAR, factor FLOAT, jcr VARCHAR, journal VARCHAR NOT NULL,
+            journal_abbr VARCHAR, issn VARCHAR, eissn VARCHAR, PRIMARY KEY (journal))
+    """)
+    rows = []
+    for position, (_, title, issn) in enumerate(journal for journal in journals if journal[1][-1] in "13579"):
+        print_issn = issn.split(",")[0].strip()
+        if position % 2:
+            rows.append((title.upper(), 1.5, "", ""))
+        else:
+            rows.append((f"Former {title}", 1.5, f"{print_issn[:4]}-{print_issn[4:]}", ""))
+    connection.executemany("INSERT INTO factor (journal, factor, issn, eissn) VALUES (?, ?, ?, ?)", rows)
+    connection.commit()
+    connection.close()
+
+
+def run(rows, delay, pool_sizes):
+    """
+    Enrich a synthetic database with the fake command for every pool size, then with the dataset backend, and check
+    that a run only looks up the journals missing or stale.
+
+    Args:
+        rows (int): The number of synthetic journals.
+        delay (float): The seconds the fake command takes per lookup.
+        pool_sizes (list): The numbers of lookups running at once.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "journalrank.csv")
+        synthetic_data.write_csv(csv_path, rows)
+        command = f"{write_fake_command(folder, delay)} search"
+
+        print(f"{'backend':>12}{'journals':>10}{'found':>8}{'seconds':>9}{'journals/s':>12}")
+        for workers in pool_sizes:
+            database = os.path.join(folder, f"bench_{workers}.db")
+            ingestion.import_csv(csv_path, database)
+            source = impactfactor.ImpactFactorSource("command", command=command)
+            stats = enrichment.run_source(database, source, workers)
+            print(f"{f'{workers} workers':>12}{stats.fetched:>10}{stats.found:>8}{stats.elapsed:>9.2f}"
+                  f"{stats.fetched / stats.elapsed:>12.1f}")
+
+        database = os.path.join(folder, "bench_dataset.db")
+        ingestion.import_csv(csv_path, database)
+        dataset_path = os.path.join(folder, "impact_factor.sqlite3")
+        journals = repository.Repository(repository.get_connection(database)).journal_identifiers()
+        write_fake_dataset(dataset_path, journals)
+        source = impactfactor.ImpactFactorSource("dataset", dataset_path)
+        stats = enrichment.run_source(database, source)
+        print(f"{'dataset':>12}{stats.fetched:>10}{stats.found:>8}{stats.elapsed:>9.2f}"
+              f"{stats.fetched / stats.elapsed:>12.1f}")
+
+        # Top-ups: an interrupted run, completed by the next one, then a run with nothing stale, then a forced one
+        database = os.path.join(folder, "topup.db")
+        ingestion.import_csv(csv_path, database)
+        source = impactfactor.ImpactFactorSource("command", command=command)
+        for name, options in (("interrupted", {"limit": rows // 2}), ("completed", {}), ("up to date", {}),
+                              ("forced", {"ttl": 0})):
+            stats = enrichment.run_source(database, source, max(pool_sizes), **options)
+            print(f"{name}: {stats.fetched} journals fetched, {stats.skipped} up to date, {stats.elapsed:.2f}s")
+        repository.close_connections()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the impact factor enrichment with a fake lookup command.")
+    parser.add_argument("--rows", type=int, default=500, help="number of synthetic journals")
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds per lookup of the fake command")
+    parser.add_argument("--workers", default="1,4,8,16", help="comma-separated pool sizes")
+    args = parser.parse_args()
+
+    run(args.rows, args.delay, [int(size) for size in args.workers.split(",")])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_import.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_import [--rows 30000] [--batch-size 2000]
+#
+
+import argparse
+import os
+import tempfile
+import time
+
+from core import ingestion
+from tools import synthetic_data
+
+
+def timed_import(label, csv_path, database, batch_size, incremental):
+    """
+    Import `csv_path` and print the throughput.
+    """
+    start = time.perf_counter()
+    stats = ingestion.import_csv(csv_path, database, batch_size, incremental=incremental)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>20}: {stats.rows} rows in {elapsed:.2f}s -> {stats.rows / elapsed:,.0f} rows/sec "
+          f"({stats.inserted} inserted, {stats.updated} updated, {stats.unchanged} unchanged, {stats.deleted} deleted, "
+          f"{stats.missing_kept} missing kept)")
+
+
+def run(rows, batch_size):
+    """
+    Import a synthetic export into a fresh database, refresh it fully then incrementally, and print the throughput.
+
+    Args:
+        rows (int): The number of journals in the synthetic export.
+        batch_size (int): Rows written per executemany() round.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "journalrank.csv")
+        database = os.path.join(folder, "bench.db")
+
+        synthetic_data.write_csv(csv_path, rows)
+
+        timed_import("first load", csv_path, database, batch_size, False)
+        timed_import("full refresh", csv_path, database, batch_size, False)
+        timed_import("incremental refresh", csv_path, database, batch_size, True)
+
+        # A later export where a tenth of the journals changed and a few were dropped
+        synthetic_data.write_csv(csv_path, rows - rows // 100, changed=rows // 10)
+        timed_import("incremental, 10%", csv_path, database, batch_size, True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SCImago CSV import.")
+    parser.add_argument("--rows", type=int, default=30000, help="number of synthetic journals")
+    parser.add_argument("--batch-size", type=int, default=ingestion.BATCH_SIZE, help="rows per executemany() round")
+    args = parser.parse_args()
+
+    run(args.rows, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
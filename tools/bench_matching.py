@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_matching.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_matching [--journals 30000] [--pairwise 50]
+#
+# Matches synthetic journals against a source holding them under altered titles (typos, accents, punctuation, words
+# reordered or dropped) or ISSNs, and journals it does not hold, then reports the time taken and how many were matched
+# right or wrong, by kind of alteration. The time of a pairwise comparison is estimated on a sample.
+#
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from core import matching
+from tools import synthetic_data
+
+ACCENTS = {"e": "é", "a": "à", "o": "ô", "u": "ü", "i": "ï"}
+
+
+def typo(title, generator):
+    """
+    Swap two letters of a word of the title, or drop one.
+    """
+    words = title.split()
+    position = generator.randrange(len(words) - 1)
+    word = words[position]
+    letter = generator.randrange(len(word) - 1)
+    if generator.random() < 0.5:
+        words[position] = word[:letter] + word[letter + 1] + word[letter] + word[letter + 2:]
+    else:
+        words[position] = word[:letter] + word[letter + 1:]
+    return " ".join(words)
+
+
+def alter(title, kind, generator):
+    """
+    Alter a title the way another source could write it.
+    """
+    words = title.split()
+    if kind == "punctuation":
+        return ". ".join(words[:2]).upper() + ", " + " ".join(words[2:])
+    if kind == "article":
+        return "The " + title.replace(" and ", " & ")
+    if kind == "accents":
+        return "".join(ACCENTS.get(letter, letter) if generator.random() < 0.3 else letter for letter in title)
+    if kind == "typo":
+        return typo(title, generator)
+    if kind == "reordered":
+        words[0], words[1] = words[1], words[0]
+        return " ".join(words)
+    if kind == "dropped word":
+        del words[generator.randrange(len(words) - 1)]
+        return " ".join(words)
+    return title
+
+
+KINDS = ["same", "punctuation", "article", "accents", "typo", "reordered", "dropped word", "issn", "absent"]
+
+
+def build(count, seed=0):
+    """
+    Build the journals of the database and the entries of the source.
+
+    Returns:
+        tuple: The (title, ISSN field, kind, expected position in the source) of the journals, and the (title, ISSN
+            field) of the entries of the source.
+    """
+    generator = random.Random(seed)
+    rows = list(synthetic_data.generate_rows(count * 2, seed))
+    source = [(row['Title'], "") for row in rows[:count]]
+    journals = []
+    for position, row in enumerate(rows[:count]):
+        kind = KINDS[position % len(KINDS)]
+        if kind == "absent":
+            journals.append((rows[count + position]['Title'], "", kind, None))
+        elif kind == "issn":
+            source[position] = (f"Former {row['Title']}", row['Issn'])
+            journals.append((row['Title'] + " Online", row['Issn'], kind, position))
+        else:
+            journals.append((alter(row['Title'], kind, generator), "", kind, position))
+    return journals, source
+
+
+def run(count, pairwise):
+    """
+    Match `count` journals against a source of `count` entries.
+
+    Args:
+        count (int): The number of journals, and of entries of the source.
+        pairwise (int): The number of journals compared with every entry to estimate the pairwise time.
+    """
+    journals, source = build(count)
+
+    start = time.perf_counter()
+    matcher = matching.TitleMatcher(source)
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matches = [matcher.match(title, issn) for title, issn, _, _ in journals]
+    matched = time.perf_counter() - start
+
+    right, wrong, missed = Counter(), Counter(), Counter()
+    for (_, _, kind, expected), match in zip(journals, matches):
+        if match is None:
+            missed[kind] += expected is not None
+        elif match.index == expected:
+            right[kind] += 1
+        else:
+            wrong[kind] += 1
+
+    print(f"{'kind':>14}{'right':>8}{'wrong':>8}{'missed':>8}")
+    for kind in KINDS:
+        print(f"{kind:>14}{right[kind]:>8}{wrong[kind]:>8}{missed[kind]:>8}")
+    print(f"{'total':>14}{sum(right.values()):>8}{sum(wrong.values()):>8}{sum(missed.values()):>8}")
+    print(f"indexed {count} entries in {indexed:.2f}s, matched {count} journals in {matched:.2f}s")
+
+    titles = [matching.normalize_title(title) for title, _ in source]
+    grams = [matching.ngrams(title) for title in titles]
+    start = time.perf_counter()
+    for title, _, _, _ in journals[:pairwise]:
+        normalized = matching.normalize_title(title)
+        normalized_grams = matching.ngrams(normalized)
+        max(matching.confidence(normalized, other, normalized_grams, other_grams)
+            for other, other_grams in zip(titles, grams))
+    elapsed = time.perf_counter() - start
+    print(f"pairwise: {elapsed / pairwise * 1000:.0f} ms per journal, about {elapsed / pairwise * count:.0f}s "
+          f"for {count} journals")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the matching of journal titles.")
+    parser.add_argument("--journals", type=int, default=30000, help="number of journals, and of entries of the source")
+    parser.add_argument("--pairwise", type=int, default=50, help="journals compared pairwise, for the estimate")
+    args = parser.parse_args()
+
+    run(args.journals, args.pairwise)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_queries.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_queries [--rows 30000] [--repeat 20]
+#
+
+import argparse
+import csv
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from core import ingestion, schema
+from tools import synthetic_data
+
+# The lookups done by the views, as they query the database.
+QUERIES = {
+    "issn lookup": ("SELECT id FROM journaux WHERE issn = ?", ("00012345, 50012345",)),
+    "journal categories": (
+        "SELECT label_category, quartile FROM journaux_categories WHERE id_journal = ?", (12345,)
+    ),
+    "journal areas": ("SELECT label_area FROM journaux_areas WHERE id_journal = ?", (12345,)),
+    "country filter": ("SELECT * FROM journaux WHERE country = ?", ("Japan",)),
+    "type + region filter": ("SELECT * FROM journaux WHERE type = ? AND region = ?", ("book series", "Latin America")),
+    "sjr filter": ("SELECT * FROM journaux WHERE sjr >= ?", (6.0,)),
+    "impact factor filter": ("SELECT * FROM journaux WHERE impact_factor >= ?", (1.0,)),
+    "category filter": ("""
+        SELECT journaux.* FROM journaux
+        JOIN journaux_categories ON journaux.id = journaux_categories.id_journal
+        WHERE journaux_categories.label_category = ?
+    """, (synthetic_data.CATEGORIES[0],)),
+    "area filter": ("""
+        SELECT journaux.* FROM journaux
+        JOIN journaux_areas ON journaux.id = journaux_areas.id_journal
+        WHERE journaux_areas.label_area = ?
+    """, (synthetic_data.AREAS[0],)),
+}
+
+
+def time_queries(connection, repeat):
+    """
+    Run every query `repeat` times.
+
+    Returns:
+        dict: The median latency of each query, in milliseconds.
+    """
+    timings = {}
+    for name, (query, params) in QUERIES.items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            connection.execute(query, params).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = statistics.median(samples)
+    return timings
+
+
+def run(rows, repeat):
+    """
+    Time the view queries on a synthetic catalogue, before and after the index migration.
+
+    Args:
+        rows (int): The number of journals in the synthetic catalogue.
+        repeat (int): The number of runs of each query.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "journalrank.csv")
+        synthetic_data.write_csv(csv_path, rows)
+
+        connection = sqlite3.connect(os.path.join(folder, "bench.db"))
+        schema.migrate(connection, target=1)
+        with open(csv_path, 'r', encoding='utf-8', newline='') as file, connection:
+            ingestion.import_rows(connection, csv.DictReader(file, delimiter=';'))
+        connection.execute("UPDATE journaux SET impact_factor = sjr / 2 WHERE id % 3 = 0")
+        connection.commit()
+
+        before = time_queries(connection, repeat)
+        schema.migrate(connection)
+        after = time_queries(connection, repeat)
+        connection.close()
+
+    print(f"{'query':<22}{'before (ms)':>12}{'after (ms)':>12}{'speedup':>10}")
+    for name in QUERIES:
+        print(f"{name:<22}{before[name]:>12.3f}{after[name]:>12.3f}{before[name] / after[name]:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the view queries before and after the index migration.")
+    parser.add_argument("--rows", type=int, default=30000, help="number of synthetic journals")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of each query")
+    args = parser.parse_args()
+
+    run(args.rows, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_resurchify.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_resurchify [--journals 200] [--delay 0.05] [--concurrency 1,4,8,16]
+#
+# Runs the Resurchify scraper against a local stub server serving canned search pages after a delay, and compares it
+# to one request per journal without session, as the scraper first did. Then runs it as an enrichment source, twice.
+#
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+from core import enrichment, ingestion, repository
+from tools import resurchify, synthetic_data
+
+CARD = """<div class="{result_class}">
+    <h4><a href="/detail/{number}">{title}</a></h4>
+    <p>Publisher: Stub Publishing</p>
+    <p>{score}</p>
+</div>
+"""
+
+# Impact score of the journal searched, the other results having 0.5.
+JOURNAL_SCORE = 7.5
+
+FILLER = '<li><a href="/page/{number}" class="w3-bar-item w3-button">Link {number}</a></li>\n'
+
+
+def search_page(title):
+    """
+    Build a search page of results like those of Resurchify, with a navigation around them. The journals whose title
+    ends with an odd digit are found, third after journals with a longer title, the others are not found.
+    """
+    if title[-1:] in "13579":
+        results = [(f"{title} {word}", 0.5) for word in ("Letters", "Reviews", "Reports", "Methods", "Open", "Online")]
+        results[2:2] = [(title, JOURNAL_SCORE)]
+        cards = [CARD.format(result_class=resurchify.RESULT_CLASS, number=number, title=result_title,
+                             score=f"Impact Score: {score}") for number, (result_title, score) in enumerate(results)]
+    else:
+        cards = []
+    navigation = "".join(FILLER.format(number=number) for number in range(300))
+    return (f"<html><head><title>Search</title></head><body><ul>{navigation}</ul>"
+            f"<div id='search_results'>{''.join(cards)}</div><ul>{navigation}</ul></body></html>")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    The StubHandler class answers the searches of the stub server after its delay. The first search of a journal
+    whose title ends with "0" fails with "503 Service Unavailable", to exercise the retries.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        title = parse_qs(urlsplit(self.path).query).get("query", [""])[0]
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.requests += 1
+            unavailable = title.endswith("0") and title not in self.server.failed
+            self.server.failed.add(title)
+
+        if unavailable:
+            body, status = b"Service Unavailable", 503
+        else:
+            body, status = search_page(title).encode('utf-8'), 200
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(delay):
+    """
+    Start the stub server on a free local port, in a background thread.
+
+    Returns:
+        ThreadingHTTPServer: The server, its search page being http://127.0.0.1:<port>/find/.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.lock = threading.Lock()
+    server.connections = server.requests = 0
+    server.failed = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def reset(server):
+    """
+    Reset the counters of the stub server.
+    """
+    server.connections = server.requests = 0
+    server.failed = set()
+
+
+def parse_whole_page(html, journal_title=None):
+    """
+    Get the impact score of the first result of a page parsing all of it, as the scraper first did.
+    """
+    result = BeautifulSoup(html, 'html.parser').find(class_=resurchify.RESULT_CLASS)
+    if result is None:
+        return None
+    return float(result.find(string=lambda text: text and "Impact Score" in text).split(":")[1])
+
+
+def sequential(url, journals):
+    """
+    Search the journals one after the other, a new connection per request, the whole page parsed and the first result
+    kept, as the scraper first did.
+    """
+    found = failed = 0
+    for _, title in journals:
+        response = requests.get(url, params={"query": title})
+        if response.status_code != 200:
+            failed += 1
+            continue
+        found += parse_whole_page(response.text) == JOURNAL_SCORE
+    return found, failed
+
+
+def run(count, delay, pool_sizes):
+    """
+    Search synthetic journals on the stub server: sequentially, with the scraper for every pool size, rate limited,
+    and with a cold then warm cache. Then time the page parsers.
+
+    Args:
+        count (int): The number of journals.
+        delay (float): The seconds the stub server takes per search.
+        pool_sizes (list): The numbers of searches running at once.
+    """
+    server = start_server(delay)
+    url = f"http://127.0.0.1:{server.server_address[1]}/find/"
+    journals = [(number, f"Journal of Synthetic Studies {number}") for number in range(count)]
+
+    def scrape(**options):
+        reset(server)
+        scraper = resurchify.Scraper(url, backoff=0.01, **options)
+        start = time.perf_counter()
+        results = scraper.run(journals)
+        elapsed = time.perf_counter() - start
+        scraper.close()
+        found = sum(result.impact_score == JOURNAL_SCORE for result in results)
+        failed = sum(result.error is not None for result in results)
+        return found, failed, elapsed
+
+    print(f"{'run':>22}{'found':>7}{'failed':>8}{'requests':>10}{'connections':>13}{'seconds':>9}{'journals/s':>12}")
+
+    def report(name, found, failed, elapsed):
+        print(f"{name:>22}{found:>7}{failed:>8}{server.requests:>10}{server.connections:>13}{elapsed:>9.2f}"
+              f"{count / elapsed:>12.1f}")
+
+    reset(server)
+    start = time.perf_counter()
+    found = sequential(url, journals)
+    report("sequential", *found, time.perf_counter() - start)
+
+    for concurrency in pool_sizes:
+        report(f"{concurrency} at once", *scrape(concurrency=concurrency, rate=0))
+
+    rate = 50
+    report(f"{max(pool_sizes)} at once, {rate}/s", *scrape(concurrency=max(pool_sizes), rate=rate))
+
+    with tempfile.TemporaryDirectory() as folder:
+        cache = resurchify.ResponseCache(folder)
+        report("cold cache", *scrape(concurrency=max(pool_sizes), rate=0, cache=cache))
+        report("warm cache", *scrape(concurrency=max(pool_sizes), rate=0, cache=cache))
+
+    # Through the enrichment framework: the second run has nothing stale to fetch
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "journalrank.csv")
+        database = os.path.join(folder, "bench.db")
+        synthetic_data.write_csv(csv_path, count)
+        ingestion.import_csv(csv_path, database)
+        source = resurchify.ResurchifySource(url, rate=0, cache=None, backoff=0.01)
+        for name in ("enrichment", "enrichment again"):
+            reset(server)
+            stats = enrichment.run_source(database, source, max(pool_sizes))
+            report(name, stats.found, stats.failed, stats.elapsed)
+        repository.close_connections()
+
+    server.shutdown()
+
+    html = search_page("Journal 1")
+    parsers = [("html.parser, whole page", parse_whole_page)]
+    parsers += [(features, resurchify.make_parser(features)) for features in resurchify.available_parsers()]
+    for name, parse in parsers:
+        start = time.perf_counter()
+        for _ in range(100):
+            parse(html, "Journal 1")
+        print(f"parser {name}: {(time.perf_counter() - start) * 10:.2f} ms per page")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Resurchify scraper against a local stub server.")
+    parser.add_argument("--journals", type=int, default=200, help="number of journals searched")
+    parser.add_argument("--delay", type=float, default=0.05, help="seconds per search of the stub server")
+    parser.add_argument("--concurrency", default="1,4,8,16", help="comma-separated numbers of searches at once")
+    args = parser.parse_args()
+
+    run(args.journals, args.delay, [int(size) for size in args.concurrency.split(",")])
+
+
+if __name__ == '__main__':
+    main()
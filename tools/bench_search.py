@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_search.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_search [--rows 30000] [--repeat 5]
+# Runs without a display with QT_QPA_PLATFORM=offscreen.
+#
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+import settings
+from core import ingestion
+from core.repository import Repository
+from tools import synthetic_data
+
+# Searches as typed in the form.
+SEARCHES = {
+    "country + type": {"country": "Japan", "type_": "book series"},
+    "keyword + region": {"keyword": "annals review stud", "region": "Western Europe"},
+    "category": {"categories": [synthetic_data.CATEGORIES[0]]},
+    "area + quartile": {"areas": [synthetic_data.AREAS[1]], "quartile": "Q1", "type_": "journal"},
+}
+
+
+def median_ms(function, repeat):
+    """
+    Run `function` `repeat` times and return the median duration, in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def fill_form(view, keyword="", quartile="-", type_="-", country="-", region="-", categories=(), areas=()):
+    """
+    Fill the search form of `view` like a user would.
+    """
+    view.clear_form()
+    view.keywordEdit.setText(keyword)
+    view.quartileCombo.setCurrentText(quartile)
+    view.typeCombo.setCurrentText(type_)
+    view.countryCombo.setCurrentText(country)
+    view.regionCombo.setCurrentText(region)
+    view.categoriesModel.set_checked(categories)
+    view.areasModel.set_checked(areas)
+
+
+def search_and_wait(view):
+    """
+    Search from the form of `view` and wait for the results to be in the table.
+    """
+    view.search_journals()
+    view.search_worker.wait()
+    QApplication.processEvents()
+
+
+def run(repeat):
+    """
+    Time every search of SEARCHES on the current database: the query alone, the query followed by the two
+    per-result queries the view used to run, and the whole search including the rendering of the result table.
+
+    Args:
+        repeat (int): The number of runs of each search.
+    """
+    from ui.search_view import SearchView
+
+    repository = Repository()
+
+    def legacy(criteria):
+        for journal in repository.search_journals(**criteria):
+            repository.journal_categories(journal.id)
+            repository.journal_areas(journal.id)
+
+    view = SearchView()
+    view.liveSearchCheck.setChecked(False)
+    print(f"{'search':<18}{'results':>8}{'query (ms)':>12}{'+N+1 (ms)':>12}{'render (ms)':>13}")
+    for name, criteria in SEARCHES.items():
+        count = len(repository.search_journals(**criteria))
+        query = median_ms(lambda: repository.search_journals(**criteria), repeat)
+        with_n_plus_one = median_ms(lambda: legacy(criteria), repeat)
+
+        fill_form(view, **criteria)
+        rendered = median_ms(lambda: search_and_wait(view), repeat)
+        print(f"{name:<18}{count:>8}{query:>12.1f}{with_n_plus_one:>12.1f}{rendered:>13.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search view, rendering included.")
+    parser.add_argument("--rows", type=int, default=30000, help="number of synthetic journals")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each search")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "journalrank.csv")
+        settings.database = os.path.join(folder, "bench.db")
+        synthetic_data.write_csv(csv_path, args.rows)
+        ingestion.import_csv(csv_path, settings.database)
+        run(args.repeat)
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
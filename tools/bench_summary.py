@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_summary.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_summary [--csv journalrank.csv | --rows 30000] [--repeat 5]
+#
+
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from core import ingestion, summary
+from tools import synthetic_data
+
+# The main list query before journal_summary: both link tables joined at once.
+JOINED_QUERY = """
+    SELECT journaux.id, journaux.title, GROUP_CONCAT(categories.label), GROUP_CONCAT(areas.label)
+    FROM journaux
+    LEFT JOIN journaux_categories ON journaux.id = journaux_categories.id_journal
+    LEFT JOIN categories ON categories.label = journaux_categories.label_category
+    LEFT JOIN journaux_areas ON journaux.id = journaux_areas.id_journal
+    LEFT JOIN areas ON areas.label = journaux_areas.label_area
+    GROUP BY journaux.id
+"""
+
+QUERIES = {
+    "joined GROUP_CONCAT": JOINED_QUERY,
+    "correlated subqueries": summary.SUMMARY_SELECT,
+    "journal_summary": "SELECT id_journal, title, categories, areas FROM journal_summary",
+    "journal_summary page": """
+        SELECT id_journal, title, categories, areas FROM journal_summary
+        WHERE id_journal > 0 ORDER BY id_journal LIMIT 500
+    """,
+}
+
+
+def median_ms(function, repeat):
+    """
+    Run `function` `repeat` times and return the median duration, in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(csv_path, repeat):
+    """
+    Import `csv_path` into a fresh database and time the ways of reading the main list.
+
+    Args:
+        csv_path (str): The SCImago export.
+        repeat (int): The number of runs of each query.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        database = os.path.join(folder, "bench.db")
+        stats = ingestion.import_csv(csv_path, database)
+        connection = sqlite3.connect(database)
+        print(f"{stats.rows} journals")
+
+        for name, query in QUERIES.items():
+            print(f"{name:<24}{median_ms(lambda: connection.execute(query).fetchall(), repeat):>10.1f} ms")
+
+        def refresh():
+            with connection:
+                summary.refresh_summary(connection)
+        print(f"{'full summary refresh':<24}{median_ms(refresh, repeat):>10.1f} ms")
+
+        # The join repeats every category once per area, and every area once per category
+        duplicated = sum(
+            1 for _, _, categories, areas in connection.execute(JOINED_QUERY)
+            if categories and len(categories.split(',')) != len(set(categories.split(',')))
+        )
+        print(f"journals with duplicated labels in the joined query: {duplicated}")
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the main list queries.")
+    parser.add_argument("--csv", help="a real SCImago export, instead of synthetic data")
+    parser.add_argument("--rows", type=int, default=30000, help="number of synthetic journals")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each query")
+    args = parser.parse_args()
+
+    if args.csv:
+        run(args.csv, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "journalrank.csv")
+        synthetic_data.write_csv(csv_path, args.rows)
+        run(csv_path, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
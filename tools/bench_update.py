@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       bench_update.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.bench_update [--rows 30000]
+#
+# Runs the list update of the application (UpdateWorker.download_and_import) against a local stub server serving a
+# synthetic export with an ETag, and checks every path of the fetch cache: the first import, a "304 Not Modified", an
+# unchanged export downloaded again from a server ignoring the validators and not imported on its hash, then a changed
+# export imported.
+#
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import settings
+from core import schema
+from core.fetch_cache import ExportUnchanged
+from tools import synthetic_data
+from ui.workers import UpdateWorker
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    The StubHandler class serves the export of the stub server, answering "304 Not Modified" to a request with its
+    ETag unless the server ignores the validators.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.conditional and self.headers.get("If-None-Match") == server.etag:
+            server.statuses.append(304)
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            return
+
+        server.statuses.append(200)
+        server.bytes_sent += len(server.body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(len(server.body)))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    """
+    Start the stub server on a free local port, in a background thread.
+
+    Returns:
+        ThreadingHTTPServer: The server, its export being http://127.0.0.1:<port>/journalrank.csv.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.conditional = True
+    server.requests = server.bytes_sent = 0
+    server.statuses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def publish(server, csv_path, version):
+    """
+    Serve a new export, with its own ETag.
+    """
+    with open(csv_path, "rb") as f:
+        server.body = f.read()
+    server.etag = f'"export-{version}"'
+
+
+def database_state(database):
+    """
+    Get the data version and the number of journals of the database.
+    """
+    connection = sqlite3.connect(database)
+    try:
+        return schema.get_data_version(connection), connection.execute("SELECT COUNT(*) FROM journaux").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def update(server, name, database):
+    """
+    Run an update as the application does and report it.
+
+    Returns:
+        tuple: The ImportStats, None when the export was unchanged, and the data version and number of journals after
+            the update.
+    """
+    server.requests = server.bytes_sent = 0
+    server.statuses = []
+    start = time.perf_counter()
+    try:
+        stats = UpdateWorker().download_and_import()
+    except ExportUnchanged:
+        stats = None
+    elapsed = time.perf_counter() - start
+    version, journals = database_state(database)
+
+    outcome = "unchanged" if stats is None else f"{stats.inserted} inserted, {stats.updated} updated"
+    print(f"{name:>28}{'/'.join(map(str, server.statuses)):>10}{server.bytes_sent:>12}{elapsed:>9.2f}"
+          f"{version:>9}{journals:>10}  {outcome}")
+    return stats, version, journals
+
+
+def check(condition, message):
+    """
+    Print a failed check.
+
+    Returns:
+        bool: The condition.
+    """
+    if not condition:
+        print(f"FAILED: {message}")
+    return condition
+
+
+def run(rows):
+    """
+    Update a fresh database four times from the stub server, and check what every update did.
+
+    Args:
+        rows (int): The number of journals of the synthetic export.
+
+    Returns:
+        bool: Whether every check passed.
+    """
+    server = start_server()
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, "export.csv")
+        database = os.path.join(folder, "bench.db")
+        settings.data_url = f"http://127.0.0.1:{server.server_address[1]}/journalrank.csv"
+        settings.csv_file_path = os.path.join(folder, "tmp", "journalrank.csv")
+        settings.database = database
+        settings.use_fetch_cache = True
+        settings.keep_download = True
+
+        print(f"{'update':>28}{'status':>10}{'bytes':>12}{'seconds':>9}{'version':>9}{'journals':>10}")
+        synthetic_data.write_csv(csv_path, rows)
+        publish(server, csv_path, 1)
+        stats, first_version, journals = update(server, "first import", database)
+        passed = check(stats is not None and stats.inserted == rows and journals == rows, "first import")
+
+        stats, version, _ = update(server, "304 Not Modified", database)
+        passed &= check(stats is None and server.statuses == [304] and server.bytes_sent == 0,
+                        "conditional request answered 304")
+        passed &= check(version == first_version, "database untouched by a 304")
+
+        server.conditional = False
+        stats, version, _ = update(server, "same content, no validators", database)
+        passed &= check(stats is None and server.statuses == [200] and server.bytes_sent > 0,
+                        "unchanged export downloaded again")
+        passed &= check(version == first_version, "not imported on the same hash")
+
+        synthetic_data.write_csv(csv_path, rows + rows // 10, changed=rows // 10)
+        publish(server, csv_path, 2)
+        server.conditional = True
+        stats, version, journals = update(server, "changed content", database)
+        passed &= check(stats is not None and stats.inserted == rows // 10 and stats.updated == rows // 10,
+                        "changed export imported")
+        passed &= check(version > first_version and journals == rows + rows // 10, "changed export committed")
+
+        stats, version, _ = update(server, "304 after the change", database)
+        passed &= check(stats is None and server.statuses == [304], "new ETag sent once imported")
+
+    server.shutdown()
+    print("every check passed" if passed else "some checks failed")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the conditional update of the list against a local stub "
+                                                 "server.")
+    parser.add_argument("--rows", type=int, default=30000, help="number of synthetic journals")
+    args = parser.parse_args()
+
+    if not run(args.rows):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       enrich.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+# Usage: python -m tools.enrich <source> [--workers 8] [--ttl DAYS] [--limit N] [--force] [source options]
+#        python -m tools.enrich <source> --help
+#
+# Runs an enrichment source (see core.enrichment) on the journals it has not fetched within its TTL, e.g.
+# "python -m tools.enrich impactfactor --backend dataset" or "python -m tools.enrich resurchify --workers 4 --rate 2".
+#
+
+import argparse
+
+import settings
+from core import enrichment, repository
+from tools.impactfactor import ImpactFactorSource
+from tools.resurchify import ResurchifySource
+
+SOURCES = [ImpactFactorSource, ResurchifySource]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enrich the journals with the metrics of a source.")
+    commands = parser.add_subparsers(dest="source", required=True, metavar="source")
+    for source_class in SOURCES:
+        command = commands.add_parser(source_class.name, help=source_class.description)
+        command.add_argument("--database", default=settings.database, help="the SQLite database")
+        command.add_argument("--workers", type=int, default=enrichment.WORKERS, help="lookups running at once")
+        command.add_argument("--ttl", type=float,
+                             help=f"days before a fetch is stale (default: {source_class.ttl / enrichment.DAY:g})")
+        command.add_argument("--force", action="store_true", help="fetch every journal again, stale or not")
+        command.add_argument("--limit", type=int, help="journals looked up at most, the oldest fetched first")
+        command.add_argument("--commit-every", type=int, default=enrichment.COMMIT_EVERY,
+                             help="results committed at once")
+        source_class.add_arguments(command)
+        command.set_defaults(source_class=source_class)
+    args = parser.parse_args(argv)
+
+    source = args.source_class.from_arguments(args)
+    ttl = 0 if args.force else (args.ttl * enrichment.DAY if args.ttl is not None else None)
+
+    def progress(writer):
+        print(f"{writer.fetched} journals fetched, {writer.found} found, {writer.failed} failed")
+
+    stats = enrichment.run_source(args.database, source, args.workers, ttl, args.limit, args.commit_every, progress)
+    repository.close_connections()
+    print(f"Done in {stats.elapsed:.1f}s: {stats.fetched} journals fetched ({stats.skipped} up to date), "
+          f"{stats.found} found, {stats.failed} failed")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,61 +8,200 @@
 # Copyright (c) 2023,
 # All rights reserved.
 #
+# Usage: python -m tools.enrich impactfactor [--backend dataset|command] [--workers 8]
+#                                           [--command "impact_factor search"]
+#
+# The "impactfactor" enrichment source: the impact factor of the journals, stored as the "impact_factor" metric and as
+# the impact factor shown by the application.
+#
+# Two backends answer the lookups:
+# - "dataset" loads the impact factor dataset (the "factor" table of tmp/impact_factor.sqlite3) once, indexes it by
+#   ISSN, normalized title and trigram (see core.matching), and resolves every journal in a single pass, in process.
+# - "command" runs the "impact_factor" command line tool for every journal, in a pool of threads each waiting on its
+#   own subprocess. It is the fallback when the dataset is missing.
+#
 
-import subprocess
-import json
+import ast
+import os
+import shlex
 import sqlite3
-from sqlite3 import Error
+import subprocess
 
 import settings
+from core import matching
+from core.enrichment import DAY, WORKERS, EnrichmentSource
 
-# Connect to your database
-conn = sqlite3.connect(settings.database)
-cursor = conn.cursor()
-cursor.execute("SELECT id, title FROM journaux")
-journal_names = cursor.fetchall()
-conn.close()
+# The lookup command, the journal title being appended to it.
+DEFAULT_COMMAND = "impact_factor search"
 
+# Seconds before a lookup is abandoned.
+LOOKUP_TIMEOUT = 60
 
-def get_impact_factor(journal_name):
-    command = ['impact_factor', 'search', journal_name]
-    result = subprocess.run(command, capture_output=True, text=True)
+# The dataset behind the "impact_factor" command.
+DATASET_PATH = os.path.join(settings.temporary_folder, "impact_factor.sqlite3")
 
-    # Replace single quotes with double quotes
-    text = result.stdout.replace("'", '"')
-    result_json = json.loads(text)
 
-    if result_json:
-        if 'journal' in result_json[0] and result_json[0]['journal'].lower() == journal_name.lower():
-            return result_json[0]['factor']
-    return None
+def parse_result(text, journal_name, min_confidence=matching.MIN_CONFIDENCE):
+    """
+    Read the impact factor of a journal from the output of the lookup command.
 
+    Args:
+        text (str): The output, a list of matches printed as Python literals.
+        journal_name (str): The title searched.
+        min_confidence (float, optional): The confidence below which a match is not the journal, see
+            matching.best_title. Defaults to matching.MIN_CONFIDENCE.
 
-def update_impact_factor(journal, impact_factor):
+    Returns:
+        float: The impact factor of the match whose title is the most similar, None when none is similar enough.
+    """
+    # The output is a Python literal, which quotes titles with an apostrophe in double quotes
     try:
-        # Connect to your sqlite database
-        conn = sqlite3.connect(settings.database)
-        cursor = conn.cursor()
-
-        journal_id = journal[0]
-        journal_name = journal[1]
-
-        # Update the impact factor in the database
-        cursor.execute("""UPDATE journaux SET impact_factor = ? WHERE id = ?""", (impact_factor, journal_id))
-        conn.commit()
-
-        print(f"Updated impact factor for {journal_name} to {impact_factor}")
-
-    except Error as e:
-        print(e)
-
-    finally:
-        if conn:
-            conn.close()
-
-
-for journal in journal_names:
-    print(journal[1])
-    impact_factor = get_impact_factor(journal[1])
-    if impact_factor is not None:
-        update_impact_factor(journal, impact_factor)
+        result_json = ast.literal_eval(text.strip() or "[]")
+    except (ValueError, SyntaxError):
+        return None
+
+    results = [result for result in result_json if isinstance(result, dict) and 'journal' in result]
+    best = matching.best_title(journal_name, [result['journal'] for result in results], min_confidence)
+    return results[best.index].get('factor') if best is not None else None
+
+
+def run_command(journal_name, command=DEFAULT_COMMAND, timeout=LOOKUP_TIMEOUT):
+    """
+    Search a journal with the lookup command.
+
+    Args:
+        journal_name (str): The title of the journal.
+        command (str, optional): The lookup command. Defaults to DEFAULT_COMMAND.
+        timeout (float, optional): Seconds before the lookup is abandoned. Defaults to LOOKUP_TIMEOUT.
+
+    Returns:
+        str: The output of the command, see parse_result.
+
+    Raises:
+        subprocess.SubprocessError: The command failed or timed out.
+    """
+    result = subprocess.run(shlex.split(command) + [journal_name], capture_output=True, text=True, timeout=timeout,
+                            check=True)
+    return result.stdout
+
+
+class DatasetBackend:
+    """
+    The DatasetBackend class resolves journals against the impact factor dataset, loaded once and indexed in memory
+    by a matching.TitleMatcher: a journal is matched on any of its ISSNs first, then on its normalized title, then on
+    the most similar title of the dataset.
+
+    Example usage:
+    backend = DatasetBackend("tmp/impact_factor.sqlite3")
+    print(backend.impact_factor("Nature", "00280836"))
+    """
+
+    def __init__(self, path=DATASET_PATH, min_confidence=matching.MIN_CONFIDENCE):
+        """
+        Load the dataset.
+
+        Args:
+            path (str, optional): The SQLite dataset, with a "factor" table. Defaults to DATASET_PATH.
+            min_confidence (float, optional): The confidence below which a similar title is not a match. Defaults to
+                matching.MIN_CONFIDENCE.
+        """
+        self.min_confidence = min_confidence
+
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = connection.execute("SELECT journal, factor, issn, eissn FROM factor WHERE factor IS NOT NULL")
+            rows = rows.fetchall()
+        finally:
+            connection.close()
+
+        self.factors = [factor for _, factor, _, _ in rows]
+        self.matcher = matching.TitleMatcher((journal, f"{issn or ''},{eissn or ''}")
+                                             for journal, _, issn, eissn in rows)
+
+    def impact_factor(self, title, issn):
+        """
+        Find the impact factor of a journal.
+
+        Args:
+            title (str): The title of the journal.
+            issn (str): The ISSN field of the journal, see matching.normalize_issns.
+
+        Returns:
+            float: The impact factor, None when the journal is not in the dataset.
+        """
+        match = self.matcher.match(title, issn, self.min_confidence)
+        return self.factors[match.index] if match is not None else None
+
+
+class ImpactFactorSource(EnrichmentSource):
+    """
+    The ImpactFactorSource class looks up the impact factor of the journals, in the dataset or with the lookup
+    command, see DatasetBackend and run_command.
+
+    Example usage:
+    source = ImpactFactorSource("command", command="impact_factor search")
+    enrichment.run_source(settings.database, source, workers=8)
+    """
+
+    name = "impactfactor"
+    description = "the impact factor, from the impact factor dataset or command"
+    metrics = ("impact_factor",)
+    impact_factor_metric = "impact_factor"
+
+    # The impact factors are published once a year.
+    ttl = 90 * DAY
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("--backend", choices=("dataset", "command"),
+                            help="look up in the dataset, or with the command (default: dataset, when the file exists)")
+        parser.add_argument("--dataset", default=DATASET_PATH, help="the impact factor dataset")
+        parser.add_argument("--command", default=DEFAULT_COMMAND, help="the lookup command, before the journal title")
+        parser.add_argument("--min-confidence", type=float, default=matching.MIN_CONFIDENCE,
+                            help="confidence below which a similar title is not a match")
+
+    @classmethod
+    def from_arguments(cls, args):
+        return cls(args.backend, args.dataset, args.command, min_confidence=args.min_confidence)
+
+    def __init__(self, backend=None, dataset=DATASET_PATH, command=DEFAULT_COMMAND, timeout=LOOKUP_TIMEOUT,
+                 min_confidence=matching.MIN_CONFIDENCE):
+        """
+        Initialize the ImpactFactorSource.
+
+        Args:
+            backend (str, optional): "dataset" or "command". Defaults to "dataset" when the dataset exists.
+            dataset (str, optional): The SQLite dataset, for the dataset backend. Defaults to DATASET_PATH.
+            command (str, optional): The lookup command, for the command backend. Defaults to DEFAULT_COMMAND.
+            timeout (float, optional): Seconds before a lookup of the command is abandoned. Defaults to
+                LOOKUP_TIMEOUT.
+            min_confidence (float, optional): The confidence below which a similar title is not a match. Defaults to
+                matching.MIN_CONFIDENCE.
+        """
+        self.backend = backend or ("dataset" if os.path.exists(dataset) else "command")
+        self.dataset_path = dataset
+        self.command = command
+        self.timeout = timeout
+        self.min_confidence = min_confidence
+        self.dataset = None
+
+    def open(self):
+        if self.backend == "dataset":
+            self.dataset = DatasetBackend(self.dataset_path, self.min_confidence)
+
+    def close(self):
+        self.dataset = None
+
+    def fetch(self, journal):
+        if self.backend == "dataset":
+            return self.dataset.impact_factor(journal.title, journal.issn)
+        return run_command(journal.title, self.command, self.timeout)
+
+    def parse(self, journal, raw):
+        if self.backend == "dataset":
+            return {"impact_factor": raw}
+        return {"impact_factor": parse_result(raw, journal.title, self.min_confidence)}
+
+    def resolve(self, journals, workers=WORKERS):
+        # The dataset is in memory: a single pass, without threads
+        return super().resolve(journals, 1 if self.backend == "dataset" else workers)
@@ -8,65 +8,554 @@
 # Copyright (c) 2023,
 # All rights reserved.
 #
+# Usage: python -m tools.enrich resurchify [--workers 4] [--rate 2] [--retries 3] [--parser lxml|html.parser]
+#                                         [--url https://www.resurchify.com/find/] [--no-cache]
+#
+# Looks up the impact score of every journal on Resurchify. The searches run on an asyncio loop sharing one pooled
+# HTTP session (keep-alive), with a limit on the searches running at once and on the requests sent per second to each
+# host. Failed requests are retried with an exponential backoff, and the pages found are kept in an on-disk cache, so
+# that a journal is only searched once. The score kept is that of the result whose title matches the journal, see
+# core.matching, not that of the first result.
+#
+# The impact score is not the impact factor: it is stored as the "impact_score" metric of the "resurchify" source, not
+# as the impact factor of the journals.
+#
+
+import asyncio
+import hashlib
+import logging
+import os
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
-import sqlite3
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
 
 import settings
+from core import matching
+from core.enrichment import DAY, EnrichmentSource, SourceResult
+
+logger = logging.getLogger(__name__)
+
+SEARCH_URL = "https://www.resurchify.com/find/"
+
+# Number of searches running at once, and requests sent per second to a host (0 for no limit).
+CONCURRENCY = 4
+RATE = 2.0
+
+# Attempts after the first one, and seconds before the first retry, doubled at every attempt.
+RETRIES = 3
+BACKOFF = 1.0
+
+# Seconds before a request is abandoned.
+TIMEOUT = 30
+
+# Answers worth retrying: the server is overloaded or asks to slow down.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+CACHE_FOLDER = os.path.join(settings.temporary_folder, "resurchify_cache")
+
+# Class of the result cards of the search page.
+RESULT_CLASS = 'w3-white w3-container w3-card-4 w3-hover-light-gray'
+
+# Number of results compared with the journal searched.
+RESULTS = 5
+
+# Tree builders of BeautifulSoup, fastest first.
+PARSERS = ["lxml", "html.parser"]
+
+ScoreResult = namedtuple("ScoreResult", ["journal_id", "title", "impact_score", "error"])
+
+
+def available_parsers():
+    """
+    List the tree builders installed, fastest first.
+    """
+    return [parser for parser in PARSERS if parser != "lxml" or lxml is not None]
+
+
+def result_cards(html, limit=RESULTS):
+    """
+    Cut the first result cards out of a search page, each from its opening tag to the opening tag of the next one, so
+    that only the cards are parsed and not the whole page.
+
+    Args:
+        html (str): The search page.
+        limit (int, optional): The number of cards. Defaults to RESULTS.
 
+    Returns:
+        list: The HTML of the cards, empty when the page has no result.
+    """
+    starts = []
+    position = html.find(RESULT_CLASS)
+    while position != -1 and len(starts) <= limit:
+        starts.append(html.rfind('<', 0, position))
+        position = html.find(RESULT_CLASS, position + len(RESULT_CLASS))
+    ends = starts[1:] if len(starts) > limit else starts[1:] + [len(html)]
+    return [html[start:end] for start, end in zip(starts, ends)]
 
-def get_impact_score(journal_title):
-    # Formater l'URL
-    url = f"https://www.resurchify.com/find/?query={journal_title}#search_results"
 
-    # Récupérer le HTML de la page
-    response = requests.get(url)
-    response.raise_for_status()  # S'assurer que la requête a réussi
+def parse_results(html, features="html.parser", limit=RESULTS):
+    """
+    Extract the journal title and impact score of the first results of a search page, see result_cards.
+
+    Args:
+        html (str): The search page.
+        features (str, optional): The tree builder of BeautifulSoup, see PARSERS. Defaults to "html.parser".
+        limit (int, optional): The number of results. Defaults to RESULTS.
+
+    Returns:
+        list: The (title, impact score) of the results, the impact score being None when the result has none.
+    """
+    cards = result_cards(html, limit)
+    if not cards:
+        return []
 
     # Analyser le HTML avec BeautifulSoup
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup("".join(cards), features, parse_only=SoupStrainer(class_=RESULT_CLASS))
+
+    results = []
+    for result in soup.find_all(class_=RESULT_CLASS, limit=limit):
+        # Le titre du journal est le premier lien du résultat
+        link = result.find('a')
+        title = link.get_text(" ", strip=True) if link is not None else ""
+
+        try:
+            # Extraire le score d'impact
+            impact_score_tag = result.find(string=lambda text: text and "Impact Score" in text)
+            impact_score_str = impact_score_tag.split(":")[1].strip()
+            impact_score = float(impact_score_str)
+        except (AttributeError, IndexError, ValueError):
+            impact_score = None
+        results.append((title, impact_score))
+
+    return results
+
+
+def parse_impact_score(html, journal_title, features="html.parser", min_confidence=matching.MIN_CONFIDENCE):
+    """
+    Extract the impact score of a journal from a search page: the score of the result whose title matches the journal
+    best, see matching.best_title, rather than of the first result.
+
+    Args:
+        html (str): The search page.
+        journal_title (str): The title of the journal searched.
+        features (str, optional): The tree builder of BeautifulSoup, see PARSERS. Defaults to "html.parser".
+        min_confidence (float, optional): The confidence below which a result is not the journal. Defaults to
+            matching.MIN_CONFIDENCE.
+
+    Returns:
+        float: The impact score, None when no result is the journal or the result has no impact score.
+    """
+    results = parse_results(html, features)
+    best = matching.best_title(journal_title, [title for title, _ in results], min_confidence)
+    return results[best.index][1] if best is not None else None
+
+
+def make_parser(features=None, min_confidence=matching.MIN_CONFIDENCE):
+    """
+    Get the page parser of a tree builder.
+
+    Args:
+        features (str, optional): The tree builder, see PARSERS. Defaults to the fastest one installed.
+        min_confidence (float, optional): The confidence below which a result is not the journal. Defaults to
+            matching.MIN_CONFIDENCE.
+
+    Returns:
+        callable: Called with a search page and the journal title, returns the impact score of the journal.
+    """
+    return partial(parse_impact_score, features=features or available_parsers()[0], min_confidence=min_confidence)
+
+
+class ResponseCache:
+    """
+    The ResponseCache class keeps the pages downloaded on disk, one file per query named after the SHA-256 of its URL.
+
+    Example usage:
+    cache = ResponseCache(CACHE_FOLDER)
+    html = cache.get(url)
+    if html is None:
+        cache.put(url, requests.get(url).text)
+    """
+
+    def __init__(self, folder=CACHE_FOLDER):
+        """
+        Initialize the ResponseCache, creating its folder.
+
+        Args:
+            folder (str, optional): The folder of the pages. Defaults to CACHE_FOLDER.
+        """
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def path(self, url):
+        """
+        Get the file of a query.
+        """
+        return os.path.join(self.folder, hashlib.sha256(url.encode('utf-8')).hexdigest() + ".html")
+
+    def get(self, url):
+        """
+        Read the page of a query.
 
+        Args:
+            url (str): The URL of the query.
+
+        Returns:
+            str: The page, None when it is not in the cache.
+        """
+        try:
+            with open(self.path(url), encoding='utf-8') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, url, html):
+        """
+        Store the page of a query, written to a temporary file first so that a page is never read half written.
+
+        Args:
+            url (str): The URL of the query.
+            html (str): The page.
+        """
+        path = self.path(url)
+        with open(path + ".part", 'w', encoding='utf-8') as file:
+            file.write(html)
+        os.replace(path + ".part", path)
+
+
+class RateLimiter:
+    """
+    The RateLimiter class spaces out the requests sent to each host, giving every request the next free time slot of
+    its host.
+
+    Example usage:
+    limiter = RateLimiter(2.0)
+    await limiter.wait("www.resurchify.com")
+    """
+
+    def __init__(self, rate=RATE):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            rate (float, optional): The requests per second to a host, 0 for no limit. Defaults to RATE.
+        """
+        self.interval = 1 / rate if rate else 0
+        self.next_slots = {}
+
+    async def wait(self, host):
+        """
+        Wait for the next time slot of a host.
+
+        Args:
+            host (str): The host of the request.
+        """
+        if not self.interval:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self.next_slots.get(host, now))
+        self.next_slots[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def retry_after(response):
+    """
+    Get the seconds to wait given by the "Retry-After" header of an answer, None when it has none or gives a date.
+    """
     try:
-        # Trouver le premier résultat
-        result = soup.find(class_='w3-white w3-container w3-card-4 w3-hover-light-gray')
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class Scraper:
+    """
+    The Scraper class searches journals on Resurchify. The requests go through one requests.Session, whose connections
+    are kept alive and pooled, and are run in threads from an asyncio loop.
+
+    Example usage:
+    scraper = Scraper(concurrency=8, cache=ResponseCache())
+    for result in scraper.run([(12, "Nature"), (27, "The Lancet")]):
+        print(result.title, result.impact_score)
+    scraper.close()
+    """
+
+    def __init__(self, url=SEARCH_URL, concurrency=CONCURRENCY, rate=RATE, retries=RETRIES, backoff=BACKOFF,
+                 timeout=TIMEOUT, cache=None, parse=None):
+        """
+        Initialize the Scraper.
+
+        Args:
+            url (str, optional): The search page, the journal title being passed as its "query" parameter. Defaults to
+                SEARCH_URL.
+            concurrency (int, optional): The searches running at once. Defaults to CONCURRENCY.
+            rate (float, optional): The requests per second to a host, 0 for no limit. Defaults to RATE.
+            retries (int, optional): The attempts after the first one. Defaults to RETRIES.
+            backoff (float, optional): The seconds before the first retry, doubled at every attempt. Defaults to
+                BACKOFF.
+            timeout (float, optional): The seconds before a request is abandoned. Defaults to TIMEOUT.
+            cache (ResponseCache, optional): The cache of the pages. Defaults to None, for no cache.
+            parse (callable, optional): Called with a page and the journal title, returns its impact score. Defaults
+                to make_parser().
+        """
+        self.url = url
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.parse = parse or make_parser()
+
+        # Number of requests sent, cached pages excluded
+        self.requests = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def search_url(self, title):
+        """
+        Get the URL of the search of a journal.
+        """
+        return requests.Request('GET', self.url, params={"query": title}).prepare().url
+
+    async def fetch(self, title, semaphore):
+        """
+        Get the search page of a journal, from the cache or from the server.
+
+        Args:
+            title (str): The journal title.
+            semaphore (asyncio.Semaphore): Limits the searches running at once.
+
+        Returns:
+            str: The page.
+
+        Raises:
+            requests.RequestException: When the server cannot be reached or answers with an error, after the retries.
+        """
+        url = self.search_url(title)
+        if self.cache is not None:
+            html = self.cache.get(url)
+            if html is not None:
+                return html
+
+        host = urlsplit(url).netloc
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                await self.limiter.wait(host)
+                self.requests += 1
+                try:
+                    response = await asyncio.to_thread(self.session.get, url, timeout=self.timeout)
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt == self.retries:
+                        raise
+                    delay = self.backoff * 2 ** attempt
+                else:
+                    if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                        response.raise_for_status()
+                        break
+                    delay = retry_after(response)
+                    if delay is None:
+                        delay = self.backoff * 2 ** attempt
+                await asyncio.sleep(delay)
+
+        html = response.text
+        if self.cache is not None:
+            self.cache.put(url, html)
+        return html
+
+    async def impact_score(self, journal_id, title, semaphore):
+        """
+        Search the impact score of a journal, reporting errors in the result instead of raising them. A page that
+        cannot be parsed is logged and counts as not found, the other journals going on.
+
+        Returns:
+            ScoreResult: The impact score, None when not found, or the error.
+        """
+        try:
+            html = await self.fetch(title, semaphore)
+        except requests.RequestException as error:
+            return ScoreResult(journal_id, title, None, str(error))
+        try:
+            impact_score = self.parse(html, title)
+        except Exception:
+            logger.exception("Cannot parse the Resurchify page of %s", title)
+            impact_score = None
+        return ScoreResult(journal_id, title, impact_score, None)
+
+    async def scrape(self, journals, progress=None):
+        """
+        Search the impact score of journals, with a fixed pool of CONCURRENCY searches taking the journals from a
+        queue.
+
+        Args:
+            journals (list): The (id, title) of the journals.
+            progress (callable, optional): Called with every ScoreResult, as it comes. The searches stop when it
+                returns False, those running being finished.
+
+        Returns:
+            list: The ScoreResult of the journals, in the order they came.
+        """
+        # The requests wait in threads: one thread per search running at once
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(self.concurrency))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = asyncio.Queue()
+        for journal in journals:
+            pending.put_nowait(journal)
+        results = []
+        stopped = False
+
+        async def search():
+            nonlocal stopped
+            while not stopped:
+                try:
+                    journal_id, title = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = await self.impact_score(journal_id, title, semaphore)
+                results.append(result)
+                if progress is not None and progress(result) is False:
+                    stopped = True
+
+        await asyncio.gather(*(search() for _ in range(min(self.concurrency, pending.qsize()))))
+        return results
+
+    def run(self, journals, progress=None):
+        """
+        Search the impact score of journals on a new asyncio loop, see scrape().
+        """
+        return asyncio.run(self.scrape(journals, progress))
+
+    def close(self):
+        """
+        Close the connections of the session.
+        """
+        self.session.close()
+
+
+class ResurchifySource(EnrichmentSource):
+    """
+    The ResurchifySource class looks up the impact score of the journals on Resurchify, with a Scraper running as
+    many searches at once as workers asked. The scraper runs its asyncio loop in a thread of its own, the results
+    being handed over as they come.
+
+    Example usage:
+    source = ResurchifySource(rate=2.0)
+    enrichment.run_source(settings.database, source, workers=4)
+    """
+
+    name = "resurchify"
+    description = "the impact score, from the Resurchify search pages"
+    metrics = ("impact_score",)
+    ttl = 30 * DAY
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("--url", default=SEARCH_URL, help="the search page")
+        parser.add_argument("--rate", type=float, default=RATE, help="requests per second to a host, 0 for no limit")
+        parser.add_argument("--retries", type=int, default=RETRIES, help="attempts after a failed request")
+        parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds before a request is abandoned")
+        parser.add_argument("--parser", choices=available_parsers(), help="the HTML parser (default: the fastest)")
+        parser.add_argument("--min-confidence", type=float, default=matching.MIN_CONFIDENCE,
+                            help="confidence below which a result is not the journal searched")
+        parser.add_argument("--cache", default=CACHE_FOLDER, help="the folder of the pages downloaded")
+        parser.add_argument("--no-cache", action="store_true", help="download every page again, without storing it")
+
+    @classmethod
+    def from_arguments(cls, args):
+        return cls(args.url, args.rate, args.retries, args.timeout, None if args.no_cache else args.cache,
+                   make_parser(args.parser, args.min_confidence))
 
-        # Extraire le score d'impact
-        impact_score_tag = result.find(string=lambda text: text and "Impact Score" in text)
-        impact_score_str = impact_score_tag.split(":")[1].strip()
-        impact_score = float(impact_score_str)
-    except:
-        impact_score = None
+    def __init__(self, url=SEARCH_URL, rate=RATE, retries=RETRIES, timeout=TIMEOUT, cache=CACHE_FOLDER, parse=None,
+                 backoff=BACKOFF):
+        """
+        Initialize the ResurchifySource, see Scraper.
 
-    return impact_score
+        Args:
+            cache (str, optional): The folder of the pages downloaded, None for no cache. Defaults to CACHE_FOLDER.
+            parse (callable, optional): Called with a page and the journal title, returns its impact score. Defaults
+                to make_parser().
+        """
+        self.url = url
+        self.rate = rate
+        self.retries = retries
+        self.timeout = timeout
+        self.cache = ResponseCache(cache) if cache is not None else None
+        self.parse_page = parse or make_parser()
+        self.backoff = backoff
 
+    def scraper(self, concurrency):
+        """
+        Create a Scraper with the settings of the source.
+        """
+        return Scraper(self.url, concurrency, self.rate, self.retries, self.backoff, self.timeout, self.cache,
+                       self.parse_page)
 
-def update_impact_score(journal_id, journal_name, impact_factor):
-    # Connecter à la base de données
-    conn = sqlite3.connect(settings.database)  # Remplacer par le chemin de votre base de données
+    def fetch(self, journal):
+        scraper = self.scraper(1)
 
-    # Créer un curseur
-    c = conn.cursor()
+        async def fetch():
+            return await scraper.fetch(journal.title, asyncio.Semaphore(1))
 
-    # Mettre à jour le score d'impact pour le journal
-    print(journal_name + " -> " + str(impact_factor))
-    # Not the real impact factor, but the impact score
-    # c.execute("UPDATE journaux SET impact_factor = ? WHERE id = ?", (impact_factor, journal_id))
+        try:
+            return asyncio.run(fetch())
+        finally:
+            scraper.close()
 
-    # Committer les changements et fermer la connexion
-    conn.commit()
-    conn.close()
+    def parse(self, journal, raw):
+        return {"impact_score": self.parse_page(raw, journal.title)}
 
+    def resolve(self, journals, workers=CONCURRENCY):
+        scraper = self.scraper(workers)
+        results = queue.Queue(maxsize=workers * 4)
+        stop = threading.Event()
+        errors = []
 
-# Connect to your database
-conn = sqlite3.connect(settings.database)
-cursor = conn.cursor()
-cursor.execute("SELECT id, title FROM journaux")
-journal_names = cursor.fetchall()
-conn.close()
+        def put(item):
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
 
-for journal in journal_names:
-    impact_factor = get_impact_score(journal[1])
+        def run():
+            try:
+                scraper.run([(journal.id, journal.title) for journal in journals], put)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                put(None)
 
-    if impact_factor is not None:
-        update_impact_score(journal[0], journal[1], impact_factor)
+        thread = threading.Thread(target=run, name="resurchify-scraper", daemon=True)
+        thread.start()
+        try:
+            while True:
+                result = results.get()
+                if result is None:
+                    break
+                metrics = {"impact_score": result.impact_score} if result.error is None else None
+                yield SourceResult(result.journal_id, metrics, result.error)
+        finally:
+            # Unblock the scraper when the consumer stops early, and drop its connections so that the searches
+            # running end sooner
+            stop.set()
+            scraper.close()
+            thread.join()
+        if errors:
+            raise errors[0]
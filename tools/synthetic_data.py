@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       synthetic_data.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+import csv
+import random
+
+# Header of the SCImago "journalrank.php?out=xls" export.
+HEADER = [
+    'Rank', 'Sourceid', 'Title', 'Type', 'Issn', 'SJR', 'SJR Best Quartile', 'H index', 'Total Docs. (2022)',
+    'Total Docs. (3years)', 'Total Refs.', 'Total Cites (3years)', 'Citable Docs. (3years)', 'Cites / Doc. (2years)',
+    'Ref. / Doc.', 'Country', 'Region', 'Publisher', 'Coverage', 'Categories', 'Areas'
+]
+
+WORDS = ["Journal", "Review", "Letters", "Advances", "Annals", "International", "European", "Applied", "Clinical",
+         "Research", "Studies", "Science", "Engineering", "Medicine", "Physics", "Chemistry", "Economics", "Systems",
+         "Computing", "Biology", "Ecology", "History", "Law", "Management", "Psychology", "Nursing", "Materials"]
+
+COUNTRIES = [("United States", "Northern America"), ("United Kingdom", "Western Europe"), ("France", "Western Europe"),
+             ("Germany", "Western Europe"), ("Japan", "Asiatic Region"), ("Brazil", "Latin America"),
+             ("India", "Asiatic Region"), ("Australia", "Pacific Region"), ("Egypt", "Africa/Middle East")]
+
+TYPES = ["journal", "book series", "trade journal", "conference and proceedings"]
+
+AREAS = ["Medicine", "Engineering", "Computer Science", "Social Sciences", "Physics and Astronomy", "Chemistry",
+         "Mathematics", "Arts and Humanities", "Economics, Econometrics and Finance", "Environmental Science",
+         "Biochemistry, Genetics and Molecular Biology", "Agricultural and Biological Sciences", "Psychology",
+         "Materials Science", "Earth and Planetary Sciences", "Nursing", "Business, Management and Accounting"]
+
+# Roughly the number of categories in the real export.
+CATEGORIES = [f"{area} {word}" for area in AREAS for word in WORDS[:18]][:310]
+
+
+def decimal(value):
+    """
+    Format a number the way SCImago does, with a decimal comma.
+    """
+    return f"{value:.3f}".replace(".", ",")
+
+
+def generate_rows(count, seed=0, changed=0):
+    """
+    Generate rows shaped like the SCImago export. The same seed always gives the same rows.
+
+    Args:
+        count (int): The number of journals.
+        seed (int, optional): The random seed. Defaults to 0.
+        changed (int, optional): The number of journals, from the first one, whose H index differs from the seeded
+            value. Defaults to 0.
+
+    Yields:
+        dict: A CSV row keyed by HEADER.
+    """
+    generator = random.Random(seed)
+    for rank in range(1, count + 1):
+        country, region = generator.choice(COUNTRIES)
+        categories = generator.sample(CATEGORIES, generator.randint(1, 6))
+        areas = generator.sample(AREAS, generator.randint(1, 3))
+        docs = generator.randint(5, 3000)
+        yield {
+            'Rank': rank,
+            'Sourceid': 10000 + rank,
+            'Title': " ".join(generator.sample(WORDS, 4)) + f" {rank}",
+            'Type': generator.choice(TYPES),
+            'Issn': f"{rank:08d}, {rank + 50000000:08d}",
+            'SJR': decimal(generator.expovariate(1.0)),
+            'SJR Best Quartile': f"Q{generator.randint(1, 4)}",
+            'H index': generator.randint(0, 500) + (1000 if rank <= changed else 0),
+            'Total Docs. (2022)': docs,
+            'Total Docs. (3years)': docs * 3,
+            'Total Refs.': docs * 40,
+            'Total Cites (3years)': generator.randint(0, 90000),
+            'Citable Docs. (3years)': docs * 2,
+            'Cites / Doc. (2years)': decimal(generator.uniform(0, 20)),
+            'Ref. / Doc.': decimal(generator.uniform(0, 80)),
+            'Country': country,
+            'Region': region,
+            'Publisher': f"{generator.choice(WORDS)} Publishing",
+            'Coverage': "1999-2022",
+            'Categories': "; ".join(f"{category} (Q{generator.randint(1, 4)})" for category in categories),
+            'Areas': "; ".join(areas),
+        }
+
+
+def write_csv(path, count, seed=0, changed=0):
+    """
+    Write a synthetic SCImago export to `path`.
+
+    Args:
+        path (str): The output file.
+        count (int): The number of journals.
+        seed (int, optional): The random seed. Defaults to 0.
+        changed (int, optional): See generate_rows(). Defaults to 0.
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=HEADER, delimiter=';')
+        writer.writeheader()
+        writer.writerows(generate_rows(count, seed, changed))
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       journal_table_model.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+
+from core.repository import Repository
+from core.summary import split_labels
+
+# Number of journals fetched from the database at once.
+PAGE_SIZE = 500
+
+
+def summarize(labels, noun, shown=2):
+    """
+    Shorten a "; "-separated list of labels to its first items, e.g. "Oncology, Surgery (+3 categories)".
+
+    Args:
+        labels (str): The labels, None when there are none.
+        noun (str): What the labels are, for the count of the hidden ones.
+        shown (int, optional): The number of labels shown. Defaults to 2.
+
+    Returns:
+        str: The summary.
+    """
+    labels = split_labels(labels)
+    if len(labels) > shown:
+        return ', '.join(labels[:shown]) + f' (+{len(labels) - shown} {noun})'
+    return ', '.join(labels)
+
+
+class JournalTableModel(QAbstractTableModel):
+    """
+    The JournalTableModel class lists the journals of the database for the main window. Journals are loaded page by
+    page as the view scrolls (canFetchMore/fetchMore), and the category and area summaries are only formatted for the
+    cells actually painted.
+
+    Example usage:
+    model = JournalTableModel()
+    table_view.setModel(model)
+    """
+
+    HEADERS = ["ID", "Title", "Categories", "Domains"]
+
+    def __init__(self, parent=None):
+        """
+        Initialize the JournalTableModel.
+
+        Args:
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.rows = []
+        self.total = 0
+        self.exhausted = False
+
+    def reload(self):
+        """
+        Forget the loaded journals and start again from the first page.
+        """
+        self.beginResetModel()
+        self.rows = []
+        self.total = Repository().journal_count()
+        self.exhausted = self.total == 0
+        self.endResetModel()
+
+    def journal_id(self, row):
+        """
+        Get the ID of the journal shown on a row.
+        """
+        return self.rows[row].id
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+
+        journal = self.rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return str(journal.id)
+        if column == 1:
+            return journal.title
+        if column == 2:
+            return summarize(journal.categories, "categories")
+        return summarize(journal.areas, "domains")
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        after_id = self.rows[-1].id if self.rows else 0
+        page = Repository().journal_summary_page(after_id, PAGE_SIZE)
+        if len(page) < PAGE_SIZE:
+            self.exhausted = True
+        if not page:
+            return
+
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
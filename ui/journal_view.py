@@ -9,14 +9,12 @@
 # All rights reserved.
 #
 
-import sqlite3
-
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QStandardItemModel, QStandardItem, QColor, QBrush
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QGridLayout, QListView, QTableWidget, \
     QTableWidgetItem, QHeaderView, QAbstractItemView
 
-import settings
+from core.repository import Repository
 
 
 class JournalView(QDialog):
@@ -49,33 +47,17 @@ class JournalView(QDialog):
         self.layout_left.setContentsMargins(20, 20, 20, 20)
         self.grid_layout = QGridLayout()
 
-        # Connect to the database and retrieve journal data
-        db = sqlite3.connect(settings.database)
-        cursor = db.cursor()
+        # Retrieve journal data
+        repository = Repository()
 
         # Fetch data for the specific journal
-        cursor.execute("""SELECT * FROM journaux WHERE id = ?""", (journal_id,))
-        journal_data = cursor.fetchone()
+        journal_data = repository.journal(journal_id)
 
         # Fetch categories for the specific journal
-        cursor.execute("""
-                    SELECT categories.label, journaux_categories.quartile
-                    FROM journaux_categories
-                    JOIN categories ON categories.label = journaux_categories.label_category
-                    WHERE journaux_categories.id_journal = ?
-                """, (journal_id,))
-        categories_data = cursor.fetchall()
+        categories_data = repository.journal_categories(journal_id)
 
         # Fetch areas for the specific journal
-        cursor.execute("""
-                    SELECT areas.label
-                    FROM journaux_areas
-                    JOIN areas ON areas.label = journaux_areas.label_area
-                    WHERE journaux_areas.id_journal = ?
-                """, (journal_id,))
-        areas_data = cursor.fetchall()
-
-        db.close()
+        areas_data = repository.journal_areas(journal_id)
 
         self.grid_layout.setColumnStretch(0, 1)  # Left label, 1/5 of the width
         self.grid_layout.setColumnStretch(1, 4)  # Right label, 4/5 of the width
@@ -104,7 +86,7 @@ class JournalView(QDialog):
         Display the journal data in the grid layout.
 
         Args:
-            journal_data (tuple): The journal data.
+            journal_data (Journal): The journal data.
         """
         labels = ["Source ID:", "Titre:", "Type:", "ISSN:", "SJR:", "H Index:", "Documents derniere année:",
                   "Documents 3 dernieres années:", "Références:", "Citations:", "Cités:", "Citations/documents:",
@@ -118,11 +100,11 @@ class JournalView(QDialog):
         Add all the areas of the journal to the list.
 
         Args:
-            areas_data (list): The areas data.
+            areas_data (list): The area labels.
         """
         areas_model = QStandardItemModel(self.areas_list)
         for area in areas_data:
-            item = QStandardItem(area[0])
+            item = QStandardItem(area)
             item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
             areas_model.appendRow(item)
         self.areas_list.setModel(areas_model)
@@ -132,7 +114,7 @@ class JournalView(QDialog):
         Add all the associated categories to the journal in the table.
 
         Args:
-            categories_data (list): The categories data.
+            categories_data (list): The JournalCategory of the journal.
         """
         self.categories_table.setRowCount(len(categories_data))
         self.categories_table.setColumnCount(2)
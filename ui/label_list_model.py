@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       label_list_model.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+from PyQt5.QtCore import Qt, QSortFilterProxyModel, pyqtSignal
+from PyQt5.QtGui import QStandardItem, QStandardItemModel
+
+
+def fuzzy_match(word, label_words):
+    """
+    Check whether a typed word matches a label: it appears in the label, or its letters appear in that order in one
+    word of the label starting with the same letter, e.g. "biochm" in "biochemistry".
+
+    Args:
+        word (str): The word typed, in lowercase.
+        label_words (tuple): The label, in lowercase, followed by its words.
+
+    Returns:
+        bool: Whether the word matches.
+    """
+    if word in label_words[0]:
+        return True
+
+    for label_word in label_words[1:]:
+        if label_word[0] != word[0]:
+            continue
+        letters = iter(label_word)
+        if all(letter in letters for letter in word):
+            return True
+    return False
+
+
+class LabelListModel(QStandardItemModel):
+    """
+    The LabelListModel class lists checkable labels, categories or areas, sorted once when created. The number of
+    journals of each label can be shown next to it, checkedChanged being only emitted when a label is checked or
+    unchecked.
+
+    Example usage:
+    model = LabelListModel(["Oncology", "Surgery"])
+    model.checkedChanged.connect(on_check)
+    model.set_counts({"Oncology": 412, "Surgery": 87})
+    """
+
+    checkedChanged = pyqtSignal()
+
+    def __init__(self, labels, parent=None):
+        """
+        Initialize the LabelListModel.
+
+        Args:
+            labels (list): The labels.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.counts = None
+        self.counting = False
+        self.keys = []
+
+        for label in sorted(labels):
+            item = QStandardItem(label)
+            item.setEditable(False)
+            item.setCheckable(True)
+            item.setCheckState(Qt.Unchecked)
+            self.appendRow(item)
+
+            # Lowercase label and words, for the filter
+            lowered = label.lower()
+            self.keys.append((lowered,) + tuple(lowered.replace(',', ' ').split()))
+
+        # QStandardItemModel reports any dataChanged as items changed, counts included
+        self.itemChanged.connect(self.item_changed)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and self.counts is not None and index.isValid():
+            label = super().data(index, Qt.EditRole)
+            return f"{label} ({self.counts.get(label, 0)})"
+        return super().data(index, role)
+
+    def item_changed(self, _):
+        """
+        Report the check or uncheck of a label, ignoring the updates of the counts.
+        """
+        if not self.counting:
+            self.checkedChanged.emit()
+
+    def set_counts(self, counts):
+        """
+        Show the number of journals of each label.
+
+        Args:
+            counts (dict): The number of journals of each label, missing labels having none.
+        """
+        self.counts = counts
+        if self.rowCount():
+            self.counting = True
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, 0), [Qt.DisplayRole])
+            self.counting = False
+
+    def checked_labels(self):
+        """
+        Get the labels checked, in the order of the list.
+
+        Returns:
+            list: The labels.
+        """
+        return [self.item(row).text() for row in range(self.rowCount())
+                if self.item(row).checkState() == Qt.Checked]
+
+    def set_checked(self, labels):
+        """
+        Check the labels given and uncheck the others.
+
+        Args:
+            labels (list): The labels to check.
+        """
+        labels = set(labels)
+        for row in range(self.rowCount()):
+            item = self.item(row)
+            state = Qt.Checked if item.text() in labels else Qt.Unchecked
+            if item.checkState() != state:
+                item.setCheckState(state)
+
+
+class LabelFilterProxyModel(QSortFilterProxyModel):
+    """
+    The LabelFilterProxyModel class hides the labels of a LabelListModel that do not match the words typed, each word
+    having to match (see fuzzy_match). Rows keep the order of the source model.
+
+    Example usage:
+    proxy = LabelFilterProxyModel()
+    proxy.setSourceModel(LabelListModel(categories))
+    list_view.setModel(proxy)
+    filter_edit.textChanged.connect(proxy.set_pattern)
+    """
+
+    def __init__(self, parent=None):
+        """
+        Initialize the LabelFilterProxyModel.
+
+        Args:
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.words = []
+
+    def set_pattern(self, text):
+        """
+        Filter the labels on the text typed.
+
+        Args:
+            text (str): The words typed, an empty text showing every label.
+        """
+        words = text.lower().replace(',', ' ').split()
+        if words != self.words:
+            self.words = words
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.words:
+            return True
+        label_words = self.sourceModel().keys[source_row]
+        return all(fuzzy_match(word, label_words) for word in self.words)
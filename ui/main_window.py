@@ -9,18 +9,14 @@
 # All rights reserved.
 #
 
-import csv
-import os
-import re
-import sqlite3
+from PyQt5.QtWidgets import QMainWindow, QPushButton, QVBoxLayout, QLabel, QTableView, QWidget, QHBoxLayout, \
+    QAbstractItemView, QHeaderView, QMessageBox, QProgressBar
 
-import requests
-from PyQt5.QtWidgets import QMainWindow, QPushButton, QVBoxLayout, QLabel, QTableWidget, QWidget, QHBoxLayout, \
-    QTableWidgetItem, QAbstractItemView, QHeaderView, QMessageBox
-
-import settings
+from core import columnar_index, lookups
+from ui.journal_table_model import JournalTableModel
 from ui.journal_view import JournalView
 from ui.search_view import SearchView
+from ui.workers import UpdateWorker
 
 
 class MainWindow(QMainWindow):
@@ -45,14 +41,15 @@ class MainWindow(QMainWindow):
 
         # Widget creation
         self.label = QLabel("Label Text")
-        self.table = QTableWidget(0, 4)
+        self.model = JournalTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
 
         self.table.verticalHeader().setVisible(False)
-        self.table.setHorizontalHeaderLabels(["ID", "Title", "Categories", "Domains"])
         self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table.cellDoubleClicked.connect(self.open_journal_view)
+        self.table.doubleClicked.connect(lambda index: self.open_journal_view(index.row()))
 
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
@@ -60,6 +57,13 @@ class MainWindow(QMainWindow):
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
 
+        self.progressBar = QProgressBar()
+        self.progressBar.setTextVisible(True)
+        self.progressBar.hide()
+
+        # Background download and import, see update_list
+        self.update_worker = None
+
         self.updateListButton = QPushButton("Update List")
         self.updateListButton.clicked.connect(self.update_list)
 
@@ -82,6 +86,7 @@ class MainWindow(QMainWindow):
         # Button alignment
         buttonLayout = QHBoxLayout()
         buttonLayout.addWidget(self.updateListButton)
+        buttonLayout.addWidget(self.progressBar)
         buttonLayout.addStretch(1)
         buttonLayout.addWidget(self.searchButton)
         buttonLayout.addWidget(self.viewButton)
@@ -95,182 +100,108 @@ class MainWindow(QMainWindow):
 
         self.load_data()
 
+        # Read the search form vocabularies while the window shows up
+        lookups.preload()
+
     def open_journal_view(self, row):
         """
-        Opens the view for a selected journal, assuming its ID is stored in the first column
+        Opens the view for the journal shown on a row
         """
-        journal_id = self.table.item(row, 0).text()
+        journal_id = self.model.journal_id(row)
         self.journal_view = JournalView(journal_id)
         self.journal_view.show()
 
     def update_list(self):
         """
-        Updates the list of journals
+        Updates the list of journals in the background, or cancels the update in progress
+        """
+
+        if self.update_worker is not None:
+            self.update_worker.cancel()
+            self.updateListButton.setEnabled(False)
+            return
+
+        self.update_worker = UpdateWorker(self)
+        self.update_worker.downloadProgress.connect(self.show_download_progress)
+        self.update_worker.importProgress.connect(self.show_import_progress)
+        self.update_worker.committed.connect(self.update_committed)
+        self.update_worker.unchanged.connect(self.update_unchanged)
+        self.update_worker.cancelled.connect(self.update_cancelled)
+        self.update_worker.failed.connect(self.update_failed)
+        self.update_worker.finished.connect(self.update_finished)
+
+        self.updateListButton.setText("Cancel Update")
+        self.progressBar.setRange(0, 0)
+        self.progressBar.show()
+        self.update_worker.start()
+
+    def show_download_progress(self, received, total):
+        """
+        Show the download progress of the update
         """
+        if total:
+            self.progressBar.setRange(0, total)
+            self.progressBar.setValue(received)
+        self.progressBar.setFormat(f"Downloaded: {received / 1e6:.1f} MB")
 
-        db = sqlite3.connect(settings.database)
-        cursor = db.cursor()
-
-        # Create the directory if it does not exist
-        if not os.path.isdir(settings.temporary_folder):
-            os.makedirs(settings.temporary_folder)
-
-        # Download the file
-        response = requests.get(settings.data_url)
-        response.raise_for_status()
-
-        # Save the file
-        with open(settings.csv_file_path, "wb") as f:
-            f.write(response.content)
-
-        # Delete all records from the journaux_categories and journaux_areas tables
-        cursor.execute("DELETE FROM journaux_categories")
-        cursor.execute("DELETE FROM journaux_areas")
-
-        # Register the file in the database
-        with open(settings.csv_file_path, 'r') as file:
-            reader = csv.DictReader(file, delimiter=';')
-            for row in reader:
-                # Check if the journal already exists
-                cursor.execute("""
-                    SELECT id FROM journaux WHERE issn = ?
-                """, (row['Issn'],))
-                result = cursor.fetchone()
-
-                sjr_value = row['SJR']
-                sjr_value = sjr_value.replace(",", ".")  # Replace comma with a dot
-
-                if sjr_value != '':
-                    sjr_value = float(sjr_value)  # Convert to float
-                else:
-                    sjr_value = 0.0
-
-                if result is not None:
-                    journal_id = result[0]
-                    # Update existing journal
-                    cursor.execute("""
-                        UPDATE journaux SET 
-                        sourceid = ?, title = ?, type = ?, sjr = ?, h_index = ?, last_year_docs = ?, 
-                        three_years_docs = ?, refs = ?, cites = ?, citables = ?, cites_on_docs = ?, 
-                        ref_on_docs = ?, country = ?, region = ?, publisher = ?
-                        WHERE issn = ?
-                    """, (
-                        row['Sourceid'], row['Title'], row['Type'], sjr_value, row['H index'],
-                        row['Total Docs. (2022)'],
-                        row['Total Docs. (3years)'], row['Total Refs.'], row['Total Cites (3years)'],
-                        row['Citable Docs. (3years)'], row['Cites / Doc. (2years)'], row['Ref. / Doc.'], row['Country'],
-                        row['Region'], row['Publisher'], row['Issn']
-                    ))
-                else:
-                    # Create a new journal
-                    cursor.execute("""
-                        INSERT INTO journaux (
-                        sourceid, title, type, issn, sjr, h_index, last_year_docs, 
-                        three_years_docs, refs, cites, citables, cites_on_docs, 
-                        ref_on_docs, country, region, publisher
-                        )
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        row['Sourceid'], row['Title'], row['Type'], row['Issn'], row['SJR'], row['H index'],
-                        row['Total Docs. (2022)'], row['Total Docs. (3years)'], row['Total Refs.'],
-                        row['Total Cites (3years)'],
-                        row['Citable Docs. (3years)'], row['Cites / Doc. (2years)'], row['Ref. / Doc.'], row['Country'],
-                        row['Region'], row['Publisher']
-                    ))
-                    journal_id = cursor.lastrowid
-
-                # Process categories
-                for category in row['Categories'].split(';'):
-                    # We use a regular expression to separate the name of the category and the quartile
-                    match = re.match(r'(.*)(\(Q[1-4]\))$', category.strip())
-
-                    if match is not None:
-                        category, quartile = match.groups()
-                        category = category.strip()
-                        quartile = quartile.strip('()')
-                    else:
-                        category = category.strip()
-                        quartile = '-'
-
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO categories (label)
-                        VALUES (?)
-                    """, (category,))
-
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO journaux_categories (id_journal, label_category, quartile)
-                        VALUES (?, ?, ?)
-                    """, (journal_id, category, quartile))
-
-                # Process areas
-                for area in row['Areas'].split(';'):
-                    area = area.strip()
-
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO areas (label)
-                        VALUES (?)
-                    """, (area,))
-
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO journaux_areas (id_journal, label_area)
-                        VALUES (?, ?)
-                    """, (journal_id, area))
-
-        db.commit()
-        db.close()
-
-        # Load data into the table
+    def show_import_progress(self, rows, rows_per_second):
+        """
+        Show the import progress of the update
+        """
+        self.label.setText(f"Importing: {rows} rows ({rows_per_second:,.0f} rows/s)")
+
+    def update_committed(self, stats):
+        """
+        Reload the table once the import is committed
+        """
+        columnar_index.invalidate()
+        lookups.preload()
         self.load_data()
+        message = (f"List updated: {stats.inserted} inserted, {stats.updated} updated, {stats.unchanged} unchanged, "
+                   f"{stats.deleted} deleted")
+        if stats.missing_kept:
+            message += f", {stats.missing_kept} missing from the export kept (incomplete export?)"
+        self.statusBar().showMessage(message)
 
-    def load_data(self):
+    def update_unchanged(self):
         """
-        Load data into the table
+        Report that the list is already up to date
         """
+        self.load_data()
+        self.statusBar().showMessage("The list is already up to date")
+
+    def update_cancelled(self):
+        """
+        Restore the table label once the update is cancelled
+        """
+        self.load_data()
+
+    def update_failed(self, message):
+        """
+        Report an update error
+        """
+        QMessageBox.critical(self, "Error", f"The update failed: {message}")
 
-        db = sqlite3.connect(settings.database)
-        cursor = db.cursor()
+    def update_finished(self):
+        """
+        Restore the update button once the worker stopped
+        """
+        self.update_worker.deleteLater()
+        self.update_worker = None
+        self.progressBar.hide()
+        self.updateListButton.setText("Update List")
+        self.updateListButton.setEnabled(True)
 
-        # Clear table data
-        self.table.setRowCount(0)
+    def load_data(self):
+        """
+        Load data into the table
+        """
 
-        # Get all journal data from the database
-        cursor.execute("""
-            SELECT journaux.id, journaux.title, GROUP_CONCAT(categories.label), GROUP_CONCAT(areas.label) 
-            FROM journaux
-            LEFT JOIN journaux_categories ON journaux.id = journaux_categories.id_journal
-            LEFT JOIN categories ON categories.label = journaux_categories.label_category
-            LEFT JOIN journaux_areas ON journaux.id = journaux_areas.id_journal
-            LEFT JOIN areas ON areas.label = journaux_areas.label_area
-            GROUP BY journaux.id
-        """)
-        rows = cursor.fetchall()
+        # Restart from the first page, the next ones are fetched as the table scrolls
+        self.model.reload()
 
         # Show the number of journals found
-        self.label.setText(str(len(rows)) + " journals found")
-
-        for row in rows:
-            id, title, categories, areas = row
-            categories_list = categories.split(',')
-            areas_list = areas.split(',')
-
-            if len(categories_list) > 2:
-                categories_str = ', '.join(categories_list[:2]) + f' (+{len(categories_list) - 2} categories)'
-            else:
-                categories_str = ', '.join(categories_list)
-
-            if len(areas_list) > 2:
-                areas_str = ', '.join(areas_list[:2]) + f' (+{len(areas_list) - 2} domains)'
-            else:
-                areas_str = ', '.join(areas_list)
-
-            row_position = self.table.rowCount()
-            self.table.insertRow(row_position)
-            self.table.setItem(row_position, 0, QTableWidgetItem(str(id)))
-            self.table.setItem(row_position, 1, QTableWidgetItem(title))
-            self.table.setItem(row_position, 2, QTableWidgetItem(categories_str))
-            self.table.setItem(row_position, 3, QTableWidgetItem(areas_str))
-
-        db.close()
+        self.label.setText(str(self.model.total) + " journals found")
 
     def open_selected(self):
         """
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       search_results_model.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+import logging
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+
+from core.summary import split_labels
+from ui.workers import SearchWorker
+
+logger = logging.getLogger(__name__)
+
+
+def summarize(labels, noun, shown=3):
+    """
+    Shorten a "; "-separated list of labels to its first items, e.g. "Oncology, Surgery and 3 more categories".
+
+    Args:
+        labels (str): The labels, None when there are none.
+        noun (str): What the labels are, for the count of the hidden ones.
+        shown (int, optional): The number of labels shown. Defaults to 3.
+
+    Returns:
+        str: The summary.
+    """
+    labels = split_labels(labels)
+    text = ', '.join(labels[:shown])
+    if len(labels) > shown:
+        text += f" and {len(labels) - shown} more {noun}"
+    return text
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """
+    The SearchResultsModel class lists the results of a search. The first page is given by the search itself, and the
+    next ones are fetched from the last journal shown as the view scrolls (canFetchMore/fetchMore), by a SearchWorker
+    so that the view never waits for them.
+
+    Example usage:
+    model = SearchResultsModel()
+    table_view.setModel(model)
+    model.set_results(criteria, "SJR", *Repository().search_page(criteria, "SJR"))
+    """
+
+    HEADERS = ["ID", "Title", "Type", "SJR", "ImpactFactor", "H Index", "Country", "Region", "Publisher",
+               "Categories", "Areas"]
+
+    def __init__(self, parent=None):
+        """
+        Initialize the SearchResultsModel.
+
+        Args:
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.criteria = None
+        self.order = None
+        self.rows = []
+        self.after = None
+        self.exhausted = True
+        self.page_worker = None
+
+    def set_results(self, criteria, order, rows, after):
+        """
+        Show the first page of a search.
+
+        Args:
+            criteria (dict): The search criteria, keyword arguments of Repository.search_query.
+            order (str): The order of the results, a key of SEARCH_ORDERS.
+            rows (list): The JournalRow of the first page.
+            after (tuple): What to resume from for the next page, None when there is none, see
+                Repository.search_page.
+        """
+        self.cancel_page()
+        self.beginResetModel()
+        self.criteria = criteria
+        self.order = order
+        self.rows = list(rows)
+        self.after = after
+        self.exhausted = after is None
+        self.endResetModel()
+
+    def clear(self):
+        """
+        Forget the results.
+        """
+        self.cancel_page()
+        self.beginResetModel()
+        self.criteria = None
+        self.rows = []
+        self.exhausted = True
+        self.endResetModel()
+
+    def cancel_page(self):
+        """
+        Stop fetching the next page, if it is being fetched.
+        """
+        if self.page_worker is not None:
+            self.page_worker.cancel()
+            self.page_worker = None
+
+    def journal_id(self, row):
+        """
+        Get the ID of the journal shown on a row.
+        """
+        return self.rows[row].id
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+
+        journal = self.rows[index.row()]
+        column = index.column()
+        if column == 9:
+            return summarize(journal.categories, "categories")
+        if column == 10:
+            return summarize(journal.areas, "areas")
+
+        value = (journal.id, journal.title, journal.type, journal.sjr, journal.impact_factor, journal.h_index,
+                 journal.country, journal.region, journal.publisher)[column]
+        return str(value) if column in (0, 3, 4, 5) else value
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        # The next page is fetched once, the view asking again while it comes
+        if parent.isValid() or self.exhausted or self.page_worker is not None:
+            return
+
+        self.page_worker = SearchWorker(self.criteria, self.order, after=self.after, parent=self)
+        self.page_worker.pageReady.connect(self.append_page)
+        self.page_worker.failed.connect(self.page_failed)
+        self.page_worker.finished.connect(self.page_worker.deleteLater)
+        self.page_worker.start()
+
+    def append_page(self, rows, after):
+        """
+        Show the next page of results once the worker fetched it.
+
+        Args:
+            rows (list): The JournalRow of the page.
+            after (object): What to resume from for the next page, None when there is none.
+        """
+        if self.sender() is not self.page_worker:
+            return
+
+        self.page_worker = None
+        self.after = after
+        self.exhausted = after is None
+        if not rows:
+            return
+
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def page_failed(self, message):
+        """
+        Report an error of the worker fetching the next page, the page being asked again on the next scroll.
+        """
+        if self.sender() is self.page_worker:
+            self.page_worker = None
+            logger.error("Next page of results failed: %s", message)
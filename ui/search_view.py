@@ -8,17 +8,24 @@
 # Copyright (c) 2023,
 # Tous droits réservés. 
 #
-import csv
-import sqlite3
+import logging
+import time
 
 from PyQt5 import QtWidgets
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QDialog, QLabel, QLineEdit, QComboBox, \
-    QListWidget, QTableWidgetItem, QAbstractItemView, QTableWidget, QWidget, QListWidgetItem, QHeaderView, QFileDialog
-from PyQt5.QtWidgets import QSplitter, QPushButton, QVBoxLayout, QHBoxLayout
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QDialog, QLabel, QLineEdit, QComboBox, QCheckBox, \
+    QListView, QAbstractItemView, QTableView, QWidget, QHeaderView, QFileDialog
+from PyQt5.QtWidgets import QSplitter, QPushButton, QVBoxLayout, QHBoxLayout, QProgressBar
 
 import settings
+from core import export, lookups
+from core.query_builder import SEARCH_ORDERS
 from ui import JournalView
+from ui.label_list_model import LabelListModel, LabelFilterProxyModel
+from ui.search_results_model import SearchResultsModel
+from ui.workers import ExportWorker, SearchWorker
+
+logger = logging.getLogger(__name__)
 
 
 class SearchView(QDialog):
@@ -96,15 +103,22 @@ class SearchView(QDialog):
         self.formLayout.addWidget(self.typeLabel)
         self.formLayout.addWidget(self.typeCombo)
 
+        # Order of the results
+        self.orderLabel = QLabel("Sort by:")
+        self.orderCombo = QComboBox()
+        self.orderCombo.addItems(SEARCH_ORDERS)
+        self.formLayout.addWidget(self.orderLabel)
+        self.formLayout.addWidget(self.orderCombo)
+
         # Categories List
         self.categoriesLabel = QLabel("Categories:")
-        self.categoriesList = QListWidget()
+        self.categoriesModel = LabelListModel(categories, self)
+        self.categoriesProxy = LabelFilterProxyModel(self)
+        self.categoriesProxy.setSourceModel(self.categoriesModel)
+        self.categoriesList = QListView()
+        self.categoriesList.setModel(self.categoriesProxy)
         self.categoriesList.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        for category in categories:
-            item = QListWidgetItem(category[0])  # assuming category is a tuple
-            item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-            item.setCheckState(Qt.Unchecked)
-            self.categoriesList.addItem(item)
+        self.categoriesList.setUniformItemSizes(True)
         self.formLayout.addWidget(self.categoriesLabel)
         self.formLayout.addWidget(self.categoriesList)
 
@@ -117,13 +131,13 @@ class SearchView(QDialog):
 
         # Areas List
         self.areasLabel = QLabel("Areas:")
-        self.areasList = QListWidget()
+        self.areasModel = LabelListModel(areas, self)
+        self.areasProxy = LabelFilterProxyModel(self)
+        self.areasProxy.setSourceModel(self.areasModel)
+        self.areasList = QListView()
+        self.areasList.setModel(self.areasProxy)
         self.areasList.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        for area in areas:
-            item = QListWidgetItem(area[0])  # assuming area is a tuple
-            item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-            item.setCheckState(Qt.Unchecked)
-            self.areasList.addItem(item)
+        self.areasList.setUniformItemSizes(True)
         self.formLayout.addWidget(self.areasLabel)
         self.formLayout.addWidget(self.areasList)
 
@@ -138,9 +152,12 @@ class SearchView(QDialog):
 
         # Bouton de recherche
         searchButtonLayout = QHBoxLayout()
+        self.liveSearchCheck = QCheckBox("Search as you type")
+        self.liveSearchCheck.setChecked(settings.live_search)
         self.searchButton = QPushButton("Search")
         self.searchButton.setDefault(True)  # Make it the default button
         self.searchButton.clicked.connect(self.search_journals)
+        searchButtonLayout.addWidget(self.liveSearchCheck)
         searchButtonLayout.addStretch(1)
         searchButtonLayout.addWidget(self.searchButton)
         self.formLayout.addLayout(searchButtonLayout)
@@ -148,16 +165,15 @@ class SearchView(QDialog):
         leftWidget.setLayout(self.formLayout)
 
         # Right part: Journals table
-        self.journalsTable = QTableWidget(0, 8)
-        self.journalsTable.setHorizontalHeaderLabels(
-            ["ID", "Title", "Type", "SJR", "ImpactFactor", "H Index", "Country",
-             "Region", "Publisher", "Categories", "Areas"])
+        self.model = SearchResultsModel(self)
+        self.journalsTable = QTableView()
+        self.journalsTable.setModel(self.model)
 
         self.journalsTable.verticalHeader().setVisible(False)
         self.journalsTable.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.journalsTable.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.journalsTable.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.journalsTable.cellDoubleClicked.connect(self.open_journal_view)
+        self.journalsTable.doubleClicked.connect(lambda index: self.open_journal_view(index.row()))
 
         self.resize_table()
 
@@ -172,6 +188,13 @@ class SearchView(QDialog):
         self.exportButton = QPushButton("Export")
         self.exportButton.clicked.connect(self.export_data)
 
+        # Background export, see export_data
+        self.export_worker = None
+        self.exportProgress = QProgressBar()
+        self.exportProgress.setTextVisible(True)
+        self.exportProgress.hide()
+
+        exportButtonLayout.addWidget(self.exportProgress)
         exportButtonLayout.addStretch(1)
         exportButtonLayout.addWidget(self.labelCount)
         exportButtonLayout.addWidget(self.cancelButton)
@@ -188,204 +211,167 @@ class SearchView(QDialog):
         splitter.setStretchFactor(0, 0)
         splitter.setStretchFactor(1, 1)
 
-        self.areasList.sortItems()
-        self.categoriesList.sortItems()
-
         # Add splitter to layout
         self.layout.addWidget(splitter)
 
         # Configure the central widget
         self.setLayout(self.layout)
 
-    def update_categories(self, text):
-        """This method updates the categories list based on the entered text."""
-
-        for i in range(self.categoriesList.count()):
-            item = self.categoriesList.item(i)
-            item.setHidden(text != "" and text.lower() not in item.text().lower())
-        self.categoriesList.sortItems()
-
-    def update_areas(self, text):
-        """This method updates the areas list based on the entered text."""
-
-        for i in range(self.areasList.count()):
-            item = self.areasList.item(i)
-            item.setHidden(text != "" and text.lower() not in item.text().lower())
-        self.areasList.sortItems()
-
-    def search_journals(self):
-        """This method performs the search in the database based on the form field values."""
-
-        self.journalsTable.setRowCount(0)
-
-        # Retrieve form field values
-        keyword = self.keywordEdit.text()
-        quartile = self.quartileCombo.currentText()
-        sjr = self.sjrEdit.text()
-        impactfactor = self.impactFactorEdit.text()
-
-        type_ = self.typeCombo.currentText()
-        country = self.countryCombo.currentText()
-        region = self.regionCombo.currentText()
-
-        areas = [self.areasList.item(i).text() for i in range(self.areasList.count()) if
-                 self.areasList.item(i).checkState() == Qt.Checked]
-        categories = [self.categoriesList.item(i).text() for i in range(self.categoriesList.count()) if
-                      self.categoriesList.item(i).checkState() == Qt.Checked]
-
-        # Prepare the SQL query
-        query = """SELECT journaux.* FROM journaux
-                LEFT JOIN journaux_categories ON journaux.id = journaux_categories.id_journal
-                LEFT JOIN journaux_areas ON journaux.id = journaux_areas.id_journal
-                """
-        params = []
-
-        # Start WHERE clause
-        where_clauses = []
+        # Live search: wait for a pause in the input, then search in the background
+        self.search_worker = None
+        self.input_time = self.search_input_time = time.perf_counter()
+        self.searchTimer = QTimer(self)
+        self.searchTimer.setSingleShot(True)
+        self.searchTimer.setInterval(settings.live_search_delay)
+        self.searchTimer.timeout.connect(self.start_search)
 
-        # Add search criteria as needed
-        if keyword:
-            keyword = keyword.replace(' ', '%')
-            where_clauses.append("journaux.title LIKE ?")
-            params.append(f"%{keyword}%")
+        for edit in (self.keywordEdit, self.sjrEdit, self.impactFactorEdit):
+            edit.textChanged.connect(self.schedule_search)
+        for combo in (self.quartileCombo, self.countryCombo, self.regionCombo, self.typeCombo, self.orderCombo):
+            combo.currentIndexChanged.connect(self.schedule_search)
+        self.categoriesModel.checkedChanged.connect(self.schedule_search)
+        self.areasModel.checkedChanged.connect(self.schedule_search)
 
-        if sjr:
-            where_clauses.append("CAST(journaux.sjr AS REAL) >= ?")
-            params.append(sjr)
+        # Number of journals of every category and area, before any search
+        self.start_search()
 
-        if impactfactor:
-            where_clauses.append("CAST(journaux.impact_factor AS REAL) >= ?")
-            params.append(impactfactor)
-
-        if type_ != "-":
-            where_clauses.append("journaux.type = ?")
-            params.append(type_)
-
-        if country != '-':
-            where_clauses.append("journaux.country = ?")
-            params.append(country)
-
-        if region != '-':
-            where_clauses.append("journaux.region = ?")
-            params.append(region)
+    def update_categories(self, text):
+        """This method filters the categories list on the entered text, the list being sorted once and for all."""
 
-        withcat = False
+        self.categoriesProxy.set_pattern(text)
 
-        if categories:
-            withcat = True
-            where_clauses.append("journaux_categories.label_category IN ({})".format(', '.join(['?'] * len(categories))))
-            params.extend(categories)
+    def update_areas(self, text):
+        """This method filters the areas list on the entered text, the list being sorted once and for all."""
 
-        if quartile != '-':
-            quartile_value = int(quartile[1])  # Convert "q1", "q2", etc. to 1, 2, etc.
-            where_clauses.append("CAST(SUBSTR(journaux_categories.quartile, 2) AS INTEGER) <= ?")
-            params.append(quartile_value)
+        self.areasProxy.set_pattern(text)
 
-        if areas:
-            where_clauses.append("journaux_areas.label_area IN ({})".format(', '.join(['?'] * len(areas))))
-            params.extend(areas)
+    def criteria(self):
+        """This method returns the form field values, as keyword arguments of Repository.search_query."""
 
-        # Construct WHERE clause
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
+        return {
+            "keyword": self.keywordEdit.text(),
+            "quartile": self.quartileCombo.currentText(),
+            "sjr": self.sjrEdit.text(),
+            "impact_factor": self.impactFactorEdit.text(),
+            "type_": self.typeCombo.currentText(),
+            "country": self.countryCombo.currentText(),
+            "region": self.regionCombo.currentText(),
+            "categories": self.categoriesModel.checked_labels(),
+            "areas": self.areasModel.checked_labels(),
+        }
 
-        # Finalize query
-        query += " GROUP BY journaux.id"
+    def schedule_search(self):
+        """This method restarts the live search delay after a change of the form."""
 
-        if withcat:
-            query += " HAVING COUNT(DISTINCT journaux_categories.label_category) = ?"
-            params.append(len(categories))
+        if self.liveSearchCheck.isChecked():
+            self.input_time = time.perf_counter()
+            self.searchTimer.start()
 
+    def search_journals(self):
+        """This method performs the search in the database based on the form field values."""
 
-            #AND COUNT(DISTINCT CASE WHEN categories NOT IN (cat1, cat2, cat3) THEN categories END) = 0
-            #AND COUNT(DISTINCT categories) = (SELECT COUNT(DISTINCT categories) FROM journaux WHERE journal_id = journaux.journal_id);"
+        self.searchTimer.stop()
+        self.input_time = time.perf_counter()
+        self.start_search(explicit=True)
+
+    def start_search(self, explicit=False):
+        """
+        This method starts a background search, stopping the previous one. The first page of results is shown as
+        soon as it is read, before the results are counted, then the categories and areas are counted. A live search
+        on an empty form only counts them, as it would find every journal.
+        """
+
+        self.cancel_search()
+        self.model.clear()
+
+        criteria = self.criteria()
+        facets_only = not explicit and not any(value not in ("", "-", []) for value in criteria.values())
+        self.labelCount.setText("- results" if facets_only else "Searching...")
+
+        self.search_input_time = self.input_time
+        self.search_worker = SearchWorker(criteria, self.orderCombo.currentText(), facets_only=facets_only,
+                                          parent=self)
+        self.search_worker.pageReady.connect(self.show_first_page)
+        self.search_worker.counted.connect(self.show_count)
+        self.search_worker.facetsCounted.connect(self.show_facet_counts)
+        self.search_worker.failed.connect(self.search_failed)
+        self.search_worker.finished.connect(self.search_worker.deleteLater)
+        self.search_worker.start()
+
+    def cancel_search(self):
+        """This method stops the search in progress, if any."""
+
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            self.search_worker = None
+
+    def show_first_page(self, rows, after):
+        """This method shows the first page of results of the current search, the next ones coming on scroll."""
+
+        worker = self.sender()
+        if worker is not self.search_worker:
+            return
 
-        print(query)
-        print(params)
+        self.model.set_results(worker.criteria, worker.order, rows, after)
+        self.labelCount.setText(f"{len(rows)}+ results" if self.model.canFetchMore() else f"{len(rows)} results")
+        logger.info("Search: first %d results %.0f ms after the last input", len(rows),
+                    (time.perf_counter() - self.search_input_time) * 1000)
 
-        # Execute the query
-        db = sqlite3.connect(settings.database)
-        cursor = db.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+    def show_count(self, count):
+        """This method shows the number of results once the current search counted them."""
 
-        # Check number of results
-        if len(rows) > 1000:
-            error_dialog = QtWidgets.QMessageBox()
-            error_dialog.setIcon(QtWidgets.QMessageBox.Critical)
-            error_dialog.setWindowTitle("Error")
-            error_dialog.setText("Too many results. Please narrow down your search.")
-            error_dialog.setStandardButtons(QtWidgets.QMessageBox.Ok)
-            error_dialog.exec_()
+        if self.sender() is not self.search_worker:
             return
 
         # Update labelCount with number of results
-        self.labelCount.setText(f"{len(rows)} results")
-
-        # Affiche les journaux dans le tableau
-        for row in rows:
-            current_row_index = self.journalsTable.rowCount()
-            self.journalsTable.insertRow(current_row_index)
-
-            # Insert basic data
-            self.journalsTable.setItem(current_row_index, 0, QTableWidgetItem(str(row[0])))  # id
-            self.journalsTable.setItem(current_row_index, 1, QTableWidgetItem(row[2]))  # title
-            self.journalsTable.setItem(current_row_index, 2, QTableWidgetItem(row[3]))  # type
-            self.journalsTable.setItem(current_row_index, 3, QTableWidgetItem(row[5]))  # sjr
-            self.journalsTable.setItem(current_row_index, 4, QTableWidgetItem(str(row[17])))  # impact_factor
-            self.journalsTable.setItem(current_row_index, 5, QTableWidgetItem(str(row[6])))  # h_index
-            self.journalsTable.setItem(current_row_index, 6, QTableWidgetItem(row[14]))  # country
-            self.journalsTable.setItem(current_row_index, 7, QTableWidgetItem(row[15]))  # region
-            self.journalsTable.setItem(current_row_index, 8, QTableWidgetItem(row[16]))  # publisher
-
-            # Get and insert categories
-            cursor.execute("""SELECT label_category FROM journaux_categories WHERE id_journal = ?""", (row[0],))
-            categories = [c[0] for c in cursor.fetchall()]
-            categories_text = ', '.join(categories[:3])
-            if len(categories) > 3:
-                categories_text += f" and {len(categories) - 3} more categories"
-            self.journalsTable.setItem(current_row_index, 8, QTableWidgetItem(categories_text))
-
-            # Get and insert areas
-            cursor.execute("""SELECT label_area FROM journaux_areas WHERE id_journal = ?""", (row[0],))
-            areas = [a[0] for a in cursor.fetchall()]
-            areas_text = ', '.join(areas[:3])
-            if len(areas) > 3:
-                areas_text += f" and {len(areas) - 3} more areas"
-            self.journalsTable.setItem(current_row_index, 9, QTableWidgetItem(areas_text))
-
-        db.close()
+        self.labelCount.setText(f"{count} results")
+        logger.info("Search: %d results counted %.0f ms after the last input", count,
+                    (time.perf_counter() - self.search_input_time) * 1000)
 
-    def load_data(self):
+    def show_facet_counts(self, categories, areas):
+        """
+        This method shows, next to each category and area, the number of journals the current search would find with
+        it checked.
+
+        Args:
+            categories (dict): The number of journals of each category label.
+            areas (dict): The number of journals of each area label.
+        """
 
-        # Connect to the database
-        db = sqlite3.connect(settings.database)
-        cursor = db.cursor()
+        if self.sender() is not self.search_worker:
+            return
 
-        cursor.execute("""SELECT * FROM categories""")
-        categories = cursor.fetchall()
+        self.categoriesModel.set_counts(categories)
+        self.areasModel.set_counts(areas)
 
-        cursor.execute("""SELECT * FROM areas""")
-        areas = cursor.fetchall()
+    def search_failed(self, message):
+        """This method reports an error of the current search."""
 
-        cursor.execute("SELECT DISTINCT type FROM journaux ORDER BY type")
-        types = [row[0] for row in cursor.fetchall()]
+        if self.sender() is self.search_worker:
+            self.labelCount.setText("Search failed")
+            logger.error("Search failed: %s", message)
 
-        # Execute SQL queries to get unique and sorted list of countries and regions
-        cursor.execute("SELECT DISTINCT country FROM journaux ORDER BY country")
-        countries = [row[0] for row in cursor.fetchall()]
+    def done(self, result):
+        # Les recherches encore en cours utilisent la fenêtre : on les arrête avant de la fermer
+        self.searchTimer.stop()
+        self.cancel_search()
+        for worker in self.findChildren(SearchWorker) + self.findChildren(ExportWorker):
+            worker.cancel()
+            worker.wait()
+        super().done(result)
 
-        cursor.execute("SELECT DISTINCT region FROM journaux ORDER BY region")
-        regions = [row[0] for row in cursor.fetchall()]
+    def load_data(self):
 
-        # Close the connection
-        db.close()
+        # Shared by every search view, and only read again after an import
+        vocabularies = lookups.get_lookups()
 
-        return categories, areas, countries, regions, types
+        return (vocabularies.categories, vocabularies.areas, vocabularies.countries, vocabularies.regions,
+                vocabularies.types)
 
     def clear_form(self):
-        # Clear the table
-        self.journalsTable.setRowCount(0)
+        # Stop the search in progress and clear the table
+        self.cancel_search()
+        self.model.clear()
 
         # Clear form fields
         self.keywordEdit.clear()
@@ -395,13 +381,13 @@ class SearchView(QDialog):
         self.countryCombo.setCurrentIndex(0)
         self.regionCombo.setCurrentIndex(0)
 
-        self.labelCount.setText(f"- results")
-
         # Clear the checked items in areasList and categoriesList
-        for i in range(self.areasList.count()):
-            self.areasList.item(i).setCheckState(Qt.Unchecked)
-        for i in range(self.categoriesList.count()):
-            self.categoriesList.item(i).setCheckState(Qt.Unchecked)
+        self.areasModel.set_checked([])
+        self.categoriesModel.set_checked([])
+
+        # Nothing left to search for: only count the journals of each category and area again
+        self.searchTimer.stop()
+        self.start_search()
 
     def resize_table(self):
         header = self.journalsTable.horizontalHeader()
@@ -410,13 +396,22 @@ class SearchView(QDialog):
 
     def open_journal_view(self, row):
         # Récupère l'ID du journal en supposant qu'il est stocké dans la première colonne
-        journal_id = self.journalsTable.item(row, 0).text()
+        journal_id = self.model.journal_id(row)
         self.journal_view = JournalView(journal_id)
         self.journal_view.show()
 
     def export_data(self):
+        """
+        This method exports every result of the current search in the background, in the format chosen in the file
+        dialog, or cancels the export in progress.
+        """
+
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.exportButton.setEnabled(False)
+            return
 
-        if self.journalsTable.rowCount() == 0:
+        if self.model.rowCount() == 0:
             error_dialog = QtWidgets.QMessageBox()
             error_dialog.setIcon(QtWidgets.QMessageBox.Critical)
             error_dialog.setWindowTitle("Error")
@@ -425,46 +420,51 @@ class SearchView(QDialog):
             error_dialog.exec_()
             return
 
-        # Demandez à l'utilisateur où enregistrer le fichier CSV
-        save_path, _ = QFileDialog.getSaveFileName(self, 'Save File', '', 'CSV(*.csv)')
+        # Demandez à l'utilisateur où enregistrer le fichier, et dans quel format
+        writers = {f"{writer.name}(*.{writer.extension})": writer for writer in export.available_writers()}
+        save_path, name_filter = QFileDialog.getSaveFileName(self, 'Save File', '', ';;'.join(writers))
 
         if save_path:
-            # Ouvrir le fichier CSV en mode écriture
-            with open(save_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-
-                # Écrire les en-têtes de colonne
-                headers = ['ID', 'SourceID', 'Title', 'Type', 'ISSN', 'SJR', 'H Index', 'Last Year Docs',
-                           'Three Years Docs',
-                           'Refs', 'Cites', 'Citable Docs', 'Cites per Docs', 'Ref per Docs', 'Country', 'Region',
-                           'Publisher', 'IF', 'Categories (Quartile)', 'Areas']
-                writer.writerow(headers)
-
-                # Ouvrir la connexion à la base de données
-                db = sqlite3.connect(settings.database)
-                cursor = db.cursor()
-
-                # Parcourir chaque ligne du tableau
-                for row_number in range(self.journalsTable.rowCount()):
-                    # Récupérer l'ID du journal
-                    journal_id = self.journalsTable.item(row_number, 0).text()
-
-                    # Exécuter la requête pour récupérer les informations complètes du journal
-                    cursor.execute("SELECT * FROM journaux WHERE id = ?", (journal_id,))
-                    journal_data = cursor.fetchone()
-
-                    # Récupérer les catégories et les zones
-                    cursor.execute("SELECT label_category, quartile FROM journaux_categories WHERE id_journal = ?",
-                                   (journal_id,))
-                    categories = cursor.fetchall()
-                    categories_text = '; '.join([f"{c[0]}({c[1]})" for c in categories])
-
-                    cursor.execute("SELECT label_area FROM journaux_areas WHERE id_journal = ?", (journal_id,))
-                    areas = cursor.fetchall()
-                    areas_text = '; '.join(a[0] for a in areas)
-
-                    # Ajouter les données de journal au CSV
-                    row = list(journal_data) + [categories_text, areas_text]
-                    writer.writerow(row)
-
-                db.close()
+            # L'extension tapée l'emporte sur le filtre choisi
+            writer_class = export.writer_for(save_path, default=None)
+            if writer_class is None:
+                writer_class = writers.get(name_filter, export.CsvWriter)
+                save_path += f".{writer_class.extension}"
+
+            # Tous les résultats de la recherche, y compris ceux pas encore affichés
+            self.export_worker = ExportWorker(self.model.criteria, self.model.order, save_path, writer_class, self)
+            self.export_worker.progress.connect(self.show_export_progress)
+            self.export_worker.exported.connect(self.export_done)
+            self.export_worker.failed.connect(self.export_failed)
+            self.export_worker.finished.connect(self.export_finished)
+
+            self.exportButton.setText("Cancel Export")
+            self.exportProgress.setRange(0, 0)
+            self.exportProgress.show()
+            self.export_worker.start()
+
+    def show_export_progress(self, written, total):
+        """This method shows the number of journals exported so far."""
+
+        self.exportProgress.setRange(0, max(total, 1))
+        self.exportProgress.setValue(written)
+        self.exportProgress.setFormat(f"Exported: {written}/{total}")
+
+    def export_done(self, count):
+        """This method reports the end of the export."""
+
+        logger.info("Export: %d journals written to %s", count, self.export_worker.path)
+
+    def export_failed(self, message):
+        """This method reports an export error."""
+
+        QtWidgets.QMessageBox.critical(self, "Error", f"The export failed: {message}")
+
+    def export_finished(self):
+        """This method restores the export button once the worker stopped."""
+
+        self.export_worker.deleteLater()
+        self.export_worker = None
+        self.exportProgress.hide()
+        self.exportButton.setText("Export")
+        self.exportButton.setEnabled(True)
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+#
+# File Name:       workers.py
+# Creation Date:   18/10/2026
+# Version:         0.0.1
+# Author:          Simon STEPHAN <simon.stephan@u-bourgogne.fr>
+#
+# Copyright (c) 2023,
+# All rights reserved.
+#
+
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+import settings
+from core import download, export, ingestion, repository
+from core.fetch_cache import ExportUnchanged, FetchCache
+from core.repository import Repository
+
+
+class UpdateWorker(QThread):
+    """
+    The UpdateWorker class downloads the SCImago export and imports it into the database outside of the GUI thread.
+
+    Example usage:
+    worker = UpdateWorker()
+    worker.committed.connect(window.load_data)
+    worker.start()
+    """
+
+    # Bytes received so far and total size announced by the server (0 when unknown)
+    downloadProgress = pyqtSignal(int, int)
+    # Rows imported so far and import throughput in rows per second
+    importProgress = pyqtSignal(int, float)
+    # Emitted with the ImportStats once the import transaction is committed
+    committed = pyqtSignal(object)
+    # Emitted when the export is the one already imported and nothing was written
+    unchanged = pyqtSignal()
+    # Emitted when the update stopped on cancel() and nothing was written
+    cancelled = pyqtSignal()
+    # Emitted with an error message when the download or the import failed
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        """
+        Initialize the UpdateWorker.
+
+        Args:
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        Ask the worker to stop. The download is abandoned, or the import transaction rolled back.
+        """
+        self._cancelled = True
+
+    def is_cancelled(self):
+        """
+        Whether cancel() was called.
+        """
+        return self._cancelled
+
+    def run(self):
+        try:
+            stats = self.download_and_import()
+            self.committed.emit(stats)
+        except ExportUnchanged:
+            self.unchanged.emit()
+        except ingestion.ImportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def download_and_import(self):
+        """
+        Download the export and import it into the database, the whole import being a single transaction.
+
+        Without settings.use_fetch_cache, rows are parsed and written while the download goes on. With it, the request
+        is conditional, and a "304 Not Modified" stops the update at once. Otherwise the export is downloaded to
+        settings.csv_file_path first, for its hash to be compared with the last export imported before anything is
+        parsed: an unchanged export from a server ignoring the validators costs a download, but never touches the
+        database. The download and the import then run one after the other instead of overlapping.
+
+        Returns:
+            ImportStats: What the import did.
+        """
+        start = time.perf_counter()
+
+        def progress(stats):
+            self.importProgress.emit(stats.rows, stats.rows / max(time.perf_counter() - start, 1e-6))
+
+        if not settings.use_fetch_cache:
+            tee_path = settings.csv_file_path if settings.keep_download else None
+            with download.open_export() as response:
+                total = int(response.headers.get("Content-Length", 0))
+                # The download stops before the response is closed when the import does not read it all, e.g. on
+                # cancel
+                with closing(download.stream_export(response, tee_path,
+                                                    lambda received: self.downloadProgress.emit(received, total))
+                             ) as reader:
+                    return ingestion.import_reader(reader, settings.database, progress=progress,
+                                                   is_cancelled=self.is_cancelled,
+                                                   incremental=settings.incremental_import)
+
+        cache = FetchCache(settings.csv_file_path)
+        hasher = hashlib.sha256()
+        with download.open_export(headers=cache.conditional_headers()) as response:
+            if response.status_code == 304:
+                raise ExportUnchanged()
+
+            total = int(response.headers.get("Content-Length", 0))
+            download.save_export(response, settings.csv_file_path,
+                                 lambda received: self.downloadProgress.emit(received, total), hasher,
+                                 self.is_cancelled)
+        sha256 = hasher.hexdigest()
+        cache.record_download(response, sha256)
+
+        try:
+            if cache.is_imported(sha256):
+                raise ExportUnchanged()
+            stats = ingestion.import_csv(settings.csv_file_path, settings.database, progress=progress,
+                                         is_cancelled=self.is_cancelled, incremental=settings.incremental_import)
+        finally:
+            if not settings.keep_download:
+                os.remove(settings.csv_file_path)
+        cache.mark_imported(sha256)
+        return stats
+
+
+class SearchWorker(QThread):
+    """
+    The SearchWorker class runs a journal search on its own connection, outside of the GUI thread: it fetches the first
+    page of results, counts them all, then counts the journals of every category and area when the in-memory index is
+    enabled. Given where to resume from, it only fetches the next page, as the results view scrolls. A search made
+    stale by newer input is stopped with cancel(), which interrupts the statement in progress.
+
+    Example usage:
+    worker = SearchWorker({"keyword": "oncology"}, "Relevance")
+    worker.pageReady.connect(view.show_first_page)
+    worker.start()
+    """
+
+    # Emitted with the JournalRow of the page and what to resume from for the next page, None when there is none
+    pageReady = pyqtSignal(list, object)
+    # Emitted with the number of results, after the first page
+    counted = pyqtSignal(int)
+    # Emitted with the number of results of every category and of every area, as dicts
+    facetsCounted = pyqtSignal(dict, dict)
+    # Emitted with an error message when the search failed
+    failed = pyqtSignal(str)
+
+    def __init__(self, criteria, order, page_size=None, facets_only=False, after=None, parent=None):
+        """
+        Initialize the SearchWorker.
+
+        Args:
+            criteria (dict): The keyword arguments of Repository.search_query.
+            order (str): The order of the results, a key of SEARCH_ORDERS.
+            page_size (int, optional): The number of results of the first page. Defaults to settings.search_chunk_size.
+            facets_only (bool, optional): Whether to only count the journals of every category and area. Defaults to
+                False.
+            after (object, optional): What to resume from to fetch a next page only, see Repository.search_page.
+                Defaults to None, the first page.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.criteria = criteria
+        self.order = order
+        self.page_size = page_size or settings.search_chunk_size
+        self.facets_only = facets_only
+        self.after = after
+        self._cancelled = False
+        self._connection = None
+
+    def cancel(self):
+        """
+        Ask the worker to stop, interrupting the query if it is running. No signal is emitted afterwards.
+        """
+        self._cancelled = True
+        connection = self._connection
+        if connection is not None:
+            try:
+                connection.interrupt()
+            except sqlite3.ProgrammingError:
+                # The search ended and closed its connection meanwhile
+                pass
+
+    def is_cancelled(self):
+        """
+        Whether cancel() was called.
+        """
+        return self._cancelled
+
+    def run(self):
+        try:
+            self._connection = repository.get_connection()
+            if self._cancelled:
+                return
+
+            searcher = Repository(self._connection)
+            if not self.facets_only:
+                rows, after = searcher.search_page(self.criteria, self.order, self.after, self.page_size)
+                if self._cancelled:
+                    return
+                self.pageReady.emit(rows, after)
+                if self.after is not None:
+                    return
+
+                # A first page without next page is the whole result
+                count = len(rows) if after is None else searcher.count_journals(self.criteria)
+                if self._cancelled:
+                    return
+                self.counted.emit(count)
+
+            facets = searcher.facet_counts(self.criteria)
+            if facets is not None and not self._cancelled:
+                self.facetsCounted.emit(*facets)
+        except sqlite3.OperationalError as e:
+            # An interrupted statement raises "interrupted"
+            if not self._cancelled:
+                self.failed.emit(str(e))
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self._connection = None
+            repository.close_connections()
+
+
+class ExportWorker(QThread):
+    """
+    The ExportWorker class exports every result of a search to a file outside of the GUI thread, see
+    core.export.export_search.
+
+    Example usage:
+    worker = ExportWorker(criteria, "SJR", "journals.parquet", export.ParquetWriter)
+    worker.progress.connect(view.show_export_progress)
+    worker.start()
+    """
+
+    # Journals written so far and number of journals to export
+    progress = pyqtSignal(int, int)
+    # Emitted with the number of journals written once the file is complete
+    exported = pyqtSignal(int)
+    # Emitted when the export stopped on cancel() and the file was not written
+    cancelled = pyqtSignal()
+    # Emitted with an error message when the export failed
+    failed = pyqtSignal(str)
+
+    def __init__(self, criteria, order, path, writer_class=export.CsvWriter, parent=None):
+        """
+        Initialize the ExportWorker.
+
+        Args:
+            criteria (dict): The keyword arguments of Repository.search_query.
+            order (str): The order of the results, a key of SEARCH_ORDERS.
+            path (str): The file to write.
+            writer_class (type, optional): The ExportWriter subclass of the format. Defaults to export.CsvWriter.
+            parent (QObject, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.criteria = criteria
+        self.order = order
+        self.path = path
+        self.writer_class = writer_class
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        Ask the worker to stop after the batch in progress.
+        """
+        self._cancelled = True
+
+    def is_cancelled(self):
+        """
+        Whether cancel() was called.
+        """
+        return self._cancelled
+
+    def run(self):
+        try:
+            count = export.export_search(repository.get_connection(), self.criteria, self.order, self.path,
+                                         self.writer_class, self.progress.emit, self.is_cancelled)
+            self.exported.emit(count)
+        except export.ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            repository.close_connections()